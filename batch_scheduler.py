@@ -0,0 +1,174 @@
+# Batch simulation of the Energy-Efficient Round Robin (EE-RR) algorithm.
+# Many independent workloads are simulated in lock-step with NumPy: every loop
+# iteration admits arrivals, dispatches one quantum or one idle period for all
+# workloads at once, so the Python overhead is paid per event round instead of
+# per workload.
+
+
+# batch_scheduler.py
+import numpy as np
+
+from scheduler import Process
+
+# Structured dtype of one workload: one record per process
+WORKLOAD_DTYPE = np.dtype([
+    ('pid', np.int64),
+    ('arrival', np.float64),
+    ('burst', np.float64),
+    ('priority', np.int64),
+])
+
+
+def workload_array(processes):
+    """Convert a list of Process objects into a WORKLOAD_DTYPE structured array"""
+    workload = np.empty(len(processes), dtype=WORKLOAD_DTYPE)
+    for i, p in enumerate(processes):
+        workload[i] = (p.pid, p.arrival_time, p.burst_time, p.priority)
+    return workload
+
+
+def workload_processes(workload):
+    """Convert a WORKLOAD_DTYPE structured array back into Process objects"""
+    return [Process(int(rec['pid']), rec['arrival'].item(), rec['burst'].item(), int(rec['priority']))
+            for rec in workload]
+
+
+def _per_workload(value, count):
+    """Broadcast a scalar or per-workload parameter to a float64 array of length count"""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (count,)).copy()
+
+
+def batch_round_robin_scheduling(workloads, time_quantum, base_power, max_frequency, min_frequency,
+                                 skip_idle=False):
+    """
+    Simulate EE-RR on many workloads at once.
+
+    - workloads: sequence of structured arrays with fields pid, arrival, burst, priority,
+      or workload_io.ColumnarWorkload views of memory-mapped .wlb files
+    - time_quantum, base_power, max_frequency, min_frequency: scalars, or arrays
+      with one value per workload
+    - skip_idle: same meaning as in round_robin_scheduling
+
+    Every workload follows exactly the event sequence of round_robin_scheduling
+    with a fresh CPU, so energy is accumulated in the same order and the totals
+    are bit-for-bit identical to the scalar simulator.
+
+    Returns a dict of arrays with one entry per workload: total_turnaround,
+    total_waiting, avg_turnaround, avg_waiting, energy, idle_time and
+    makespan, plus finish_time and start_time of shape (N, max processes)
+    in arrival order (NaN past the end of shorter workloads).
+    """
+    count = len(workloads)
+    sizes = np.array([len(w) for w in workloads], dtype=np.int64)
+    width = int(sizes.max()) if count else 0
+
+    quantum = _per_workload(time_quantum, count)
+    base_power = _per_workload(base_power, count)
+    max_frequency = _per_workload(max_frequency, count)
+    min_frequency = _per_workload(min_frequency, count)
+    idle_power = 0.1 * base_power
+    high_power = base_power * (max_frequency / max_frequency)
+    low_power = base_power * (min_frequency / max_frequency)
+
+    # Pad workloads into (N, width) matrices sorted by arrival (stable, like sorted())
+    arrival = np.full((count, width), np.inf)
+    burst = np.zeros((count, width))
+    priority = np.zeros((count, width), dtype=np.int64)
+    for row, workload in enumerate(workloads):
+        order = np.argsort(workload['arrival'], kind='stable')
+        size = len(workload)
+        arrival[row, :size] = workload['arrival'][order]
+        burst[row, :size] = workload['burst'][order]
+        priority[row, :size] = workload['priority'][order]
+    power = np.where(priority > 1, low_power[:, None], high_power[:, None])
+
+    remaining = burst.copy()
+    start_time = np.full((count, width), np.nan)
+    finish_time = np.full((count, width), np.nan)
+
+    # Per-workload ready queue as a ring buffer of process slots
+    queue = np.zeros((count, max(width, 1)), dtype=np.int64)
+    head = np.zeros(count, dtype=np.int64)
+    queued = np.zeros(count, dtype=np.int64)
+    capacity = queue.shape[1]
+
+    next_arrival = np.zeros(count, dtype=np.int64)
+    completed = np.zeros(count, dtype=np.int64)
+    current_time = np.zeros(count)
+    energy = np.zeros(count)
+    idle_time = np.zeros(count)
+    rows = np.arange(count)
+
+    active = completed < sizes
+    while active.any():
+        # Add arrived processes to the ready queues
+        while True:
+            pending = active & (next_arrival < sizes)
+            candidate = np.minimum(next_arrival, width - 1)
+            admit = pending & (arrival[rows, candidate] <= current_time)
+            if not admit.any():
+                break
+            r = rows[admit]
+            queue[r, (head[r] + queued[r]) % capacity] = next_arrival[r]
+            queued[r] += 1
+            next_arrival[r] += 1
+
+        # Workloads with nothing ready idle until their next arrival
+        idle = active & (queued == 0)
+        if idle.any():
+            r = rows[idle]
+            units = np.ones(len(r))
+            if skip_idle:
+                gap = np.ceil(arrival[r, next_arrival[r]] - current_time[r])
+                units = np.maximum(units, gap)
+            idle_time[r] += units
+            energy[r] += idle_power[r] * units
+            current_time[r] += units
+
+        # Everyone else runs the process at the head of its ready queue
+        run = active & (queued > 0)
+        if run.any():
+            r = rows[run]
+            slot = queue[r, head[r]]
+            head[r] = (head[r] + 1) % capacity
+            queued[r] -= 1
+
+            first = np.isnan(start_time[r, slot])
+            start_time[r[first], slot[first]] = current_time[r[first]]
+
+            execution_time = np.minimum(quantum[r], remaining[r, slot])
+            remaining[r, slot] -= execution_time
+            energy[r] += power[r, slot] * execution_time
+            current_time[r] += execution_time
+
+            finished = remaining[r, slot] == 0
+            done_r = r[finished]
+            finish_time[done_r, slot[finished]] = current_time[done_r]
+            completed[done_r] += 1
+
+            again_r = r[~finished]
+            queue[again_r, (head[again_r] + queued[again_r]) % capacity] = slot[~finished]
+            queued[again_r] += 1
+
+        active = completed < sizes
+
+    valid = np.arange(width)[None, :] < sizes[:, None]
+    turnaround = np.where(valid, finish_time - arrival, 0.0)
+    waiting = np.where(valid, turnaround - burst, 0.0)
+    total_turnaround = turnaround.sum(axis=1)
+    total_waiting = waiting.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_turnaround = total_turnaround / sizes
+        avg_waiting = total_waiting / sizes
+
+    return {
+        'total_turnaround': total_turnaround,
+        'total_waiting': total_waiting,
+        'avg_turnaround': avg_turnaround,
+        'avg_waiting': avg_waiting,
+        'energy': energy,
+        'idle_time': idle_time,
+        'makespan': current_time,
+        'start_time': start_time,
+        'finish_time': finish_time,
+    }
@@ -0,0 +1,317 @@
+# Benchmark suite for the Energy-Efficient Round Robin (EE-RR) simulator.
+# Seeded generators produce synthetic workloads (Poisson arrivals, heavy-tailed
+# bursts, mixed priorities); each workload size is timed through the scheduler,
+# CPU.execute, the recorded histories and the GUI's plot updates rendered on the
+# headless Agg backend. Results are written as JSON and can be compared with a
+# stored baseline to catch regressions. matplotlib is only imported for the
+# render benchmarks, so the generators can be reused by headless tools. The
+# quantum benchmarks also report schedule quality (throughput, waiting time,
+# energy, dispatches) of adaptive-quantum round robin against the fixed one.
+
+
+# benchmarks.py
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from metrics import OnlineMetrics, simulate_metrics
+from policies import AdaptiveRoundRobinPolicy, RoundRobinPolicy, iter_policy_scheduling
+from scheduler import Process, CPU, round_robin_scheduling
+
+DEFAULT_SIZES = [10 ** exponent for exponent in range(2, 8)]
+HISTORY_MAX_SIZE = 10 ** 6  # Full histories of 10^7 processes need several GB of memory
+GANTT_MAX_ROWS = 10 ** 5  # Every bar is still its own path: 10^5 processes draw in about a second
+QUANTUM_MAX_SIZE = 10 ** 6
+REPEAT_BELOW = 1.0  # Benchmarks faster than this (seconds) are repeated and the best run kept
+CPU_PARAMS = {'base_power': 125.0, 'max_frequency': 5.8, 'min_frequency': 3.0}
+TIME_QUANTUM = 3
+# Round robin variants compared on a bimodal workload, by benchmark name suffix
+QUANTUM_POLICIES = {
+    'fixed': lambda: RoundRobinPolicy(TIME_QUANTUM),
+    'adaptive_median': lambda: AdaptiveRoundRobinPolicy('median'),
+    'adaptive_mean': lambda: AdaptiveRoundRobinPolicy('mean'),
+}
+
+
+def poisson_arrivals(rng, rate):
+    """Yield non-decreasing integer arrival times of a Poisson process with the given rate"""
+    clock = 0.0
+    while True:
+        clock += rng.expovariate(rate)
+        yield int(clock)
+
+
+def pareto_bursts(rng, alpha=1.5, scale=2.0, limit=10000):
+    """Yield heavy-tailed integer burst times (Pareto, truncated at limit)"""
+    while True:
+        yield min(limit, max(1, round(scale * rng.paretovariate(alpha))))
+
+
+def bimodal_bursts(rng, short=(1, 4), long=(20, 80), long_fraction=0.2):
+    """Yield integer burst times: mostly short interactive ones, some long batch ones"""
+    while True:
+        low, high = long if rng.random() < long_fraction else short
+        yield rng.randint(low, high)
+
+
+def mixed_priorities(rng, weights=(0.5, 0.3, 0.2)):
+    """Yield priorities 1, 2, 3... drawn with the given weights"""
+    levels = range(1, len(weights) + 1)
+    while True:
+        yield rng.choices(levels, weights)[0]
+
+
+def generate_workload(size, seed=0, load=0.9, alpha=1.5, scale=2.0, bimodal=False):
+    """
+    Yield size (pid, arrival, burst, priority) records in arrival order.
+    - seed: Seed of the random generator; equal seeds give equal workloads
+    - load: Offered load; arrivals are spaced so busy time is about load * makespan
+    - alpha, scale: Pareto shape and minimum of the burst distribution
+    - bimodal: Draw bursts from bimodal_bursts instead of the Pareto distribution
+    """
+    rng = random.Random(seed)
+    if bimodal:
+        mean_burst = 0.8 * 2.5 + 0.2 * 50
+        bursts = bimodal_bursts(rng)
+    else:
+        mean_burst = alpha * scale / (alpha - 1) if alpha > 1 else scale * 10
+        bursts = pareto_bursts(rng, alpha, scale)
+    arrivals = poisson_arrivals(rng, load / mean_burst)
+    priorities = mixed_priorities(rng)
+    for pid in range(1, size + 1):
+        yield pid, next(arrivals), next(bursts), next(priorities)
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _best(benchmark, repeat, *args):
+    """Call benchmark up to repeat times while it stays fast; keep the result with the lowest seconds"""
+    best = benchmark(*args)
+    for _ in range(repeat - 1):
+        seconds = best[0]['seconds'] if isinstance(best, tuple) else best['seconds']
+        if seconds >= REPEAT_BELOW:
+            break
+        result = benchmark(*args)
+        if (result[0] if isinstance(result, tuple) else result)['seconds'] < seconds:
+            best = result
+    return best
+
+
+def _history_bytes(history):
+    return sys.getsizeof(history._first) + sys.getsizeof(history._second)
+
+
+def bench_streaming(size, seed, skip_idle):
+    """Scheduler throughput with histories off and processes generated on the fly"""
+    cpu = CPU(record_history=False, **CPU_PARAMS)
+    arrivals = (Process(*record) for record in generate_workload(size, seed))
+    seconds, metrics = _timed(simulate_metrics, arrivals, TIME_QUANTUM, cpu, skip_idle=skip_idle)
+    return {'seconds': seconds, 'processes_per_second': size / seconds,
+            'energy': cpu.power_consumption, 'makespan': metrics.makespan}
+
+
+def bench_execute(size, seed):
+    """Cost of one CPU.execute call, alternating priorities so DVFS switches every call"""
+    cpu = CPU(record_history=False, **CPU_PARAMS)
+    processes = [Process(1, 0, 2 * size, 1), Process(2, 0, 2 * size, 2)]
+    start = time.perf_counter()
+    for tick in range(size):
+        cpu.execute(processes[tick & 1], 1, tick)
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'ns_per_call': seconds / size * 1e9}
+
+
+def bench_history(size, seed, skip_idle):
+    """Scheduler with full histories, as the GUI runs it, plus the memory those histories take"""
+    cpu = CPU(**CPU_PARAMS)
+    processes = [Process(*record) for record in generate_workload(size, seed)]
+    seconds, completed = _timed(round_robin_scheduling, processes, TIME_QUANTUM, cpu, skip_idle=skip_idle)
+    execution_bytes = sum(_history_bytes(p.execution_history) for p in completed)
+    cpu_bytes = sum(_history_bytes(history)
+                    for history in (cpu.frequency_history, cpu.power_history, cpu.idle_history))
+    result = {
+        'seconds': seconds,
+        'execution_intervals': sum(len(p.execution_history) for p in completed),
+        'power_samples': len(cpu.power_history),
+        'execution_history_bytes': execution_bytes,
+        'cpu_history_bytes': cpu_bytes,
+    }
+    return result, completed, cpu
+
+
+class _DispatchCounter(OnlineMetrics):
+    """OnlineMetrics that also counts dispatches (execution intervals) of completed processes"""
+
+    def __init__(self):
+        super().__init__()
+        self.dispatches = 0
+
+    def on_complete(self, process):
+        super().on_complete(process)
+        self.dispatches += len(process.execution_history)
+
+
+def bench_quantum(size, seed, skip_idle, name):
+    """One QUANTUM_POLICIES variant on a bimodal workload: run time plus schedule quality"""
+    cpu = CPU(record_history=False, **CPU_PARAMS)
+    arrivals = (Process(*record) for record in generate_workload(size, seed, bimodal=True))
+    metrics = _DispatchCounter()
+    completions = iter_policy_scheduling(arrivals, QUANTUM_POLICIES[name](), cpu, skip_idle=skip_idle,
+                                         sink=metrics)
+    seconds, _ = _timed(lambda: sum(1 for _ in completions))
+    return {
+        'seconds': seconds,
+        'throughput': size / metrics.makespan if metrics.makespan else 0.0,
+        'avg_waiting': metrics.waiting.mean,
+        'p95_waiting': metrics.waiting_quantiles[1].value,
+        'avg_turnaround': metrics.turnaround.mean,
+        'energy': cpu.power_consumption,
+        'dispatches': metrics.dispatches,
+    }
+
+
+class _RenderHost:
+    """Stands in for the GUI window: Agg figures plus the GUI's own plot update methods"""
+
+    def __init__(self):
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from osprojectgui import COLORS, EnergyEfficientSchedulerGUI as gui
+
+        self.colors = dict(COLORS)
+        for name in ('power', 'gantt', 'freq'):
+            figure = Figure(figsize=(10, 4), dpi=100)
+            setattr(self, f"{name}_fig", figure)
+            setattr(self, f"{name}_ax", figure.add_subplot())
+            setattr(self, f"{name}_canvas", FigureCanvasAgg(figure))
+        for method in ('update_power_plot', 'update_gantt_chart', 'update_frequency_plot',
+                       'plot_pixels', 'refresh_power_plot', 'refresh_frequency_plot'):
+            setattr(self, method, getattr(gui, method).__get__(self))
+
+
+def bench_render(update, *args):
+    """Time one GUI plot update, including the canvas draw"""
+    seconds, _ = _timed(update, *args)
+    return {'seconds': seconds}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed=0, skip_idle=False, history_max_size=HISTORY_MAX_SIZE,
+                   renders=True, repeat=3, log=None, quantum_max_size=QUANTUM_MAX_SIZE):
+    """
+    Run every benchmark at every size. Returns a list of result dicts with at
+    least 'benchmark', 'size' and 'seconds'.
+    - history_max_size: Largest size run with full histories and rendered
+    - repeat: Runs of each benchmark under REPEAT_BELOW seconds; the best is kept
+    - renders: Whether to time the plot updates
+    - log: Optional callable receiving each result as it is produced
+    - quantum_max_size: Largest size run through the QUANTUM_POLICIES comparison
+    """
+    results = []
+
+    def record(benchmark, size, result):
+        result = dict(result, benchmark=benchmark, size=size)
+        results.append(result)
+        if log is not None:
+            log(result)
+
+    host = _RenderHost() if renders else None
+    for size in sizes:
+        record('execute', size, _best(bench_execute, repeat, size, seed))
+        record('schedule_streaming', size, _best(bench_streaming, repeat, size, seed, skip_idle))
+        if size <= quantum_max_size:
+            for name in QUANTUM_POLICIES:
+                record(f'quantum_{name}', size, _best(bench_quantum, repeat, size, seed, skip_idle, name))
+        if size > history_max_size:
+            continue
+        history, completed, cpu = _best(bench_history, repeat, size, seed, skip_idle)
+        record('schedule_history', size, history)
+        if host is not None:
+            record('power_render', size, _best(bench_render, repeat, host.update_power_plot, cpu))
+            record('frequency_render', size, _best(bench_render, repeat, host.update_frequency_plot, cpu))
+            if size <= GANTT_MAX_ROWS:
+                record('gantt_render', size,
+                       _best(bench_render, repeat, host.update_gantt_chart, completed, cpu))
+        del completed, cpu
+    return results
+
+
+def compare(results, baseline, tolerance=0.2, min_delta=0.01):
+    """
+    Compare results against baseline results by (benchmark, size).
+    Returns a list of (benchmark, size, baseline_seconds, seconds, ratio) for
+    every entry slower than baseline by more than tolerance (0.2 = 20%) and by
+    more than min_delta seconds, so timer noise on tiny runs is not reported.
+    """
+    reference = {(r['benchmark'], r['size']): r['seconds'] for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result['benchmark'], result['size'])
+        if key in reference and reference[key] > 0:
+            ratio = result['seconds'] / reference[key]
+            if ratio > 1 + tolerance and result['seconds'] - reference[key] > min_delta:
+                regressions.append((*key, reference[key], result['seconds'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the EE-RR scheduler and its plots")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="Output JSON file")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Workload sizes in processes (default: 10^2 to 10^7)")
+    parser.add_argument('--max-size', type=int, default=None, help="Drop sizes above this")
+    parser.add_argument('--history-max-size', type=int, default=HISTORY_MAX_SIZE,
+                        help="Largest size simulated with full histories and rendered")
+    parser.add_argument('--quantum-max-size', type=int, default=QUANTUM_MAX_SIZE,
+                        help="Largest size run through the fixed vs adaptive quantum comparison")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-idle', action='store_true', help="Jump over idle gaps instead of ticking")
+    parser.add_argument('--no-render', action='store_true', help="Skip the plot benchmarks")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of each fast benchmark; the best is kept")
+    parser.add_argument('--baseline', default=None, help="Earlier output file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+
+    def log(result):
+        print(f"{result['benchmark']:>20} {result['size']:>10} {result['seconds']:10.4f} s", file=sys.stderr)
+
+    results = run_benchmarks(sizes, seed=args.seed, skip_idle=args.skip_idle,
+                             history_max_size=args.history_max_size, renders=not args.no_render,
+                             repeat=args.repeat, log=log, quantum_max_size=args.quantum_max_size)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'skip_idle': args.skip_idle,
+        'repeat': args.repeat,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for benchmark, size, before, after, ratio in regressions:
+            print(f"REGRESSION {benchmark} size={size}: {before:.4f} s -> {after:.4f} s ({ratio:.2f}x)",
+                  file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# Idle C-state model for the simulated CPU.
+# The basic CPU charges a flat 10% of base power whenever it is idle. CStateCPU
+# instead has a table of idle states, shallowest first: deeper states draw
+# less residency power but cost energy to enter and leave, and their exit
+# latency stalls the next dispatch. For every idle gap a governor picks the
+# state to enter, either from the true gap length (an oracle that knows the
+# next arrival) or from a prediction based on recent gaps.
+
+
+# cstates.py
+import math
+
+from scheduler import CPU
+
+
+class CState:
+    __slots__ = ('name', 'power', 'entry_latency', 'exit_latency', 'entry_energy', 'exit_energy')
+
+    def __init__(self, name, power, entry_latency=0.0, exit_latency=0.0, entry_energy=0.0, exit_energy=0.0):
+        """
+        Initialize an idle state with:
+        - name: Label such as "C1"
+        - power: Residency power in Watts
+        - entry_latency, exit_latency: Time units to enter and to wake up
+        - entry_energy, exit_energy: Joules spent entering and waking up
+        """
+        self.name = name
+        self.power = power
+        self.entry_latency = entry_latency
+        self.exit_latency = exit_latency
+        self.entry_energy = entry_energy
+        self.exit_energy = exit_energy
+
+    def __repr__(self):
+        return f"CState({self.name!r}, {self.power!r} W)"
+
+
+def default_cstates(base_power):
+    """
+    C1, C3 and C6 for a core drawing base_power when busy. C1 matches the
+    basic CPU's idle (10% of base power, no latency); transitions are charged
+    at full power for their duration.
+    """
+    return [
+        CState("C1", 0.1 * base_power),
+        CState("C3", 0.04 * base_power, 0.1, 0.2, 0.1 * base_power, 0.2 * base_power),
+        CState("C6", 0.01 * base_power, 0.5, 1.0, 0.5 * base_power, 1.0 * base_power),
+    ]
+
+
+def oracle_governor(cpu, gap):
+    """State worth entering for the actual gap length (knows the next arrival)"""
+    return cpu.deepest_state(gap)
+
+
+def predictive_governor(cpu, gap):
+    """
+    State worth entering for the predicted gap: an exponential moving
+    average of past gaps. gap is only used to update the prediction afterwards.
+    """
+    index = cpu.deepest_state(cpu.predicted_gap)
+    weight = cpu.prediction_weight
+    cpu.predicted_gap = weight * gap + (1 - weight) * cpu.predicted_gap
+    return index
+
+
+GOVERNORS = {
+    'oracle': oracle_governor,
+    'predictive': predictive_governor,
+}
+
+
+class CStateCPU(CPU):
+    """
+    CPU with idle C-states. Drop-in for CPU in every scheduler. Idle time is
+    charged at the shallowest state's power as it passes; when the next
+    dispatch ends the gap, the governor picks a state for the whole gap, the
+    difference plus entry and exit energy is settled, and execute() returns
+    the exit latency as extra elapsed time. A gap still open when the run ends
+    stays charged at the shallowest state (settle() closes it explicitly).
+    """
+    __slots__ = ('cstates', 'governor', 'break_even', 'gap_start', 'gap_end', 'entries', 'residency',
+                 'wake_time', 'predicted_gap', 'prediction_weight')
+
+    def __init__(self, base_power, max_frequency, min_frequency, record_history=True, cstates=None,
+                 governor=oracle_governor, prediction_weight=0.5):
+        """
+        Initialize a C-state CPU with:
+        - base_power, max_frequency, min_frequency, record_history: as for CPU
+        - cstates: CState list, shallowest first (default: default_cstates)
+        - governor: Callable (cpu, gap) -> index into cstates
+        - prediction_weight: Weight of the latest gap in predictive_governor's average
+        """
+        super().__init__(base_power, max_frequency, min_frequency, record_history=record_history)
+        self.cstates = list(cstates or default_cstates(base_power))
+        self.governor = governor
+        self.break_even = [self._break_even(state) for state in self.cstates]
+        self.gap_start = None  # Open idle gap, not yet settled
+        self.gap_end = None
+        self.entries = [0] * len(self.cstates)
+        self.residency = [0] * len(self.cstates)  # Idle time spent in each state
+        self.wake_time = 0  # Total time dispatches were stalled by exit latency
+        self.predicted_gap = 0
+        self.prediction_weight = prediction_weight
+
+    def _break_even(self, state):
+        """Shortest gap for which state uses no more energy than the shallowest one"""
+        shallow = self.cstates[0]
+        overhead = (state.entry_energy + state.exit_energy) - (shallow.entry_energy + shallow.exit_energy)
+        saving = shallow.power - state.power
+        if state is shallow or overhead <= 0:
+            return state.entry_latency
+        if saving <= 0:
+            return math.inf
+        return max(state.entry_latency, overhead / saving)
+
+    def deepest_state(self, gap):
+        """
+        Index of the state worth entering for gap: of those whose break-even
+        time fits, the one idling through gap on the least energy (the deeper
+        one on ties). A deep state can pass its break-even against the
+        shallowest state while a shallower deep state is still cheaper.
+        """
+        best = 0
+        best_energy = math.inf
+        for index, break_even in enumerate(self.break_even):
+            if break_even <= gap:
+                state = self.cstates[index]
+                energy = state.power * gap + state.entry_energy + state.exit_energy
+                if energy <= best_energy:
+                    best = index
+                    best_energy = energy
+        return best
+
+    def idle(self, time, current_time):
+        """Idle for time units, extending the open gap when contiguous with it"""
+        if self.gap_start is not None and self.gap_end != current_time:
+            self.settle()
+        if self.gap_start is None:
+            self.gap_start = current_time
+        self.gap_end = current_time + time
+        self.idle_time += time
+        idle_power = self.cstates[0].power
+        self.power_consumption += idle_power * time
+        self.current_frequency = 0
+        if self.record_history:
+            self.frequency_history.append(current_time, 0)
+            self.power_history.append(current_time, idle_power)
+            self.idle_history.append_interval(current_time, current_time + time)
+
+    def settle(self):
+        """Close the open idle gap: let the governor pick its state. Returns the exit latency"""
+        if self.gap_start is None:
+            return 0
+        gap = self.gap_end - self.gap_start
+        self.gap_start = self.gap_end = None
+        index = self.governor(self, gap)
+        state = self.cstates[index]
+        self.entries[index] += 1
+        self.residency[index] += gap
+        self.power_consumption += (state.power - self.cstates[0].power) * gap \
+            + state.entry_energy + state.exit_energy
+        self.wake_time += state.exit_latency
+        return state.exit_latency
+
+    def execute(self, process, time_quantum, current_time):
+        """Wake from the open idle gap, if any, then run as CPU.execute. Returns elapsed time"""
+        stall = self.settle()
+        return stall + super().execute(process, time_quantum, current_time + stall)
+
+    def snapshot(self):
+        return (super().snapshot(), self.gap_start, self.gap_end, list(self.entries), list(self.residency),
+                self.wake_time, self.predicted_gap)
+
+    def restore(self, state):
+        (base, self.gap_start, self.gap_end, entries, residency,
+         self.wake_time, self.predicted_gap) = state
+        self.entries = list(entries)
+        self.residency = list(residency)
+        super().restore(base)
@@ -0,0 +1,66 @@
+# Level-of-detail support for plotting long CPU histories.
+# A MinMaxPyramid keeps per-bucket minimum and maximum values at power-of-two
+# bucket sizes, so any visible time range can be reduced to roughly two points
+# per screen pixel without losing spikes or dips.
+
+
+# decimation.py
+import numpy as np
+
+
+class MinMaxPyramid:
+    def __init__(self, times, values):
+        """
+        Build the pyramid for a series sorted by time.
+        - times, values: equal-length sequences (arrays, array('d') or lists)
+
+        Level k (k >= 1) stores the min and max of each run of 2**k samples.
+        The pyramid takes about twice the memory of the values it summarizes.
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.times.shape != self.values.shape:
+            raise ValueError("times and values must have the same length")
+
+        self.levels = []  # levels[k - 1] = (mins, maxs) for buckets of 2**k samples
+        mins = maxs = self.values
+        while len(mins) > 1:
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            mins = np.minimum(mins[0::2], mins[1::2])
+            maxs = np.maximum(maxs[0::2], maxs[1::2])
+            self.levels.append((mins, maxs))
+
+    def __len__(self):
+        return len(self.times)
+
+    def query(self, start, end, pixels):
+        """
+        Return (xs, ys) covering the time range [start, end] with at most about
+        2 * pixels points. Ranges that already fit are returned at full
+        resolution; otherwise each bucket contributes its min and its max,
+        both placed at the bucket's first timestamp.
+        """
+        count = len(self.times)
+        if count == 0:
+            return self.times, self.values
+        pixels = max(1, int(pixels))
+
+        # Include one sample either side so lines run to the edges of the view
+        first = max(int(np.searchsorted(self.times, start, 'left')) - 1, 0)
+        last = min(int(np.searchsorted(self.times, end, 'right')) + 1, count)
+        if last - first <= 2 * pixels:
+            return self.times[first:last], self.values[first:last]
+
+        level = min(int(np.ceil(np.log2((last - first) / pixels))), len(self.levels))
+        size = 1 << level
+        mins, maxs = self.levels[level - 1]
+        first_bucket = first >> level
+        last_bucket = ((last - 1) >> level) + 1
+
+        xs = np.repeat(self.times[first_bucket * size:last_bucket * size:size], 2)
+        ys = np.empty(len(xs))
+        ys[0::2] = mins[first_bucket:last_bucket]
+        ys[1::2] = maxs[first_bucket:last_bucket]
+        return xs, ys
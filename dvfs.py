@@ -0,0 +1,135 @@
+# P-state DVFS model for the simulated CPU.
+# The basic CPU scales power with frequency but not execution time, which makes
+# the minimum frequency look like free energy savings. PStateCPU instead runs
+# at discrete P-states (frequency, voltage): dynamic power follows C*V^2*f, a
+# static leakage term follows V, work is measured in cycles so runtime scales
+# with 1/f, and every frequency change costs transition latency and energy.
+
+
+# dvfs.py
+from scheduler import CPU
+
+DEFAULT_TRANSITION_LATENCY = 0.05  # Time units per frequency change, a quarter of a C3 wake-up
+
+
+class PState:
+    __slots__ = ('frequency', 'voltage')
+
+    def __init__(self, frequency, voltage):
+        self.frequency = frequency  # GHz
+        self.voltage = voltage  # Volts
+
+    def __repr__(self):
+        return f"PState({self.frequency!r} GHz, {self.voltage!r} V)"
+
+
+def default_pstates(min_frequency, max_frequency, count=4, min_voltage=0.75, max_voltage=1.25):
+    """Evenly spaced P-states with voltage rising linearly with frequency, lowest first"""
+    if count < 2 or min_frequency == max_frequency:
+        return [PState(max_frequency, max_voltage)]
+    states = []
+    for i in range(count):
+        fraction = i / (count - 1)
+        states.append(PState(min_frequency + fraction * (max_frequency - min_frequency),
+                             min_voltage + fraction * (max_voltage - min_voltage)))
+    return states
+
+
+def priority_governor(cpu, process):
+    """Highest P-state for priority 1, lowest for everything else (the basic CPU's DVFS rule)"""
+    return len(cpu.pstates) - 1 if process.priority <= 1 else 0
+
+
+class PStateCPU(CPU):
+    """
+    CPU with discrete P-states. A process's burst_time is its work expressed
+    as time at max_frequency (cycles / max_frequency), so at frequency f it
+    needs burst_time * max_frequency / f time units. Drop-in for CPU in every
+    scheduler; execute() returns elapsed time including any transition stall.
+    """
+    __slots__ = ('pstates', 'capacitance', 'leakage', 'transition_latency', 'transition_energy',
+                 'governor', 'pstate', 'transitions', 'transition_time', 'cycles')
+
+    def __init__(self, base_power, max_frequency, min_frequency, record_history=True, pstates=None,
+                 leakage_fraction=0.2, transition_latency=DEFAULT_TRANSITION_LATENCY, transition_energy=None,
+                 governor=priority_governor):
+        """
+        Initialize a P-state CPU with:
+        - base_power, max_frequency, min_frequency, record_history: as for CPU;
+          base_power is the total power in the highest P-state
+        - pstates: PState list sorted by frequency (default: default_pstates)
+        - leakage_fraction: Share of base_power that is static leakage at the
+          highest P-state; leakage scales with voltage, the rest is C*V^2*f
+        - transition_latency: Time units the core stalls on each frequency change
+        - transition_energy: Joules charged on each frequency change (default:
+          base_power for the duration of transition_latency)
+        - governor: Callable (cpu, process) -> index into pstates
+        """
+        super().__init__(base_power, max_frequency, min_frequency, record_history=record_history)
+        self.pstates = sorted(pstates or default_pstates(min_frequency, max_frequency),
+                              key=lambda state: state.frequency)
+        top = self.pstates[-1]
+        # Calibrate so the highest P-state draws base_power in total
+        self.leakage = leakage_fraction * base_power / top.voltage  # Amps
+        self.capacitance = (1 - leakage_fraction) * base_power / (top.voltage ** 2 * top.frequency)  # nF
+        self.transition_latency = transition_latency
+        if transition_energy is None:
+            transition_energy = base_power * transition_latency
+        self.transition_energy = transition_energy
+        self.governor = governor
+        self.pstate = len(self.pstates) - 1  # Start in the highest P-state
+        self.current_frequency = top.frequency
+        self.transitions = 0
+        self.transition_time = 0  # Total time stalled in transitions
+        self.cycles = 0  # Work retired, in GHz * time units
+
+    def power(self, index):
+        """Total power (W) in P-state index: C*V^2*f dynamic plus leakage*V static"""
+        state = self.pstates[index]
+        return self.capacitance * state.voltage ** 2 * state.frequency + self.leakage * state.voltage
+
+    def execute(self, process, time_quantum, current_time):
+        """
+        Run a process for up to time_quantum time units at the P-state chosen
+        by the governor. Returns elapsed time: transition stall plus run time.
+        """
+        index = self.governor(self, process)
+        stall = 0
+        if index != self.pstate:
+            self.pstate = index
+            self.transitions += 1
+            stall = self.transition_latency
+            self.transition_time += stall
+            self.power_consumption += self.transition_energy
+        state = self.pstates[index]
+        if state.frequency != self.current_frequency:
+            self.current_frequency = state.frequency
+            if self.record_history:
+                self.frequency_history.append(current_time, state.frequency)
+
+        # Work is measured in time at max_frequency; runtime scales with 1/f
+        speed = state.frequency / self.max_frequency
+        needed = process.remaining_time / speed
+        if needed <= time_quantum * (1 + 1e-12):  # Absorb rounding left by earlier slices
+            run_time = needed
+            self.cycles += process.remaining_time * self.max_frequency
+            process.remaining_time = 0
+        else:
+            run_time = time_quantum
+            self.cycles += run_time * state.frequency
+            process.remaining_time -= run_time * speed
+        start = current_time + stall
+        process.add_execution_interval(start, start + run_time)
+
+        power = self.power(index)
+        self.power_consumption += power * run_time
+        if self.record_history:
+            self.power_history.append(start, power)
+        return stall + run_time
+
+    def snapshot(self):
+        return (super().snapshot(), self.pstate, self.transitions, self.transition_time, self.cycles)
+
+    def restore(self, state):
+        base, self.pstate, self.transitions, self.transition_time, self.cycles = state
+        super().restore(base)
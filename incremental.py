@@ -0,0 +1,188 @@
+# Incremental re-simulation for the Energy-Efficient Round Robin (EE-RR) algorithm.
+# A run records checkpoints of the scheduler state at regular simulated-time
+# intervals, thinned out as the run grows so their number and size stay
+# bounded. When processes are added or removed, the simulation resumes from
+# the last checkpoint taken before the earliest affected arrival, so an edit
+# near the end of a long workload only re-simulates the tail.
+
+
+# incremental.py
+import heapq
+
+from scheduler import iter_round_robin_scheduling
+
+
+class Checkpoint:
+    """Scheduler state at the top of the loop, before arrivals at `time` are admitted"""
+    __slots__ = ('time', 'admitted', 'completed', 'ready', 'cpu_state')
+
+    def __init__(self, time, admitted, completed, ready, cpu_state):
+        self.time = time  # Simulated clock
+        self.admitted = admitted  # Processes taken from the arrival-sorted workload
+        self.completed = completed  # Length of the completed list
+        self.ready = ready  # (process, remaining_time, start_time, history length) in queue order
+        self.cpu_state = cpu_state  # CPU.snapshot()
+
+
+class IncrementalSchedule:
+    def __init__(self, time_quantum, cpu, checkpoint_interval=100, skip_idle=False, max_checkpoints=64,
+                 max_checkpoint_entries=None, instrumentation=None):
+        """
+        Initialize an incremental schedule with:
+        - time_quantum, cpu, skip_idle: as for round_robin_scheduling
+        - checkpoint_interval: Initial simulated time between checkpoints;
+          smaller values make edits cheaper at the cost of memory per checkpoint
+        - max_checkpoints: Checkpoints kept at most; when exceeded, every other
+          one is dropped and the interval doubles
+        - max_checkpoint_entries: Ready-queue entries stored across all
+          checkpoints before they are thinned the same way (default: twice
+          the number of processes)
+        - instrumentation: Optional Instrumentation notified of scheduler
+          events while simulating; may be replaced between runs
+        """
+        if checkpoint_interval <= 0:
+            raise ValueError("Checkpoint interval must be positive")
+        if max_checkpoints < 1:
+            raise ValueError("At least one checkpoint must be kept")
+        self.time_quantum = time_quantum
+        self.cpu = cpu
+        self.checkpoint_interval = checkpoint_interval
+        self.max_checkpoints = max_checkpoints
+        self.max_checkpoint_entries = max_checkpoint_entries
+        self.skip_idle = skip_idle
+        self.instrumentation = instrumentation
+        self.initial_cpu_state = cpu.snapshot()  # Restored before every run from t=0
+        self.processes = []  # Current workload sorted by arrival time
+        self.completed = []  # Completed processes of the latest run
+        self.checkpoints = []
+        self.checkpoint_entries = 0  # Ready-queue entries stored in self.checkpoints
+        self.spacing = checkpoint_interval  # Current simulated time between checkpoints
+        self.next_checkpoint = 0
+
+    def run(self, processes):
+        """Simulate a workload from t=0. Returns the completed processes"""
+        for _ in self.iter_run(processes):
+            pass
+        return self.completed
+
+    def apply_edits(self, added=(), removed_pids=()):
+        """Add and/or remove processes and re-simulate only what they affect"""
+        for _ in self.iter_apply_edits(added, removed_pids):
+            pass
+        return self.completed
+
+    def iter_run(self, processes):
+        """Like run(), but yields each process as it completes"""
+        self.processes = sorted(processes, key=lambda p: p.arrival_time)
+        self.completed = []
+        self.checkpoints = []
+        self.checkpoint_entries = 0
+        self.spacing = self.checkpoint_interval
+        self.next_checkpoint = 0
+        self.cpu.restore(self.initial_cpu_state)
+        for process in self.processes:
+            self._reset(process)
+        return self._simulate(self.processes, 0, ())
+
+    def iter_apply_edits(self, added=(), removed_pids=()):
+        """
+        Like apply_edits(), but yields each newly completed process.
+        Processes completed before the resume point are kept in self.completed
+        and are not yielded again.
+        """
+        added = sorted(added, key=lambda p: p.arrival_time)
+        removed_pids = set(removed_pids)
+        removed = [p for p in self.processes if p.pid in removed_pids]
+        affected = [p.arrival_time for p in added] + [p.arrival_time for p in removed]
+        if not affected:
+            return iter(())
+        first_affected = min(affected)
+
+        # Latest checkpoint strictly before the first affected arrival. At a
+        # checkpoint at exactly that time, an idle jump may already have been
+        # sized by the affected process.
+        index = 0
+        while index + 1 < len(self.checkpoints) and self.checkpoints[index + 1].time < first_affected:
+            index += 1
+        # A checkpoint taken while idling only exists because more arrivals were
+        # due; if the edits leave nothing to come, step back to a busy one.
+        while index > 0 and not self.checkpoints[index].ready and not added and all(
+                p.pid in removed_pids for p in self.processes[self.checkpoints[index].admitted:]):
+            index -= 1
+        if not self.checkpoints or self.checkpoints[index].time >= first_affected:
+            return self.iter_run([p for p in self.processes if p.pid not in removed_pids] + added)
+        checkpoint = self.checkpoints[index]
+        del self.checkpoints[index:]  # Re-recorded by the resumed run
+        self.checkpoint_entries = sum(len(c.ready) for c in self.checkpoints)
+        self.next_checkpoint = checkpoint.time
+
+        # Roll processes and CPU back to the checkpoint
+        self.cpu.restore(checkpoint.cpu_state)
+        del self.completed[checkpoint.completed:]
+        ready = []
+        for process, remaining_time, start_time, history_length in checkpoint.ready:
+            process.remaining_time = remaining_time
+            process.start_time = start_time
+            process.finish_time = None
+            process.execution_history.truncate(history_length)
+            ready.append(process)
+
+        # Processes not yet admitted at the checkpoint, merged with the additions.
+        # Ties keep existing processes first, as sorting the edited workload would.
+        suffix = [p for p in self.processes[checkpoint.admitted:] if p.pid not in removed_pids]
+        for process in suffix:
+            self._reset(process)
+        for process in added:
+            self._reset(process)
+        suffix = list(heapq.merge(suffix, added, key=lambda p: p.arrival_time))
+        del self.processes[checkpoint.admitted:]
+        self.processes.extend(suffix)
+
+        return self._simulate(suffix, checkpoint.time, ready)
+
+    def _simulate(self, arrivals, start_time, ready):
+        """Run the scheduler over arrivals, the tail of self.processes, recording checkpoints"""
+        positions = {id(p): i for i, p in enumerate(arrivals)}
+        prefix = len(self.processes) - len(arrivals)
+
+        def on_checkpoint(current_time, ready_queue, pending):
+            if current_time < self.next_checkpoint:
+                return
+            # Everything before the peeked pending process has been admitted
+            admitted = len(arrivals) if pending is None else positions[id(pending)]
+            self.checkpoints.append(Checkpoint(
+                current_time,
+                prefix + admitted,
+                len(self.completed),
+                [(p, p.remaining_time, p.start_time, len(p.execution_history)) for p in ready_queue],
+                self.cpu.snapshot(),
+            ))
+            self.checkpoint_entries += len(ready_queue)
+            self._thin()
+            self.next_checkpoint = current_time + self.spacing
+
+        for process in iter_round_robin_scheduling(
+                arrivals, self.time_quantum, self.cpu, skip_idle=self.skip_idle,
+                start_time=start_time, ready=ready,
+                checkpoint_interval=self.checkpoint_interval, on_checkpoint=on_checkpoint,
+                instrumentation=self.instrumentation):
+            self.completed.append(process)
+            yield process
+
+    def _thin(self):
+        """Halve the checkpoints and double their spacing until both limits hold"""
+        max_entries = self.max_checkpoint_entries
+        if max_entries is None:
+            max_entries = 2 * len(self.processes)
+        while len(self.checkpoints) > 1 and (len(self.checkpoints) > self.max_checkpoints
+                                             or self.checkpoint_entries > max_entries):
+            self.checkpoints = self.checkpoints[::2]  # Keeps the one at t=0
+            self.checkpoint_entries = sum(len(c.ready) for c in self.checkpoints)
+            self.spacing *= 2
+
+    @staticmethod
+    def _reset(process):
+        process.remaining_time = process.burst_time
+        process.start_time = None
+        process.finish_time = None
+        process.execution_history.clear()
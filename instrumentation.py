@@ -0,0 +1,125 @@
+# Opt-in instrumentation for the Energy-Efficient Round Robin (EE-RR) scheduler.
+# Pass an Instrumentation to round_robin_scheduling to count dispatches,
+# preemptions, frequency transitions and idle periods, optionally time each
+# phase of the scheduling loop, and receive callbacks as events happen. Without
+# one the scheduler only pays a None check per event.
+
+
+# instrumentation.py
+import time
+
+EVENTS = ('admit', 'dispatch', 'preempt', 'complete', 'idle', 'frequency')
+PHASES = ('admission', 'dispatch', 'execute', 'accounting')
+
+
+class Instrumentation:
+    """
+    Counters, phase timers and hooks for one scheduler run.
+
+    Hooks are registered per event with add_hook(event, callback) and called as:
+    - admit, dispatch, preempt, complete: callback(time, process)
+    - idle: callback(time, units)
+    - frequency: callback(time, old_frequency, new_frequency)
+    """
+
+    def __init__(self, timers=False):
+        """
+        Initialize instrumentation with:
+        - timers: Also accumulate wall-clock seconds per loop phase (admission,
+          dispatch, execute, accounting); costs a few perf_counter calls per step
+        """
+        self.timers = timers
+        self.hooks = {event: [] for event in EVENTS}
+        self.reset()
+
+    def reset(self):
+        """Zero the counters and timers, keeping the hooks"""
+        self.admissions = 0
+        self.dispatches = 0
+        self.preemptions = 0
+        self.completions = 0
+        self.frequency_transitions = 0
+        self.idle_periods = 0  # Runs of consecutive idle steps
+        self.idle_steps = 0  # Calls to CPU.idle (one per tick unless idle gaps are skipped)
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self._frequency = None
+        self._idling = False
+
+    def add_hook(self, event, callback):
+        if event not in self.hooks:
+            raise ValueError(f"Unknown instrumentation event: {event}")
+        self.hooks[event].append(callback)
+
+    def remove_hook(self, event, callback):
+        self.hooks[event].remove(callback)
+
+    def _emit(self, event, *args):
+        for callback in self.hooks[event]:
+            callback(*args)
+
+    # Called by the scheduler loop
+
+    def begin(self, cpu):
+        self._frequency = cpu.current_frequency
+
+    def clock(self):
+        return time.perf_counter()
+
+    def lap(self, phase, mark):
+        """Charge the time since mark to phase; returns the new mark"""
+        now = time.perf_counter()
+        self.phase_times[phase] += now - mark
+        return now
+
+    def on_admit(self, current_time, process):
+        self.admissions += 1
+        if self.hooks['admit']:
+            self._emit('admit', current_time, process)
+
+    def on_dispatch(self, current_time, process):
+        self.dispatches += 1
+        self._idling = False
+        if self.hooks['dispatch']:
+            self._emit('dispatch', current_time, process)
+
+    def on_preempt(self, current_time, process):
+        self.preemptions += 1
+        if self.hooks['preempt']:
+            self._emit('preempt', current_time, process)
+
+    def on_complete(self, current_time, process):
+        self.completions += 1
+        if self.hooks['complete']:
+            self._emit('complete', current_time, process)
+
+    def on_idle(self, current_time, units):
+        self.idle_steps += 1
+        if not self._idling:
+            self._idling = True
+            self.idle_periods += 1
+        if self.hooks['idle']:
+            self._emit('idle', current_time, units)
+
+    def on_frequency(self, current_time, frequency):
+        """Record the CPU frequency after a step, counting it if it changed"""
+        if frequency != self._frequency:
+            previous, self._frequency = self._frequency, frequency
+            self.frequency_transitions += 1
+            if self.hooks['frequency']:
+                self._emit('frequency', current_time, previous, frequency)
+
+    def summary(self):
+        """Flat dict of the counters, plus <phase>_seconds when timers are on"""
+        result = {
+            'admissions': self.admissions,
+            'dispatches': self.dispatches,
+            'preemptions': self.preemptions,
+            'completions': self.completions,
+            'frequency_transitions': self.frequency_transitions,
+            'idle_periods': self.idle_periods,
+            'idle_steps': self.idle_steps,
+        }
+        if self.timers:
+            for phase, seconds in self.phase_times.items():
+                result[f"{phase}_seconds"] = seconds
+        return result
@@ -0,0 +1,170 @@
+# Module 3: Performance Analysis (online)
+# Metric sinks receive completion events from the scheduler while it runs, so
+# long simulations can report averages and latency percentiles without keeping
+# the completed Process objects around.
+
+
+# metrics.py
+import bisect
+import math
+
+from scheduler import iter_round_robin_scheduling
+
+
+class RunningStats:
+    """Count, total, mean, min and max of a stream of values in O(1) memory"""
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac, 1985).
+    Keeps five markers regardless of the number of observations; the estimate is
+    exact until five values have been seen.
+    """
+    __slots__ = ('p', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, p):
+        if not 0 < p < 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        self.p = p
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        q = self._heights
+        if len(q) < 5:
+            bisect.insort(q, value)
+            return
+
+        n = self._positions
+        # Find the cell the new value falls in, stretching the extremes if needed
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(q, value, 1, 4) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabolic prediction overshoots - fall back to linear
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self):
+        q = self._heights
+        if not q:
+            return None
+        if len(q) < 5 or self._positions[4] == 5:
+            # Exact nearest-rank quantile of the first few observations
+            return q[max(0, math.ceil(self.p * len(q)) - 1)]
+        return q[2]
+
+
+class MetricsSink:
+    """
+    Interface for objects that receive scheduler events.
+    on_complete is called with each process as it finishes; close is called
+    once with the CPU when the simulation ends.
+    """
+
+    def on_complete(self, process):
+        pass
+
+    def close(self, cpu):
+        pass
+
+
+class OnlineMetrics(MetricsSink):
+    """Turnaround/waiting mean and p50/p95/p99, plus energy and idle time, in O(1) memory"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.turnaround = RunningStats()
+        self.waiting = RunningStats()
+        self.turnaround_quantiles = [P2Quantile(p) for p in self.QUANTILES]
+        self.waiting_quantiles = [P2Quantile(p) for p in self.QUANTILES]
+        self.makespan = 0
+        self.energy = 0
+        self.idle_time = 0
+
+    def on_complete(self, process):
+        turnaround = process.finish_time - process.arrival_time
+        waiting = turnaround - process.burst_time
+        self.turnaround.add(turnaround)
+        self.waiting.add(waiting)
+        for estimator in self.turnaround_quantiles:
+            estimator.add(turnaround)
+        for estimator in self.waiting_quantiles:
+            estimator.add(waiting)
+        self.makespan = max(self.makespan, process.finish_time)
+
+    def close(self, cpu):
+        self.energy = cpu.power_consumption
+        self.idle_time = cpu.idle_time
+
+    def summary(self):
+        """Flat dict of all metrics"""
+        result = {
+            'completed': self.turnaround.count,
+            'avg_turnaround': self.turnaround.mean,
+            'avg_waiting': self.waiting.mean,
+            'energy': self.energy,
+            'idle_time': self.idle_time,
+            'makespan': self.makespan,
+        }
+        for p, t, w in zip(self.QUANTILES, self.turnaround_quantiles, self.waiting_quantiles):
+            label = f"p{round(p * 100)}"
+            result[f"{label}_turnaround"] = t.value
+            result[f"{label}_waiting"] = w.value
+        return result
+
+
+def simulate_metrics(arrivals, time_quantum, cpu, skip_idle=False, sink=None, instrumentation=None):
+    """
+    Run round robin over an arrival stream, feeding a metrics sink and
+    discarding every process as soon as it completes.
+    Returns the sink (an OnlineMetrics unless one is supplied).
+    """
+    sink = sink if sink is not None else OnlineMetrics()
+    for _ in iter_round_robin_scheduling(arrivals, time_quantum, cpu, skip_idle=skip_idle, sink=sink,
+                                         instrumentation=instrumentation):
+        pass
+    return sink
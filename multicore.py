@@ -0,0 +1,180 @@
+# Multi-core extension of the Energy-Efficient Round Robin (EE-RR) algorithm.
+# Every core is a full CPU model with its own DVFS state, power and idle
+# accounting. Each core has a private round-robin ready queue; arriving
+# processes are placed on the least-loaded core and idle cores steal work from
+# the busiest queue.
+
+
+# multicore.py
+import heapq
+import math
+from collections import deque
+
+from scheduler import CPU
+
+
+class MultiCoreCPU:
+    def __init__(self, num_cores, base_power, max_frequency, min_frequency, record_history=True):
+        """
+        Initialize a multi-core CPU with:
+        - num_cores: Number of identical cores
+        - base_power, max_frequency, min_frequency, record_history: per-core
+          settings, as for CPU
+        """
+        if num_cores <= 0:
+            raise ValueError("A CPU needs at least one core")
+        self.cores = [CPU(base_power, max_frequency, min_frequency, record_history=record_history)
+                      for _ in range(num_cores)]
+        self.base_power = base_power
+        self.max_frequency = max_frequency
+        self.min_frequency = min_frequency
+        self.busy_time = [0] * num_cores  # Time each core spent executing
+        self.dispatches = [0] * num_cores  # Quanta dispatched on each core
+        self.steals = 0  # Processes moved by work stealing
+
+    @property
+    def num_cores(self):
+        return len(self.cores)
+
+    @property
+    def power_consumption(self):
+        """Total energy of all cores in Joules"""
+        return sum(core.power_consumption for core in self.cores)
+
+    @property
+    def idle_time(self):
+        """Idle time summed over all cores"""
+        return sum(core.idle_time for core in self.cores)
+
+    def core_summary(self):
+        """Per-core energy, idle time, busy time and dispatch count"""
+        return [
+            {
+                'core': index,
+                'energy': core.power_consumption,
+                'idle_time': core.idle_time,
+                'busy_time': self.busy_time[index],
+                'dispatches': self.dispatches[index],
+            }
+            for index, core in enumerate(self.cores)
+        ]
+
+
+def multicore_round_robin_scheduling(processes, time_quantum, cpu, work_stealing=True, sink=None):
+    """
+    Simulates per-core Round Robin on a MultiCoreCPU.
+
+    Arrivals are admitted whenever a core reaches a scheduling point and placed
+    on the core with the least queued work. With work_stealing a core whose own
+    queue is empty takes the newest process from the longest queue. An idle
+    core waits, as one idle interval, until the next arrival tick or the next
+    time another core may hand over work; idle time up to the makespan is
+    charged to every core.
+
+    With a single core the schedule and energy are identical to
+    round_robin_scheduling(..., skip_idle=True).
+    Returns list of completed processes in completion order.
+    """
+    processes = sorted(processes, key=lambda p: p.arrival_time)
+    total = len(processes)
+    cores = cpu.cores
+    count = len(cores)
+
+    queues = [deque() for _ in range(count)]
+    load = [0] * count  # Remaining work queued or running on each core
+    running = [None] * count  # Process each core is executing
+    busy_until = [None] * count  # End of the running quantum
+    idle_since = [None] * count  # Start of the current idle interval
+    token = [0] * count  # Sequence number of each core's valid event
+    events = []  # Heap of (time, sequence, core) scheduling points
+    sequence = 0
+
+    def wake(core_index, time):
+        nonlocal sequence
+        sequence += 1
+        token[core_index] = sequence
+        heapq.heappush(events, (time, sequence, core_index))
+
+    for core_index in range(count):
+        wake(core_index, 0)
+
+    completed_processes = []
+    next_arrival = 0
+    current_time = 0
+
+    while len(completed_processes) < total:
+        current_time, seq, c = heapq.heappop(events)
+        if seq != token[c]:
+            continue  # Superseded by a later wake-up
+        core = cores[c]
+
+        # Close the idle interval that ends now
+        if idle_since[c] is not None:
+            if current_time > idle_since[c]:
+                core.idle(current_time - idle_since[c], idle_since[c])
+            idle_since[c] = None
+
+        # Retire or requeue the process that just used its quantum
+        process = running[c]
+        if process is not None:
+            running[c] = None
+            busy_until[c] = None
+            if process.remaining_time == 0:
+                process.finish_time = current_time
+                completed_processes.append(process)
+                if sink is not None:
+                    sink.on_complete(process)
+            else:
+                queues[c].append(process)
+
+        # Place arrived processes on the least-loaded cores
+        while next_arrival < total and processes[next_arrival].arrival_time <= current_time:
+            process = processes[next_arrival]
+            next_arrival += 1
+            target = min(range(count), key=lambda i: (load[i], running[i] is not None, len(queues[i]), i))
+            queues[target].append(process)
+            load[target] += process.remaining_time
+            if target != c and running[target] is None and idle_since[target] is not None:
+                wake(target, current_time)
+
+        # Steal from the longest queue when this core has nothing to do
+        if not queues[c] and work_stealing:
+            victim = max(range(count), key=lambda i: len(queues[i]))
+            if queues[victim]:
+                process = queues[victim].pop()
+                load[victim] -= process.remaining_time
+                load[c] += process.remaining_time
+                queues[c].append(process)
+                cpu.steals += 1
+
+        if queues[c]:
+            process = queues[c].popleft()
+            if process.start_time is None:
+                process.start_time = current_time
+            execution_time = core.execute(process, time_quantum, current_time)
+            load[c] -= execution_time
+            cpu.busy_time[c] += execution_time
+            cpu.dispatches[c] += 1
+            running[c] = process
+            busy_until[c] = current_time + execution_time
+            wake(c, busy_until[c])
+            continue
+
+        # Nothing to run - idle until an arrival or another core's next scheduling point
+        idle_since[c] = current_time
+        candidates = [t for t in busy_until if t is not None]
+        if next_arrival < total:
+            gap = max(1, math.ceil(processes[next_arrival].arrival_time - current_time))
+            candidates.append(current_time + gap)
+        if candidates and (work_stealing or next_arrival < total):
+            wake(c, min(candidates))
+
+    # Cores that ran out of work idle until the last process finishes
+    for c, core in enumerate(cores):
+        if idle_since[c] is not None and current_time > idle_since[c]:
+            core.idle(current_time - idle_since[c], idle_since[c])
+            idle_since[c] = None
+
+    if sink is not None:
+        sink.close(cpu)
+    return completed_processes
@@ -0,0 +1,319 @@
+# Online scheduling mode for the CPU simulator.
+# The offline schedulers need a sorted arrival stream they can read ahead in;
+# here processes are pushed in as they arrive (from a generator, an asyncio
+# source, or a replayed trace paced at wall-clock or accelerated speed) and
+# the scheduler advances only as far as the arrivals seen so far allow,
+# emitting each dispatch decision as it is made together with its latency.
+#
+#     python online.py workload.csv --speed 1000
+
+
+# online.py
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+
+from metrics import OnlineMetrics, P2Quantile, RunningStats
+from policies import POLICIES, create_policy
+
+DEFAULT_BUDGET = 1024  # Decisions per advance() before yielding to the event loop
+
+
+class Decision:
+    """One scheduling decision: a dispatch, or an idle period when process is None"""
+    __slots__ = ('time', 'process', 'duration', 'completed', 'latency')
+
+    def __init__(self, time, process, duration, completed, latency):
+        self.time = time  # Simulated time the decision takes effect
+        self.process = process
+        self.duration = duration  # Simulated time it covers
+        self.completed = completed  # The dispatched process finished in this slice
+        self.latency = latency  # Wall seconds from the enabling event to the decision
+
+    def __repr__(self):
+        what = "idle" if self.process is None else f"P{self.process.pid}"
+        return f"Decision({self.time!r}, {what}, {self.duration!r}, completed={self.completed})"
+
+
+class OnlineScheduler:
+    """
+    Push-driven form of iter_policy_scheduling. submit() hands over each
+    process as it arrives (in non-decreasing arrival_time order) and costs
+    O(1); advance() then makes every decision the arrivals seen so far allow.
+
+    A decision at simulated time t needs every arrival up to t, so it is made
+    only once the watermark has passed t: submitting a process moves the
+    watermark to its arrival time, advance(watermark) moves it explicitly
+    (e.g. from a live clock) and close() ends the stream. Fed the whole
+    stream this reproduces the offline schedule exactly. time_slice() is
+    given the next arrival only if it has already been submitted, so policies
+    that look ahead (SRTF, EDF) see what a real online scheduler would.
+    """
+
+    def __init__(self, policy, cpu, skip_idle=False, sink=None, instrumentation=None, start_time=0):
+        """
+        Initialize an online scheduler with:
+        - policy: A SchedulingPolicy owning the ready queue
+        - cpu: CPU (or PStateCPU) to run processes on
+        - skip_idle: Jump over idle gaps once the next arrival is known
+        - sink: Optional MetricsSink for completions; closed when the stream ends
+        - instrumentation: Optional Instrumentation notified of scheduler events
+        - start_time: Simulated time to start from
+        """
+        self.policy = policy
+        self.cpu = cpu
+        self.skip_idle = skip_idle
+        self.sink = sink
+        self.probe = instrumentation
+        self.current_time = start_time
+        self.pending = deque()  # Submitted, not yet admitted
+        self.watermark = start_time  # Every arrival before this has been submitted
+        self.last_arrival = None
+        self.received = time.perf_counter()  # Wall time the watermark last moved
+        self.closed = False
+        self.finished = False
+        self.decisions = 0
+        self.completed = 0
+        self.latency = RunningStats()
+        self.latency_p50 = P2Quantile(0.5)
+        self.latency_p99 = P2Quantile(0.99)
+        if instrumentation is not None:
+            instrumentation.begin(cpu)
+
+    def submit(self, process):
+        """Hand over a newly arrived process"""
+        if self.closed:
+            raise ValueError("Cannot submit to a closed arrival stream")
+        if self.last_arrival is not None and process.arrival_time < self.last_arrival:
+            raise ValueError(f"Process {process.pid} arrives out of order "
+                             f"({process.arrival_time} < {self.last_arrival})")
+        self.last_arrival = process.arrival_time
+        self.pending.append(process)
+        if process.arrival_time > self.watermark:
+            self.watermark = process.arrival_time
+            self.received = time.perf_counter()
+
+    def close(self):
+        """Mark the end of the arrival stream; advance() can then run to completion"""
+        self.closed = True
+        self.watermark = math.inf
+        self.received = time.perf_counter()
+
+    def advance(self, watermark=None, budget=None):
+        """
+        Make the decisions that are now possible. Returns them as a list of
+        Decision, at most budget long; call again while the list comes back
+        full. watermark declares that every arrival before it has been
+        submitted, even if no process arrived (a live clock passing).
+        """
+        if watermark is not None and watermark > self.watermark:
+            self.watermark = watermark
+            self.received = time.perf_counter()
+        decisions = []
+        policy = self.policy
+        cpu = self.cpu
+        pending = self.pending
+        probe = self.probe
+
+        while budget is None or len(decisions) < budget:
+            current_time = self.current_time
+            if current_time >= self.watermark:
+                break  # An arrival at current_time may still come
+
+            # Admit arrived processes
+            while pending and pending[0].arrival_time <= current_time:
+                process = pending.popleft()
+                policy.admit(process, current_time)
+                if probe is not None:
+                    probe.on_admit(current_time, process)
+
+            if not len(policy):
+                if not pending and self.closed:
+                    self._finish()
+                    break
+                # No processes ready - CPU idle
+                idle_units = 1
+                if self.skip_idle:
+                    if not pending:
+                        break  # The length of the gap is not known yet
+                    idle_units = max(1, math.ceil(pending[0].arrival_time - current_time))
+                cpu.idle(idle_units, current_time)
+                if probe is not None:
+                    probe.on_idle(current_time, idle_units)
+                    probe.on_frequency(current_time, cpu.current_frequency)
+                self.current_time = current_time + idle_units
+                decisions.append(self._decision(current_time, None, idle_units, False))
+                continue
+
+            process = policy.pick_next(current_time)
+            if process.start_time is None:
+                process.start_time = current_time
+            if probe is not None:
+                probe.on_dispatch(current_time, process)
+
+            next_arrival = pending[0].arrival_time if pending else None
+            execution_time = cpu.execute(process, policy.time_slice(process, current_time, next_arrival),
+                                         current_time)
+            if probe is not None:
+                probe.on_frequency(current_time, cpu.current_frequency)
+            self.current_time = current_time + execution_time
+
+            completed = process.remaining_time == 0
+            if completed:
+                process.finish_time = self.current_time
+                policy.on_complete(process, self.current_time)
+                self.completed += 1
+                if self.sink is not None:
+                    self.sink.on_complete(process)
+                if probe is not None:
+                    probe.on_complete(self.current_time, process)
+            else:
+                policy.on_preempt(process, self.current_time)
+                if probe is not None:
+                    probe.on_preempt(self.current_time, process)
+            decisions.append(self._decision(current_time, process, execution_time, completed))
+
+        return decisions
+
+    def _decision(self, current_time, process, duration, completed):
+        latency = time.perf_counter() - self.received
+        self.decisions += 1
+        self.latency.add(latency)
+        self.latency_p50.add(latency)
+        self.latency_p99.add(latency)
+        return Decision(current_time, process, duration, completed, latency)
+
+    def _finish(self):
+        if not self.finished:
+            self.finished = True
+            if self.sink is not None:
+                self.sink.close(self.cpu)
+
+    def summary(self):
+        """Decision counts and wall-clock decision latency in seconds"""
+        return {
+            'decisions': self.decisions,
+            'completed': self.completed,
+            'simulated_time': self.current_time,
+            'avg_decision_latency': self.latency.mean,
+            'p50_decision_latency': self.latency_p50.value,
+            'p99_decision_latency': self.latency_p99.value,
+            'max_decision_latency': self.latency.maximum,
+        }
+
+
+def iter_online_scheduling(arrivals, scheduler, budget=None):
+    """
+    Drive scheduler from a (possibly blocking or endless) generator of
+    arrivals, yielding each Decision as soon as it is made.
+    """
+    for process in arrivals:
+        scheduler.submit(process)
+        yield from scheduler.advance(budget=budget)
+    scheduler.close()
+    while not scheduler.finished:
+        yield from scheduler.advance(budget=budget)
+
+
+async def replay(processes, speed=1.0, seconds_per_unit=1.0):
+    """
+    Asynchronous arrival source replaying processes (sorted by arrival) in
+    real time: each is released seconds_per_unit * arrival_time / speed
+    seconds after the first call, so speed=100 plays a trace 100x faster.
+    speed=None releases them without waiting.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for process in processes:
+        if speed is not None:
+            delay = start + process.arrival_time * seconds_per_unit / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield process
+
+
+async def run_online(source, scheduler, on_decision=None, budget=DEFAULT_BUDGET):
+    """
+    Drive scheduler from an async iterable (or plain iterable) of arrivals,
+    passing each Decision to on_decision as it is made. At most budget
+    decisions are made before control returns to the event loop, so one
+    arrival that unlocks a long stretch of simulation cannot stall other
+    tasks. Returns scheduler.summary() once the stream ends.
+    """
+    async def drain():
+        while True:
+            decisions = scheduler.advance(budget=budget)
+            if on_decision is not None:
+                for decision in decisions:
+                    on_decision(decision)
+            if scheduler.finished or len(decisions) < budget:
+                return
+            await asyncio.sleep(0)
+
+    if hasattr(source, '__aiter__'):
+        async for process in source:
+            scheduler.submit(process)
+            await drain()
+    else:
+        for process in source:
+            scheduler.submit(process)
+            await drain()
+            await asyncio.sleep(0)
+    scheduler.close()
+    await drain()
+    return scheduler.summary()
+
+
+def main(argv=None):
+    from dvfs import PStateCPU
+    from scheduler import CPU
+    from workload_io import iter_processes
+
+    parser = argparse.ArgumentParser(description="Replay a workload through the online scheduler")
+    parser.add_argument('workload', help="Workload file: JSON, NDJSON, CSV or binary .wlb, sorted by arrival")
+    parser.add_argument('--speed', type=float, default=None,
+                        help="Simulated time units per wall second (default: as fast as possible)")
+    parser.add_argument('-q', '--time-quantum', type=float, default=3.0)
+    parser.add_argument('-p', '--base-power', type=float, default=125.0)
+    parser.add_argument('--max-frequency', type=float, default=5.8)
+    parser.add_argument('--min-frequency', type=float, default=3.0)
+    parser.add_argument('--policy', choices=list(POLICIES), default="Round Robin")
+    parser.add_argument('--pstates', action='store_true', help="Use the P-state DVFS model (runtime scales with 1/f)")
+    parser.add_argument('--skip-idle', action='store_true', help="Jump over idle gaps instead of ticking")
+    parser.add_argument('--decisions', action='store_true', help="Print every decision as a JSON line")
+    args = parser.parse_args(argv)
+
+    time_quantum = int(args.time_quantum) if args.time_quantum.is_integer() else args.time_quantum
+    if time_quantum <= 0 or args.base_power <= 0 or args.max_frequency <= 0 or args.min_frequency <= 0:
+        print("error: All parameters must be positive numbers", file=sys.stderr)
+        return 1
+    cpu_class = PStateCPU if args.pstates else CPU
+    cpu = cpu_class(base_power=args.base_power, max_frequency=args.max_frequency,
+                    min_frequency=args.min_frequency, record_history=False)
+    policy = create_policy(args.policy, time_quantum)
+    metrics = OnlineMetrics()
+    scheduler = OnlineScheduler(policy, cpu, skip_idle=args.skip_idle, sink=metrics)
+
+    def print_decision(decision):
+        pid = None if decision.process is None else decision.process.pid
+        print(json.dumps({'time': decision.time, 'pid': pid, 'duration': decision.duration,
+                          'completed': decision.completed, 'latency': decision.latency}))
+
+    source = replay(iter_processes(args.workload), speed=args.speed)
+    try:
+        summary = asyncio.run(run_online(source, scheduler,
+                                         on_decision=print_decision if args.decisions else None))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    summary.update(metrics.summary())
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,43 @@ import tkinter as tk
 # Tkinter is Python's standard GUI (Graphical User Interface) package. 
 # It's a thin object-oriented layer on top of Tcl/Tk that makes it easy to create desktop applications with Python.
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import numpy as np
+# matplotlib, numpy and the modules built on them are imported on first use,
+# so the window opens without paying for the plotting stack
 # JSON (JavaScript Object Notation)
 # JSON is a lightweight data interchange format that's easy for humans to read and write, and easy for machines to parse and generate.
 import json
-from scheduler import Process, CPU, round_robin_scheduling
-from matplotlib.ticker import MaxNLocator
+import queue
+import threading
+from array import array
+from scheduler import Process, CPU, iter_round_robin_scheduling
+from incremental import IncrementalSchedule
+from dvfs import DEFAULT_TRANSITION_LATENCY, PStateCPU
+from instrumentation import Instrumentation
+from policies import POLICIES, create_policy, iter_policy_scheduling
+from metrics import OnlineMetrics
+from workload_io import read_records, write_binary
+from virtual_table import VirtualTable
+from trace_export import export_trace
+
+# Color scheme shared by the widgets and the plots
+COLORS = {
+    'primary': '#1a237e',    # Deep Blue
+    'secondary': '#0d47a1',  # Rich Blue
+    'accent': '#2962ff',     # Bright Blue
+    'background': '#f5f6fa', # Light Gray-Blue
+    'surface': '#ffffff',    # White
+    'text': '#2c3e50',      # Dark Gray
+    'success': '#00c853',    # Green
+    'warning': '#ffd600',    # Yellow
+    'error': '#d50000',     # Red
+    'idle': '#ffecb3'       # Light Yellow
+}
+class SimulationCancelled(Exception):
+    """Raised from a scheduler hook to stop a run the user cancelled"""
+
+
+GANTT_LABEL_PIXELS = 18  # Vertical pixels per Gantt row label; zooming in labels the rows skipped
+
 
 class EnergyEfficientSchedulerGUI:
     def __init__(self, root):
@@ -29,18 +58,7 @@ class EnergyEfficientSchedulerGUI:
     def configure_styles(self):
         """Configure custom styles for the GUI with modern aesthetics"""
         # Updated modern color scheme
-        self.colors = {
-            'primary': '#1a237e',    # Deep Blue
-            'secondary': '#0d47a1',  # Rich Blue
-            'accent': '#2962ff',     # Bright Blue
-            'background': '#f5f6fa', # Light Gray-Blue
-            'surface': '#ffffff',    # White
-            'text': '#2c3e50',      # Dark Gray
-            'success': '#00c853',    # Green
-            'warning': '#ffd600',    # Yellow
-            'error': '#d50000',     # Red
-            'idle': '#ffecb3'       # Light Yellow
-        }
+        self.colors = dict(COLORS)
 
         # Configure main styles with shadows and rounded corners
         self.style.configure('Custom.TFrame',
@@ -143,23 +161,9 @@ class EnergyEfficientSchedulerGUI:
         """Create widgets for process input"""
         # Process table
         columns = ("PID", "Arrival Time", "Burst Time", "Priority")
-        self.process_table = ttk.Treeview(
-            self.input_frame, 
-            columns=columns, 
-            show="headings", 
-            height=8,
-            selectmode='browse'
-        )
-        
-        # Configure columns
         col_widths = [50, 90, 80, 70]
-        for col, width in zip(columns, col_widths):
-            self.process_table.heading(col, text=col)
-            self.process_table.column(col, width=width, anchor=tk.CENTER)
-        
-        # Scrollbar for table
-        scrollbar = ttk.Scrollbar(self.input_frame, orient=tk.VERTICAL, command=self.process_table.yview)
-        self.process_table.configure(yscrollcommand=scrollbar.set)
+        self.process_table = VirtualTable(self.input_frame, columns, col_widths, height=8)
+        self.process_pids = set()  # PIDs in the table, for duplicate checks
         
         # Process entry fields
         self.pid_var = tk.IntVar()
@@ -195,8 +199,8 @@ class EnergyEfficientSchedulerGUI:
         ttk.Button(io_frame, text="Export Processes", command=self.export_processes).pack(side=tk.LEFT, padx=5)
         
         # Layout the table and scrollbar
-        self.process_table.grid(row=0, column=0, columnspan=4, padx=5, pady=5, sticky='nsew')
-        scrollbar.grid(row=0, column=4, sticky='ns')
+        self.process_table.tree.grid(row=0, column=0, columnspan=4, padx=5, pady=5, sticky='nsew')
+        self.process_table.scrollbar.grid(row=0, column=4, sticky='ns')
     
     def add_process(self):
         """Add a new process to the table"""
@@ -210,11 +214,11 @@ class EnergyEfficientSchedulerGUI:
                 raise ValueError("All values must be positive integers")
             
             # Check for duplicate PID
-            for item in self.process_table.get_children():
-                if self.process_table.item(item)['values'][0] == pid:
-                    raise ValueError(f"Process with PID {pid} already exists")
+            if pid in self.process_pids:
+                raise ValueError(f"Process with PID {pid} already exists")
             
-            self.process_table.insert("", "end", values=(pid, arrival, burst, priority))
+            self.process_table.append((pid, arrival, burst, priority))
+            self.process_pids.add(pid)
             
             # Clear entry fields
             self.pid_var.set("")
@@ -235,12 +239,12 @@ class EnergyEfficientSchedulerGUI:
     def remove_process(self):
         """Remove selected process from the table"""
         try:
-            selected_item = self.process_table.selection()
-            if not selected_item:
+            selected_index = self.process_table.selected_index()
+            if selected_index is None:
                 raise ValueError("No process selected")
             
-            pid = self.process_table.item(selected_item)['values'][0]
-            self.process_table.delete(selected_item)
+            pid = self.process_table.delete(selected_index)[0]
+            self.process_pids.discard(pid)
 
 
         
@@ -251,29 +255,26 @@ class EnergyEfficientSchedulerGUI:
     
     def clear_processes(self):
         """Clear all processes from the table"""
-        for item in self.process_table.get_children():
-            self.process_table.delete(item)
+        self.process_table.clear()
+        self.process_pids.clear()
 
 
     
     def import_processes(self):
-        """Import processes from a JSON file"""
+        """Import processes from a JSON, NDJSON, CSV or binary workload file"""
         try:
             filepath = filedialog.askopenfilename(
                 title="Import Processes",
-                filetypes=(("JSON files", "*.json"), ("All files", "*.*")))
+                filetypes=(("JSON files", "*.json"), ("NDJSON traces", "*.ndjson *.jsonl"),
+                           ("CSV files", "*.csv"), ("Binary workloads", "*.wlb"), ("All files", "*.*")))
             
             if not filepath:
                 return
                 
-            with open(filepath, 'r') as f:
-                processes = json.load(f)
+            processes = read_records(filepath)
             
-            self.clear_processes()
-            for proc in processes:
-                self.process_table.insert("", "end", values=(
-                    proc['pid'], proc['arrival'], proc['burst'], proc['priority']
-                ))
+            self.process_table.set_rows(processes)
+            self.process_pids = {proc[0] for proc in processes}
             
 
 
@@ -284,28 +285,31 @@ class EnergyEfficientSchedulerGUI:
 
     
     def export_processes(self):
-        """Export processes to a JSON file"""
+        """Export processes to a JSON or binary workload file"""
         try:
-            processes = []
-            for item in self.process_table.get_children():
-                pid, arrival, burst, priority = self.process_table.item(item)['values']
-                processes.append({
-                    'pid': pid,
-                    'arrival': arrival,
-                    'burst': burst,
-                    'priority': priority
-                })
-            
-            if not processes:
+            if not len(self.process_table):
                 raise ValueError("No processes to export")
                 
             filepath = filedialog.asksaveasfilename(
                 title="Export Processes",
                 defaultextension=".json",
-                filetypes=(("JSON files", "*.json"), ("All files", "*.*")))
+                filetypes=(("JSON files", "*.json"), ("Binary workloads", "*.wlb"), ("All files", "*.*")))
             
             if not filepath:
                 return
+
+            if filepath.lower().endswith('.wlb'):
+                write_binary(filepath, self.process_table)
+                return
+
+            processes = []
+            for pid, arrival, burst, priority in self.process_table:
+                processes.append({
+                    'pid': pid,
+                    'arrival': arrival,
+                    'burst': burst,
+                    'priority': priority
+                })
                 
             with open(filepath, 'w') as f:
                 json.dump(processes, f, indent=2)
@@ -318,6 +322,27 @@ class EnergyEfficientSchedulerGUI:
 
 
 
+    def export_trace(self):
+        """Export the last simulated schedule as a Chrome trace-event file"""
+        try:
+            if self.last_results is None:
+                raise ValueError("Run a simulation before exporting a trace")
+            
+            filepath = filedialog.asksaveasfilename(
+                title="Export Trace",
+                defaultextension=".json.gz",
+                filetypes=(("Compressed traces", "*.json.gz"), ("Trace files", "*.json"), ("All files", "*.*")))
+            
+            if not filepath:
+                return
+            
+            export_trace(filepath, *self.last_results)
+        
+        except Exception as e:
+            messagebox.showerror("Export Error", str(e))
+
+
+
     def create_control_widgets(self):
         """Create widgets for simulation controls"""
         # Time quantum input
@@ -342,32 +367,75 @@ class EnergyEfficientSchedulerGUI:
             ttk.Label(self.control_frame, text=label).grid(row=i+2, column=0, padx=5, pady=2, sticky='e')
             ttk.Entry(self.control_frame, textvariable=var, width=8).grid(row=i+2, column=1, padx=5, pady=2, sticky='w')
         
-        # Run button
-        ttk.Button(self.control_frame, text="Run Simulation", command=self.run_simulation).grid(
-            row=5, column=0, columnspan=2, pady=15, ipadx=20, ipady=5
+        # Run and cancel buttons
+        self.run_button = ttk.Button(self.control_frame, text="Run Simulation", command=self.run_simulation)
+        self.run_button.grid(row=5, column=0, pady=15, ipadx=20, ipady=5)
+        self.cancel_button = ttk.Button(self.control_frame, text="Cancel", command=self.cancel_simulation,
+                                        state=tk.DISABLED)
+        self.cancel_button.grid(row=5, column=1, pady=15, ipady=5)
+        
+        # Reuse stored results for workloads and parameters seen before
+        self.use_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.control_frame, text="Use result cache", variable=self.use_cache_var).grid(
+            row=8, column=0, columnspan=2, pady=2
+        )
+        self.instrument_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.control_frame, text="Instrument run (counters, phase timers)",
+                        variable=self.instrument_var).grid(row=9, column=0, columnspan=2, pady=2)
+        
+        # Write the last schedule for a trace viewer (chrome://tracing, Perfetto); only
+        # enabled while a finished run's results are available
+        self.export_trace_button = ttk.Button(self.control_frame, text="Export Trace", command=self.export_trace,
+                                              state=tk.DISABLED)
+        self.export_trace_button.grid(row=10, column=0, columnspan=2, pady=5)
+        
+        # Scheduling policy; anything but round robin runs without incremental resume
+        ttk.Label(self.control_frame, text="Policy:").grid(row=11, column=0, padx=5, pady=5, sticky='e')
+        self.policy_var = tk.StringVar(value="Round Robin")
+        ttk.Combobox(self.control_frame, textvariable=self.policy_var, values=list(POLICIES),
+                     state='readonly', width=12).grid(row=11, column=1, padx=5, pady=5, sticky='w')
+        
+        # Discrete P-states where runtime scales with 1/f, instead of frequency-only power scaling
+        self.pstate_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.control_frame, text="P-state DVFS model (runtime scales with 1/f)",
+                        variable=self.pstate_var).grid(row=12, column=0, columnspan=2, pady=2)
+        # Cost of each P-state change; a blank energy charges base power for the latency
+        self.transition_latency_var = tk.DoubleVar(value=DEFAULT_TRANSITION_LATENCY)
+        self.transition_energy_var = tk.StringVar(value="")
+        ttk.Label(self.control_frame, text="Transition (units):").grid(row=13, column=0, padx=5, pady=2, sticky='e')
+        ttk.Entry(self.control_frame, textvariable=self.transition_latency_var, width=8).grid(
+            row=13, column=1, padx=5, pady=2, sticky='w')
+        ttk.Label(self.control_frame, text="Transition (J):").grid(row=14, column=0, padx=5, pady=2, sticky='e')
+        ttk.Entry(self.control_frame, textvariable=self.transition_energy_var, width=8).grid(
+            row=14, column=1, padx=5, pady=2, sticky='w')
+        self.last_results = None  # (completed processes, CPU) of the last finished run
+        self.result_cache = None  # Opened on first use
+        self.last_schedule = None  # IncrementalSchedule of the last finished run, once editing
+        self.last_schedule_params = None
+        self.last_workload = None  # pid -> (arrival, burst, priority) of the last finished run
+        
+        # Progress of a running simulation (completed processes)
+        self.progress_var = tk.DoubleVar(value=0)
+        self.progress_bar = ttk.Progressbar(self.control_frame, variable=self.progress_var, mode='determinate')
+        self.progress_bar.grid(row=6, column=0, columnspan=2, padx=5, sticky='ew')
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(self.control_frame, textvariable=self.status_var, font=('Segoe UI', 9)).grid(
+            row=7, column=0, columnspan=2, pady=2
         )
+        
+        # State of the background simulation
+        self.sim_thread = None
+        self.sim_cancel = threading.Event()
+        self.sim_results = queue.Queue()
+        self.sim_completed = 0
+        self.sim_time = 0  # Simulated time the running scheduler has reached
     
     def create_result_widgets(self):
         """Create widgets for results display"""
         # Result table
         columns = ("PID", "Start Time", "Finish Time", "Turnaround", "Waiting")
-        self.result_table = ttk.Treeview(
-            self.result_frame, 
-            columns=columns, 
-            show="headings", 
-            height=8,
-            selectmode='browse'
-        )
-        
-        # Configure columns
         col_widths = [50, 80, 80, 80, 80]
-        for col, width in zip(columns, col_widths):
-            self.result_table.heading(col, text=col)
-            self.result_table.column(col, width=width, anchor=tk.CENTER)
-        
-        # Scrollbar for result table
-        scrollbar = ttk.Scrollbar(self.result_frame, orient=tk.VERTICAL, command=self.result_table.yview)
-        self.result_table.configure(yscrollcommand=scrollbar.set)
+        self.result_table = VirtualTable(self.result_frame, columns, col_widths, height=8)
         
         # Metrics display
         self.metrics_frame = ttk.Frame(self.result_frame)
@@ -377,13 +445,15 @@ class EnergyEfficientSchedulerGUI:
         self.power_consumption_var = tk.StringVar(value="Total Power Consumption: - Joules")
         self.idle_time_var = tk.StringVar(value="CPU Idle Time: - units")
         self.energy_saving_var = tk.StringVar(value="Estimated Energy Savings: - %")
+        self.instrumentation_var = tk.StringVar(value="Scheduler Counters: -")
         
         metrics = [
             self.avg_turnaround_var, 
             self.avg_waiting_var,
             self.power_consumption_var,
             self.idle_time_var,
-            self.energy_saving_var
+            self.energy_saving_var,
+            self.instrumentation_var
         ]
         
         for metric in metrics:
@@ -391,8 +461,8 @@ class EnergyEfficientSchedulerGUI:
             label.pack(anchor=tk.W, pady=2)
         
         # Layout the widgets
-        self.result_table.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.result_table.tree.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.result_table.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.metrics_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=10)
     
     def create_visualization_widgets(self):
@@ -400,16 +470,31 @@ class EnergyEfficientSchedulerGUI:
         # Notebook for multiple tabs
         self.visualization_notebook = ttk.Notebook(self.visualization_frame)
         
-        # Create tabs
-        self.create_power_consumption_tab()
-        self.create_gantt_chart_tab()
-        self.create_frequency_usage_tab()
+        # Chart tabs are created with the first results (see create_plot_tabs)
+        self.placeholder_tab = ttk.Frame(self.visualization_notebook)
+        ttk.Label(self.placeholder_tab, text="Run a simulation to see the charts").pack(expand=True)
+        self.visualization_notebook.add(self.placeholder_tab, text="Charts")
+        self.plots_created = False
         
         # Pack the notebook
         self.visualization_notebook.pack(fill=tk.BOTH, expand=True)
     
+    def create_plot_tabs(self):
+        """Replace the placeholder with the chart tabs, importing matplotlib on first use"""
+        if self.plots_created:
+            return
+        self.visualization_notebook.forget(self.placeholder_tab)
+        self.placeholder_tab.destroy()
+        self.create_power_consumption_tab()
+        self.create_gantt_chart_tab()
+        self.create_frequency_usage_tab()
+        self.plots_created = True
+    
     def create_power_consumption_tab(self):
         """Create power consumption visualization tab"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        
         self.power_tab = ttk.Frame(self.visualization_notebook)
         self.power_fig, self.power_ax = plt.subplots(figsize=(10, 4), dpi=100)
         self.power_fig.patch.set_facecolor('#f5f5f5')
@@ -432,6 +517,9 @@ class EnergyEfficientSchedulerGUI:
     
     def create_gantt_chart_tab(self):
         """Create Gantt chart visualization tab"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        
         self.gantt_tab = ttk.Frame(self.visualization_notebook)
         self.gantt_fig, self.gantt_ax = plt.subplots(figsize=(10, 4), dpi=100)
         self.gantt_fig.patch.set_facecolor('#f5f5f5')
@@ -443,6 +531,10 @@ class EnergyEfficientSchedulerGUI:
         self.gantt_ax.set_ylabel("Processes", fontsize=10)
         self.gantt_ax.set_title("Process Execution Gantt Chart", fontsize=12, pad=10)
         
+        # Lay out once, leaving room for row labels up to "P1000000"; update_gantt_chart keeps this layout
+        self.gantt_ax.set_yticks([0], labels=["P1000000"])
+        self.gantt_fig.tight_layout()
+        
         # Create canvas and toolbar
         self.gantt_canvas = FigureCanvasTkAgg(self.gantt_fig, master=self.gantt_tab)
         self.gantt_toolbar = NavigationToolbar2Tk(self.gantt_canvas, self.gantt_tab)
@@ -454,6 +546,9 @@ class EnergyEfficientSchedulerGUI:
     
     def create_frequency_usage_tab(self):
         """Create CPU frequency usage visualization tab"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        
         self.freq_tab = ttk.Frame(self.visualization_notebook)
         self.freq_fig, self.freq_ax = plt.subplots(figsize=(10, 4), dpi=100)
         self.freq_fig.patch.set_facecolor('#f5f5f5')
@@ -496,14 +591,17 @@ class EnergyEfficientSchedulerGUI:
 
     
     def run_simulation(self):
-        """Run the scheduling simulation"""
+        """Start the scheduling simulation in a background thread"""
         try:
-            # Get process details from the table
+            if self.sim_thread is not None:
+                raise ValueError("A simulation is already running")
+            
+            # Get process details from the table; imported traces may have fractional times
             processes = []
-            for row in self.process_table.get_children():
-                values = self.process_table.item(row)["values"]
-                pid, arrival_time, burst_time, priority = map(int, values)
-                processes.append(Process(pid, arrival_time, burst_time, priority))
+            for pid, arrival_time, burst_time, priority in self.process_table:
+                if pid != int(pid) or priority != int(priority):
+                    raise ValueError(f"Process {pid}: PID and priority must be integers")
+                processes.append(Process(int(pid), arrival_time, burst_time, int(priority)))
             
             if not processes:
                 raise ValueError("No processes to schedule")
@@ -517,48 +615,249 @@ class EnergyEfficientSchedulerGUI:
             if time_quantum <= 0 or base_power <= 0 or max_freq <= 0 or min_freq <= 0:
                 raise ValueError("All parameters must be positive numbers")
             
-            # Create CPU instance and run simulation
-            cpu = CPU(base_power=base_power, max_frequency=max_freq, min_frequency=min_freq)
-            completed_processes = round_robin_scheduling(processes.copy(), time_quantum, cpu)
+            # Create CPU instance and run simulation off the Tk main thread
+            cpu_class = PStateCPU if self.pstate_var.get() else CPU
+            if cpu_class is PStateCPU:
+                transition_latency = self.transition_latency_var.get()
+                transition_energy = self.transition_energy_var.get().strip()
+                transition_energy = float(transition_energy) if transition_energy else None
+                if transition_latency < 0 or (transition_energy is not None and transition_energy < 0):
+                    raise ValueError("Transition latency and energy must not be negative")
+                cpu = PStateCPU(base_power=base_power, max_frequency=max_freq, min_frequency=min_freq,
+                                transition_latency=transition_latency, transition_energy=transition_energy)
+            else:
+                cpu = CPU(base_power=base_power, max_frequency=max_freq, min_frequency=min_freq)
+            metrics = OnlineMetrics()
             
-            # Clear previous results
-            for row in self.result_table.get_children():
-                self.result_table.delete(row)
+            # The run may resume the last schedule, changing its processes and CPU in
+            # place, so the last results stay unavailable until the run finishes
+            self.last_results = None
+            self.export_trace_button.configure(state=tk.DISABLED)
+            self.sim_cancel.clear()
+            self.sim_completed = 0
+            self.sim_time = 0
+            self.progress_bar.configure(maximum=len(processes))
+            self.progress_var.set(0)
+            self.status_var.set(f"Simulating {len(processes)} processes...")
+            self.run_button.configure(state=tk.DISABLED)
+            self.cancel_button.configure(state=tk.NORMAL)
             
-            # Display results
-            for process in completed_processes:
-                turnaround_time = process.finish_time - process.arrival_time
-                waiting_time = turnaround_time - process.burst_time
-                self.result_table.insert("", "end", values=(
-                    process.pid, 
-                    process.start_time, 
-                    process.finish_time,
-                    turnaround_time, 
-                    waiting_time
-                ))
+            instrumentation = Instrumentation(timers=True) if self.instrument_var.get() else None
+            policy = None
+            if self.policy_var.get() != "Round Robin":
+                policy = create_policy(self.policy_var.get(), time_quantum)
+            cache = None
+            # Cached entries only restore the basic CPU's accumulators
+            if self.use_cache_var.get() and cpu_class is CPU:
+                if self.result_cache is None:
+                    from result_cache import ResultCache
+                    self.result_cache = ResultCache()
+                cache = self.result_cache
             
-            # Calculate and display metrics
-            total_turnaround = sum(p.finish_time - p.arrival_time for p in completed_processes)
-            total_waiting = sum((p.finish_time - p.arrival_time - p.burst_time) for p in completed_processes)
+            self.sim_thread = threading.Thread(
+                target=self.simulation_worker,
+                args=(processes, time_quantum, cpu, metrics, cache, instrumentation, policy),
+                daemon=True
+            )
+            self.sim_thread.start()
+            self.root.after(100, self.poll_simulation)
+        
+        except Exception as e:
+            messagebox.showerror("Simulation Error", str(e))
+
+    def simulation_worker(self, processes, time_quantum, cpu, metrics, cache=None, instrumentation=None,
+                          policy=None):
+        """Run the scheduler on a worker thread; only touches plain Python state, never Tk"""
+        # A long burst or idle gap can go a long time without a completion, so
+        # cancellation and progress are checked on every dispatch and idle step
+        probe = instrumentation if instrumentation is not None else Instrumentation()
+        
+        def check_cancelled(current_time, _):
+            self.sim_time = current_time
+            if self.sim_cancel.is_set():
+                raise SimulationCancelled
+        
+        probe.add_hook('dispatch', check_cancelled)
+        probe.add_hook('idle', check_cancelled)
+        try:
+            if instrumentation is not None or policy is not None:
+                # Counters must cover the whole run, and checkpoints only exist for
+                # round robin, so bypass the cache and incremental resume
+                completed_processes = []
+                arrivals = sorted(processes, key=lambda p: p.arrival_time)
+                if policy is None:
+                    completions = iter_round_robin_scheduling(arrivals, time_quantum, cpu, sink=metrics,
+                                                              instrumentation=probe)
+                else:
+                    completions = iter_policy_scheduling(arrivals, policy, cpu, sink=metrics,
+                                                         instrumentation=probe)
+                for process in completions:
+                    completed_processes.append(process)
+                    self.sim_completed = len(completed_processes)
+                self.sim_results.put(('done', (processes, completed_processes, cpu, metrics, instrumentation)))
+                return
             
-            self.avg_turnaround_var.set(f"Average Turnaround Time: {total_turnaround/len(completed_processes):.2f} units")
-            self.avg_waiting_var.set(f"Average Waiting Time: {total_waiting/len(completed_processes):.2f} units")
-            self.power_consumption_var.set(f"Total Power Consumption: {cpu.power_consumption:.2f} Joules")
-            self.idle_time_var.set(f"CPU Idle Time: {cpu.idle_time} units")
+            key = None
+            if cache is not None:
+                from result_cache import simulation_key, pack_result, unpack_result
+                key = simulation_key(processes, time_quantum, cpu.base_power,
+                                     cpu.max_frequency, cpu.min_frequency, skip_idle=False)
+                entry = cache.get(key)
+                if entry is not None:
+                    completed_processes = unpack_result(*entry, cpu)
+                    for process in completed_processes:
+                        metrics.on_complete(process)
+                    metrics.close(cpu)
+                    self.sim_completed = len(completed_processes)
+                    self.sim_results.put(('done', (processes, completed_processes, cpu, metrics)))
+                    return
             
-            # Calculate energy savings
-            baseline_power = base_power * sum(p.burst_time for p in processes)
-            energy_saving = ((baseline_power - cpu.power_consumption) / baseline_power) * 100
-            self.energy_saving_var.set(f"Estimated Energy Savings: {energy_saving:.1f}%")
+            # Checkpoints only pay off while a workload is being edited and re-run:
+            # a plain run unless processes were added or removed since the last
+            # one, then a checkpointed run, and after that resume from checkpoints
+            params = (time_quantum, cpu.base_power, cpu.max_frequency, cpu.min_frequency, type(cpu),
+                      getattr(cpu, 'transition_latency', None), getattr(cpu, 'transition_energy', None))
+            schedule, self.last_schedule = self.last_schedule, None
+            previous, self.last_workload = self.last_workload, None
+            current = {p.pid: (p.arrival_time, p.burst_time, p.priority) for p in processes}
+            edited = (previous is not None and previous != current and self.last_schedule_params == params
+                      and len(current) == len(processes))
+            if not edited:
+                schedule = None
+                completed_processes = []
+                completions = iter_round_robin_scheduling(sorted(processes, key=lambda p: p.arrival_time),
+                                                          time_quantum, cpu, instrumentation=probe)
+            elif schedule is not None and self.resumable(previous, current):
+                removed = [pid for pid, record in previous.items() if current.get(pid) != record]
+                added = [p for p in processes if previous.get(p.pid) != current[p.pid]]
+                schedule.instrumentation = probe
+                completions = schedule.iter_apply_edits(added, removed)
+                completed_processes = schedule.completed
+            else:
+                schedule = IncrementalSchedule(time_quantum, cpu, instrumentation=probe)
+                completions = schedule.iter_run(processes)
+                completed_processes = schedule.completed
             
-            # Update visualizations
-            self.update_visualizations(completed_processes, cpu)
+            for process in completions:
+                if schedule is None:
+                    completed_processes.append(process)
+                self.sim_completed = len(completed_processes)
+            self.sim_completed = len(completed_processes)
+            self.last_schedule = schedule
+            self.last_schedule_params = params
+            self.last_workload = current
             
+            if schedule is not None:
+                cpu = schedule.cpu
+                completed_processes = list(schedule.completed)
+            for process in completed_processes:
+                metrics.on_complete(process)
+            metrics.close(cpu)
+            if key is not None:
+                cache.put(key, *pack_result(completed_processes, cpu))
+            self.sim_results.put(('done', (processes, completed_processes, cpu, metrics)))
+        except SimulationCancelled:
+            self.sim_results.put(('cancelled', None))
+        except Exception as e:
+            self.sim_results.put(('error', e))
 
+    @staticmethod
+    def resumable(previous, current):
+        """
+        Whether resuming from checkpoints gives the schedule a fresh run over
+        the table would. Processes arriving at the same time run in table
+        order, and a resume keeps unchanged rows in their old order with
+        changed rows after them (where Add Process puts them); an import that
+        reorders rows needs a full run instead. Both map pid -> record in
+        table order.
+        """
+        kept = [pid for pid, record in previous.items() if current.get(pid) == record]
+        changed = [pid for pid, record in current.items() if previous.get(pid) != record]
+        return list(current) == kept + changed
 
+    def poll_simulation(self):
+        """Report progress and apply the results once the worker has finished"""
+        self.progress_var.set(self.sim_completed)
+        try:
+            status, payload = self.sim_results.get_nowait()
+        except queue.Empty:
+            if not self.sim_cancel.is_set():
+                self.status_var.set(f"Simulating: {self.sim_completed} processes done, time {self.sim_time:g}")
+            self.root.after(100, self.poll_simulation)
+            return
         
-        except Exception as e:
-            messagebox.showerror("Simulation Error", str(e))
+        self.sim_thread = None
+        self.run_button.configure(state=tk.NORMAL)
+        self.cancel_button.configure(state=tk.DISABLED)
+        
+        if status in ('cancelled', 'error'):
+            # A cancelled resume leaves the schedule half rolled back; start afresh next time
+            self.last_schedule = None
+            self.last_workload = None
+        if status == 'cancelled':
+            self.status_var.set("Simulation cancelled")
+        elif status == 'error':
+            self.status_var.set("Simulation failed")
+            messagebox.showerror("Simulation Error", str(payload))
+        else:
+            self.status_var.set("Simulation finished")
+            try:
+                self.show_results(*payload)
+            except Exception as e:
+                messagebox.showerror("Simulation Error", str(e))
+
+    def cancel_simulation(self):
+        """Ask the running simulation to stop"""
+        if self.sim_thread is not None:
+            self.sim_cancel.set()
+            self.status_var.set("Cancelling...")
+
+    def show_results(self, processes, completed_processes, cpu, metrics, instrumentation=None):
+        """Fill the result table, metrics panel and charts from a finished simulation"""
+        # Display results (replaces the previous rows in one step)
+        self.result_table.set_rows([
+            (
+                process.pid, 
+                process.start_time, 
+                process.finish_time,
+                process.finish_time - process.arrival_time,
+                process.finish_time - process.arrival_time - process.burst_time
+            )
+            for process in completed_processes
+        ])
+        
+        # Display metrics accumulated by the scheduler
+        self.avg_turnaround_var.set(f"Average Turnaround Time: {metrics.turnaround.mean:.2f} units")
+        self.avg_waiting_var.set(f"Average Waiting Time: {metrics.waiting.mean:.2f} units")
+        power_text = f"Total Power Consumption: {cpu.power_consumption:.2f} Joules"
+        if isinstance(cpu, PStateCPU):
+            power_text += f" ({cpu.transitions} P-state transitions, {cpu.transition_time:g} units stalled)"
+        self.power_consumption_var.set(power_text)
+        self.idle_time_var.set(f"CPU Idle Time: {cpu.idle_time} units")
+        
+        # Calculate energy savings
+        baseline_power = cpu.base_power * sum(p.burst_time for p in processes)
+        energy_saving = ((baseline_power - cpu.power_consumption) / baseline_power) * 100
+        self.energy_saving_var.set(f"Estimated Energy Savings: {energy_saving:.1f}%")
+        
+        if instrumentation is None:
+            self.instrumentation_var.set("Scheduler Counters: -")
+        else:
+            counters = instrumentation.summary()
+            text = (f"Scheduler Counters: {counters['dispatches']} dispatches, "
+                    f"{counters['preemptions']} preemptions, "
+                    f"{counters['frequency_transitions']} frequency transitions, "
+                    f"{counters['idle_periods']} idle periods")
+            if instrumentation.timers:
+                phases = ", ".join(f"{phase} {seconds * 1000:.1f}"
+                                   for phase, seconds in instrumentation.phase_times.items())
+                text += f"\nPhase Times (ms): {phases}"
+            self.instrumentation_var.set(text)
+        
+        # Update visualizations
+        self.last_results = (completed_processes, cpu)
+        self.export_trace_button.configure(state=tk.NORMAL)
+        self.update_visualizations(completed_processes, cpu)
 
 
 
@@ -566,37 +865,41 @@ class EnergyEfficientSchedulerGUI:
         """Update all visualization tabs with simulation results"""
         if not completed_processes:
             return
-            
-        max_time = max(p.finish_time for p in completed_processes)
-        time_points = np.arange(0, max_time + 1)
+        self.create_plot_tabs()
         
         # Update power consumption plot
         self.update_power_plot(cpu)
         
         # Update Gantt chart
-        self.update_gantt_chart(completed_processes)
+        self.update_gantt_chart(completed_processes, cpu)
         
         # Update frequency usage plot
         self.update_frequency_plot(cpu)
     
     def update_power_plot(self, cpu):
         """Update the power consumption plot with enhanced styling"""
+        from decimation import MinMaxPyramid
+        
         self.power_ax.clear()
         
         if not cpu.power_history:
             return
         
-        times, powers = zip(*cpu.power_history)
+        times, powers = cpu.power_history.columns()
+        
+        # Draw a min/max decimated view that is re-queried when the user zooms
+        self.power_lod = MinMaxPyramid(times, powers)
+        times, powers = self.power_lod.query(times[0], times[-1], self.plot_pixels(self.power_ax))
         
         # Plot with gradient fill
-        self.power_ax.fill_between(
+        self.power_fill = self.power_ax.fill_between(
             times, 
             powers,
             alpha=0.3,
             color=self.colors['secondary']
         )
         
-        self.power_ax.plot(
+        self.power_line, = self.power_ax.plot(
             times,
             powers,
             color=self.colors['secondary'],
@@ -623,68 +926,82 @@ class EnergyEfficientSchedulerGUI:
             spine.set_linewidth(0.5)
         
         self.power_fig.patch.set_facecolor(self.colors['background'])
+        self.power_ax.callbacks.connect('xlim_changed', self.refresh_power_plot)
         self.power_canvas.draw()
     
-    def update_gantt_chart(self, completed_processes):
+    def plot_pixels(self, ax):
+        """Width of an axes in screen pixels, the resolution histories are decimated to"""
+        return max(int(ax.bbox.width), 100)
+    
+    def refresh_power_plot(self, ax):
+        """Re-query the power history at the resolution of the current zoom level"""
+        import numpy as np
+        
+        start, end = ax.get_xlim()
+        times, powers = self.power_lod.query(start, end, self.plot_pixels(ax))
+        if not len(times):
+            return
+        self.power_line.set_data(times, powers)
+        outline = np.column_stack((
+            np.concatenate(([times[0]], times, [times[-1]])),
+            np.concatenate(([0], powers, [0]))
+        ))
+        self.power_fill.set_verts([outline])
+        self.power_canvas.draw_idle()
+    
+    def update_gantt_chart(self, completed_processes, cpu):
         """Update the Gantt chart with process execution timeline"""
+        import numpy as np
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+        from matplotlib.colors import to_rgba
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+        
         self.gantt_ax.clear()
         
-        # Prepare data
+        # Prepare data: one row per process plus a row for CPU utilization
         pids = [f"P{p.pid}" for p in completed_processes]
-        pids.append("CPU")  # Add a row for CPU utilization
-        
-        # Create color map based on priority
-        colors = ['#2ecc71' if p.priority == 1 else '#f39c12' for p in completed_processes]
-        
-        # Plot each process's execution intervals
-        for i, process in enumerate(completed_processes):
-            for start, end in process.execution_history:
-                self.gantt_ax.barh(
-                    pids[i], 
-                    end - start, 
-                    left=start, 
-                    color=colors[i],
-                    edgecolor='#34495e',
-                    height=0.6,
-                    alpha=0.8
-                )
-
-
-        
-        # Find and plot idle intervals
-        if completed_processes:
-            max_time = max(end for p in completed_processes for _, end in p.execution_history)
-            busy_intervals = sorted([(start, end) for p in completed_processes for start, end in p.execution_history])
-            current_time = 0
-            
-            # Plot idle intervals
-            for start, end in busy_intervals:
-                if start > current_time:
-                    # There's an idle interval
-                    self.gantt_ax.barh(
-                        "CPU",
-                        start - current_time,
-                        left=current_time,
-                        color='#e74c3c',  # Red for idle time
-                        edgecolor='#34495e',
-                        height=0.6,
-                        alpha=0.4,
-                        hatch='//'
-                    )
-                current_time = max(current_time, end)
-            
-            # Check for idle time after last process
-            if current_time < max_time:
-                self.gantt_ax.barh(
-                    "CPU",
-                    max_time - current_time,
-                    left=current_time,
-                    color='#e74c3c',  # Red for idle time
-                    edgecolor='#34495e',
-                    height=0.6,
-                    alpha=0.4,
-                    hatch='//'
-                )
+        pids.append("CPU")
+        cpu_row = len(completed_processes)
+        
+        # Gather every interval; idle intervals come straight from the scheduler's idle records
+        starts = array('d')
+        ends = array('d')
+        counts = np.empty(len(pids), dtype=np.int64)
+        for i, history in enumerate([p.execution_history for p in completed_processes] + [cpu.idle_history]):
+            first, second = history.columns()
+            starts += first
+            ends += second
+            counts[i] = len(first)
+        starts = np.frombuffer(starts)
+        ends = np.frombuffer(ends)
+        rows = np.repeat(np.arange(len(pids)), counts)
+        
+        # Color by priority, red for idle time
+        high_color = to_rgba('#2ecc71', 0.8)
+        low_color = to_rgba('#f39c12', 0.8)
+        row_colors = np.array([high_color if p.priority == 1 else low_color for p in completed_processes]
+                              + [to_rgba('#e74c3c', 0.4)])
+        
+        # All bars in a single collection: one artist to draw instead of one per process row
+        bars = np.empty((len(starts), 4, 2))
+        bars[:, 0, 0] = bars[:, 1, 0] = starts
+        bars[:, 2, 0] = bars[:, 3, 0] = ends
+        bars[:, 0, 1] = bars[:, 3, 1] = rows - 0.3
+        bars[:, 1, 1] = bars[:, 2, 1] = rows + 0.3
+        self.gantt_ax.add_collection(PolyCollection(
+            bars,
+            facecolors=row_colors[rows],
+            edgecolors='#34495e',
+            linewidths=0.5
+        ), autolim=False)  # Limits are set below; computing them from 100k paths takes seconds
+        
+        # Label only as many rows as fit; the locator picks new ones on zoom
+        labels = max(1, int(self.gantt_ax.bbox.height) // GANTT_LABEL_PIXELS)
+        self.gantt_ax.yaxis.set_major_locator(MaxNLocator(nbins=labels, integer=True))
+        self.gantt_ax.yaxis.set_major_formatter(FuncFormatter(
+            lambda row, _: pids[int(row)] if row.is_integer() and 0 <= row < len(pids) else ''))
+        self.gantt_ax.set_ylim(-0.5, cpu_row + 0.5)
         
         # Configure plot
         self.gantt_ax.set_facecolor('#f5f5f5')
@@ -697,14 +1014,13 @@ class EnergyEfficientSchedulerGUI:
         
         # Adjust plot margins and layout
         if completed_processes:
-            max_time = max(end for p in completed_processes for _, end in p.execution_history)
+            max_time = max(p.finish_time for p in completed_processes)
             self.gantt_ax.set_xlim(-0.5, max_time + 0.5)  # Set x-axis limits with small padding
-        self.gantt_fig.tight_layout()  # Adjust layout to remove extra space
         
         # Create legend
         high_priority = plt.Rectangle((0,0), 1, 1, fc='#2ecc71', alpha=0.8)
         low_priority = plt.Rectangle((0,0), 1, 1, fc='#f39c12', alpha=0.8)
-        cpu_idle = plt.Rectangle((0,0), 1, 1, fc='#e74c3c', alpha=0.4, hatch='//')
+        cpu_idle = plt.Rectangle((0,0), 1, 1, fc='#e74c3c', alpha=0.4)
         
         self.gantt_ax.legend(
             [high_priority, low_priority, cpu_idle], 
@@ -717,16 +1033,21 @@ class EnergyEfficientSchedulerGUI:
     
     def update_frequency_plot(self, cpu):
         """Update the CPU frequency usage plot"""
+        from matplotlib.ticker import MaxNLocator
+        from decimation import MinMaxPyramid
+        
         self.freq_ax.clear()
         
         if not cpu.frequency_history:
             return
             
-        # Extract frequency history data
-        times, freqs = zip(*cpu.frequency_history)
+        # Extract frequency history data as a min/max decimated view
+        times, freqs = cpu.frequency_history.columns()
+        self.freq_lod = MinMaxPyramid(times, freqs)
+        times, freqs = self.freq_lod.query(times[0], times[-1], self.plot_pixels(self.freq_ax))
         
         # Plot frequency usage
-        self.freq_ax.step(
+        self.freq_line, = self.freq_ax.step(
             times, 
             freqs, 
             where='post',
@@ -744,9 +1065,19 @@ class EnergyEfficientSchedulerGUI:
         self.freq_ax.legend(loc='upper right')
         self.freq_ax.xaxis.set_major_locator(MaxNLocator(integer=True))
         self.freq_ax.set_ylim(0, cpu.max_frequency * 1.1)
+        self.freq_ax.callbacks.connect('xlim_changed', self.refresh_frequency_plot)
         
         # Redraw canvas
         self.freq_canvas.draw()
+    
+    def refresh_frequency_plot(self, ax):
+        """Re-query the frequency history at the resolution of the current zoom level"""
+        start, end = ax.get_xlim()
+        times, freqs = self.freq_lod.query(start, end, self.plot_pixels(ax))
+        if not len(times):
+            return
+        self.freq_line.set_data(times, freqs)
+        self.freq_canvas.draw_idle()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,541 @@
+# Pluggable scheduling policies for the CPU simulator.
+# A policy owns the ready queue and answers four questions for the shared
+# simulation loop: admit a newly arrived process, pick the next one to run,
+# take back a process whose time slice ended, and forget a completed one.
+# Each policy keeps its queue in a heap or in bucket queues, so every decision
+# costs O(log n) or O(1) even with millions of ready processes.
+
+
+# policies.py
+import heapq
+import math
+from collections import deque
+
+
+class SchedulingPolicy:
+    """
+    Interface of a scheduling policy. The loop calls admit() for every arrival,
+    then, while the policy has ready processes, pick_next() followed by
+    time_slice() to size the dispatch, and on_preempt() or on_complete()
+    once the slice has run. len(policy) is the number of ready processes.
+    """
+    name = "Policy"
+
+    def admit(self, process, current_time):
+        raise NotImplementedError
+
+    def pick_next(self, current_time):
+        """Remove and return the process to run next"""
+        raise NotImplementedError
+
+    def time_slice(self, process, current_time, next_arrival):
+        """
+        Longest time process may run now; math.inf runs it to completion. The
+        slice is elapsed time, not work, since the CPU may run below full
+        speed. next_arrival is the arrival time of the next process not yet
+        admitted, or None.
+        """
+        return math.inf
+
+    def on_preempt(self, process, current_time):
+        """Take back a process whose slice ended before it finished"""
+        self.admit(process, current_time)
+
+    def on_complete(self, process, current_time):
+        pass
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        """Ready processes in the order they would run; only checkpointing needs this"""
+        raise NotImplementedError
+
+
+def _until_arrival(current_time, next_arrival):
+    # Run until the next arrival so the policy can reconsider, or to completion
+    if next_arrival is None:
+        return math.inf
+    return next_arrival - current_time
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """FIFO queue with a fixed time quantum; the policy behind round_robin_scheduling"""
+    name = "Round Robin"
+
+    def __init__(self, time_quantum):
+        self.time_quantum = time_quantum
+        self.queue = deque()
+
+    def admit(self, process, current_time):
+        self.queue.append(process)
+
+    def pick_next(self, current_time):
+        return self.queue.popleft()
+
+    def time_slice(self, process, current_time, next_arrival):
+        return self.time_quantum
+
+    def on_preempt(self, process, current_time):
+        self.queue.append(process)  # Same as admit(), one call shorter on the hot path
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+class _ReadyQueueStats:
+    """
+    Count, mean and median of the remaining times of the processes in a ready
+    queue, kept up to date on every add and remove. The median uses two heaps
+    (lower half as a max-heap, upper half as a min-heap) with lazy removal, so
+    each update is O(log n) and each query O(1); the mean is a running total.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.low = []  # (-remaining, -sequence): max-heap of the lower half
+        self.high = []  # (remaining, sequence): min-heap of the upper half
+        self.low_size = 0  # Live entries in each heap
+        self.high_size = 0
+        self.in_low = {}  # sequence -> whether its live entry is in low
+        self.keys = {}  # id(process) -> (remaining, sequence) it was added with
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, process):
+        key = (process.remaining_time, self.sequence)
+        self.sequence += 1
+        self.keys[id(process)] = key
+        self.total += key[0]
+        if self.low_size and key <= self._top_low():
+            heapq.heappush(self.low, (-key[0], -key[1]))
+            self.in_low[key[1]] = True
+            self.low_size += 1
+        else:
+            heapq.heappush(self.high, key)
+            self.in_low[key[1]] = False
+            self.high_size += 1
+        self._rebalance()
+
+    def remove(self, process):
+        remaining, sequence = self.keys.pop(id(process))
+        self.total -= remaining
+        if self.in_low.pop(sequence):
+            self.low_size -= 1
+        else:
+            self.high_size -= 1
+        self._rebalance()
+        # Drop dead entries in bulk once they outnumber the live ones
+        if len(self.low) + len(self.high) > 2 * len(self.keys) + 64:
+            self.low = [entry for entry in self.low if -entry[1] in self.in_low]
+            self.high = [entry for entry in self.high if entry[1] in self.in_low]
+            heapq.heapify(self.low)
+            heapq.heapify(self.high)
+
+    def mean(self):
+        return self.total / len(self.keys) if self.keys else 0
+
+    def median(self):
+        """Lower median (a remaining time actually in the queue), or 0 when empty"""
+        return self._top_low()[0] if self.low_size else 0
+
+    def _top_low(self):
+        low = self.low
+        while -low[0][1] not in self.in_low:
+            heapq.heappop(low)
+        return (-low[0][0], -low[0][1])
+
+    def _top_high(self):
+        high = self.high
+        while high[0][1] not in self.in_low:
+            heapq.heappop(high)
+        return high[0]
+
+    def _rebalance(self):
+        # Keep low_size equal to high_size or one more
+        if self.low_size > self.high_size + 1:
+            key = self._top_low()
+            heapq.heappop(self.low)
+            heapq.heappush(self.high, key)
+            self.in_low[key[1]] = False
+            self.low_size -= 1
+            self.high_size += 1
+        elif self.high_size > self.low_size:
+            key = self._top_high()
+            heapq.heappop(self.high)
+            heapq.heappush(self.low, (-key[0], -key[1]))
+            self.in_low[key[1]] = True
+            self.high_size -= 1
+            self.low_size += 1
+
+
+class AdaptiveRoundRobinPolicy(SchedulingPolicy):
+    """
+    Round robin whose time quantum is recomputed at the start of every round
+    (one pass over the processes ready when it began) from the ready queue's
+    remaining times: their median or mean, rounded up and clamped to
+    [min_quantum, max_quantum]. With target_latency the quantum is also capped
+    so that a full round of the current queue takes at most target_latency.
+    The statistics are maintained incrementally, never by rescanning the queue.
+    """
+    name = "Adaptive RR"
+
+    def __init__(self, statistic='median', min_quantum=1, max_quantum=None, target_latency=None):
+        """
+        Initialize adaptive round robin with:
+        - statistic: 'median' or 'mean' of the remaining times in the ready queue
+        - min_quantum, max_quantum: Bounds on the quantum (max_quantum None: unbounded)
+        - target_latency: Optional bound on the length of a round
+        """
+        if statistic not in ('median', 'mean'):
+            raise ValueError(f"Unknown quantum statistic: {statistic}")
+        self.statistic = statistic
+        self.min_quantum = min_quantum
+        self.max_quantum = max_quantum
+        self.target_latency = target_latency
+        self.queue = deque()
+        self.stats = _ReadyQueueStats()
+        self.quantum = min_quantum
+        self.round_left = 0  # Dispatches left in the current round
+        self.rounds = 0
+
+    def admit(self, process, current_time):
+        self.queue.append(process)
+        self.stats.add(process)
+
+    def pick_next(self, current_time):
+        if self.round_left <= 0:
+            self._new_round()
+        self.round_left -= 1
+        process = self.queue.popleft()
+        self.stats.remove(process)
+        return process
+
+    def _new_round(self):
+        value = self.stats.median() if self.statistic == 'median' else self.stats.mean()
+        quantum = max(self.min_quantum, math.ceil(value))
+        if self.max_quantum is not None:
+            quantum = min(quantum, self.max_quantum)
+        if self.target_latency is not None:
+            quantum = min(quantum, max(self.min_quantum, self.target_latency / len(self.queue)))
+        self.quantum = quantum
+        self.round_left = len(self.queue)
+        self.rounds += 1
+
+    def time_slice(self, process, current_time, next_arrival):
+        return self.quantum
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class ShortestJobFirstPolicy(SchedulingPolicy):
+    """
+    Shortest job first on a heap keyed by remaining time. Non-preemptive by
+    default; with preemptive=True it is shortest remaining time first (SRTF),
+    re-deciding whenever a new process arrives.
+    """
+
+    def __init__(self, preemptive=False):
+        self.preemptive = preemptive
+        self.name = "SRTF" if preemptive else "SJF"
+        self.heap = []
+        self.sequence = 0  # FIFO tie-break among equal keys
+
+    def admit(self, process, current_time):
+        heapq.heappush(self.heap, (process.remaining_time, self.sequence, process))
+        self.sequence += 1
+
+    def pick_next(self, current_time):
+        return heapq.heappop(self.heap)[2]
+
+    def time_slice(self, process, current_time, next_arrival):
+        if self.preemptive:
+            return _until_arrival(current_time, next_arrival)
+        return math.inf
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class PriorityPolicy(SchedulingPolicy):
+    """
+    Static priority (lower value runs first), round robin within a level.
+    Ready processes sit in one FIFO bucket per priority, with a heap of the
+    non-empty levels, so a decision is O(1) plus O(log levels).
+    """
+    name = "Priority"
+
+    def __init__(self, time_quantum):
+        self.time_quantum = time_quantum
+        self.buckets = {}  # priority -> deque of processes
+        self.levels = []  # Heap of priorities with a non-empty bucket
+        self.size = 0
+
+    def admit(self, process, current_time):
+        bucket = self.buckets.get(process.priority)
+        if bucket is None:
+            bucket = self.buckets[process.priority] = deque()
+        if not bucket:
+            heapq.heappush(self.levels, process.priority)
+        bucket.append(process)
+        self.size += 1
+
+    def pick_next(self, current_time):
+        level = self.levels[0]
+        bucket = self.buckets[level]
+        process = bucket.popleft()
+        if not bucket:
+            heapq.heappop(self.levels)
+        self.size -= 1
+        return process
+
+    def time_slice(self, process, current_time, next_arrival):
+        return self.time_quantum
+
+    def __len__(self):
+        return self.size
+
+
+class EarliestDeadlineFirstPolicy(SchedulingPolicy):
+    """
+    Preemptive earliest deadline first on a heap keyed by absolute deadline.
+    Processes carry no deadline of their own, so one is derived per process:
+    by default arrival_time + slack * burst_time.
+    """
+    name = "EDF"
+
+    def __init__(self, slack=2.0, deadline=None):
+        """
+        Initialize EDF with:
+        - slack: Deadline as a multiple of the burst time after arrival
+        - deadline: Optional callable process -> absolute deadline, overriding slack
+        """
+        self.deadline = deadline or (lambda p: p.arrival_time + slack * p.burst_time)
+        self.deadlines = {}  # id(process) -> deadline, computed once on first admission
+        self.heap = []
+        self.sequence = 0
+
+    def admit(self, process, current_time):
+        key = id(process)
+        deadline = self.deadlines.get(key)
+        if deadline is None:
+            deadline = self.deadlines[key] = self.deadline(process)
+        heapq.heappush(self.heap, (deadline, self.sequence, process))
+        self.sequence += 1
+
+    def pick_next(self, current_time):
+        return heapq.heappop(self.heap)[2]
+
+    def time_slice(self, process, current_time, next_arrival):
+        return _until_arrival(current_time, next_arrival)
+
+    def on_complete(self, process, current_time):
+        self.deadlines.pop(id(process), None)
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class MultilevelFeedbackQueuePolicy(SchedulingPolicy):
+    """
+    Multilevel feedback queue: new processes enter the top level; a process
+    that uses its whole quantum drops one level. Every boost_interval time
+    units all processes return to the top level, so long jobs cannot starve.
+    """
+    name = "MLFQ"
+
+    def __init__(self, quanta=(2, 4, 8), boost_interval=None):
+        """
+        Initialize MLFQ with:
+        - quanta: Time quantum of each level, highest priority first
+        - boost_interval: Simulated time between priority boosts (None disables)
+        """
+        self.quanta = tuple(quanta)
+        self.boost_interval = boost_interval
+        self.queues = [deque() for _ in self.quanta]
+        self.levels = {}  # id(process) -> current level
+        self.size = 0
+        self.next_boost = boost_interval if boost_interval else math.inf
+
+    def admit(self, process, current_time):
+        level = self.levels.setdefault(id(process), 0)
+        self.queues[level].append(process)
+        self.size += 1
+
+    def pick_next(self, current_time):
+        if current_time >= self.next_boost:
+            self._boost(current_time)
+        for queue in self.queues:
+            if queue:
+                self.size -= 1
+                return queue.popleft()
+        raise IndexError("pick from an empty policy")
+
+    def time_slice(self, process, current_time, next_arrival):
+        return self.quanta[self.levels[id(process)]]
+
+    def on_preempt(self, process, current_time):
+        key = id(process)
+        self.levels[key] = min(self.levels[key] + 1, len(self.quanta) - 1)
+        self.queues[self.levels[key]].append(process)
+        self.size += 1
+
+    def on_complete(self, process, current_time):
+        self.levels.pop(id(process), None)
+
+    def _boost(self, current_time):
+        top = self.queues[0]
+        for queue in self.queues[1:]:
+            top.extend(queue)
+            queue.clear()
+        for key in self.levels:
+            self.levels[key] = 0
+        self.next_boost = current_time + self.boost_interval
+
+    def __len__(self):
+        return self.size
+
+
+# Policies offered by name (GUI, command line); each factory takes the time quantum
+POLICIES = {
+    "Round Robin": RoundRobinPolicy,
+    "SJF": lambda time_quantum: ShortestJobFirstPolicy(),
+    "SRTF": lambda time_quantum: ShortestJobFirstPolicy(preemptive=True),
+    "Priority": PriorityPolicy,
+    "EDF": lambda time_quantum: EarliestDeadlineFirstPolicy(),
+    "MLFQ": lambda time_quantum: MultilevelFeedbackQueuePolicy(
+        (time_quantum, 2 * time_quantum, 4 * time_quantum), boost_interval=100 * time_quantum),
+    "Adaptive RR": lambda time_quantum: AdaptiveRoundRobinPolicy(),
+}
+
+
+def create_policy(name, time_quantum):
+    """Build a fresh policy from its POLICIES name"""
+    if name not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy: {name}")
+    return POLICIES[name](time_quantum)
+
+
+def iter_policy_scheduling(arrivals, policy, cpu, skip_idle=False, sink=None,
+                           start_time=0, ready=None, checkpoint_interval=None, on_checkpoint=None,
+                           instrumentation=None):
+    """
+    Shared simulation loop: every queueing decision is delegated to policy
+    (a SchedulingPolicy).
+
+    arrivals is any iterable of Process objects in non-decreasing arrival_time
+    order; it is consumed lazily, only as far as the simulated clock has
+    reached. Completed processes are yielded as they finish, so memory is
+    bounded by the number of processes that have arrived but not finished.
+
+    If a sink (see metrics.MetricsSink) is given, each completed process is
+    also passed to sink.on_complete, and sink.close(cpu) is called at the end.
+
+    start_time and ready (processes already admitted, in queue order) resume a
+    simulation from a saved state (see incremental.py). With on_checkpoint,
+    on_checkpoint(current_time, policy, pending) is called at the top of the
+    loop, before arrivals are admitted, at least checkpoint_interval time
+    units apart; iterating policy gives its ready processes.
+
+    instrumentation (see instrumentation.Instrumentation) is notified of every
+    admission, dispatch, preemption, completion, idle step and frequency change.
+    """
+    current_time = start_time
+    # Bound methods, looked up once: the loop runs once per dispatch
+    admit = policy.admit
+    pick_next = policy.pick_next
+    time_slice = policy.time_slice
+    on_preempt = policy.on_preempt
+    for process in ready or ():
+        admit(process, current_time)
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)  # Next process in arrival order yet to be admitted
+    next_checkpoint = current_time
+    probe = instrumentation
+    timed = probe is not None and probe.timers
+    if probe is not None:
+        probe.begin(cpu)
+
+    while pending is not None or len(policy):
+        if on_checkpoint is not None and current_time >= next_checkpoint:
+            on_checkpoint(current_time, policy, pending)
+            next_checkpoint = current_time + checkpoint_interval
+        if timed:
+            mark = probe.clock()
+
+        # Admit arrived processes
+        while pending is not None and pending.arrival_time <= current_time:
+            admit(pending, current_time)
+            if probe is not None:
+                probe.on_admit(current_time, pending)
+            previous_arrival = pending.arrival_time
+            pending = next(arrivals, None)
+            if pending is not None and pending.arrival_time < previous_arrival:
+                raise ValueError(f"Process {pending.pid} arrives out of order "
+                                 f"({pending.arrival_time} < {previous_arrival})")
+        if timed:
+            mark = probe.lap('admission', mark)
+
+        if not len(policy):
+            # No processes ready - CPU idle
+            idle_units = 1
+            if skip_idle:
+                # Jump to the tick on which the next process has arrived
+                idle_units = max(1, math.ceil(pending.arrival_time - current_time))
+            cpu.idle(idle_units, current_time)
+            if probe is not None:
+                probe.on_idle(current_time, idle_units)
+                probe.on_frequency(current_time, cpu.current_frequency)
+                if timed:
+                    probe.lap('accounting', mark)
+            current_time += idle_units
+            continue
+
+        process = pick_next(current_time)
+        if process.start_time is None:
+            process.start_time = current_time
+        if probe is not None:
+            probe.on_dispatch(current_time, process)
+            if timed:
+                mark = probe.lap('dispatch', mark)
+
+        next_arrival = pending.arrival_time if pending is not None else None
+        execution_time = cpu.execute(process, time_slice(process, current_time, next_arrival), current_time)
+        if probe is not None:
+            probe.on_frequency(current_time, cpu.current_frequency)
+            if timed:
+                mark = probe.lap('execute', mark)
+        current_time += execution_time
+
+        if process.remaining_time == 0:
+            process.finish_time = current_time
+            policy.on_complete(process, current_time)
+            if sink is not None:
+                sink.on_complete(process)
+            if probe is not None:
+                probe.on_complete(current_time, process)
+                if timed:
+                    probe.lap('accounting', mark)
+            yield process
+        else:
+            on_preempt(process, current_time)
+            if probe is not None:
+                probe.on_preempt(current_time, process)
+                if timed:
+                    probe.lap('accounting', mark)
+
+    if sink is not None:
+        sink.close(cpu)
+
+
+def policy_scheduling(processes, policy, cpu, skip_idle=False, sink=None, instrumentation=None):
+    """Schedule processes under policy. Returns the list of completed processes"""
+    processes = sorted(processes, key=lambda p: p.arrival_time)
+    return list(iter_policy_scheduling(processes, policy, cpu, skip_idle=skip_idle, sink=sink,
+                                       instrumentation=instrumentation))
@@ -0,0 +1,238 @@
+# On-disk cache of simulation results.
+# Entries are keyed by a SHA-256 of the workload (pid, arrival, burst, priority
+# tuples in arrival order) and the CPU/time-quantum parameters, stored as
+# compressed NumPy archives, and evicted least-recently-used first once the
+# cache directory grows past its size limit. The directory size is tracked as
+# entries are written, so it is only scanned again when eviction is due.
+
+
+# result_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from scheduler import Process, HistoryBuffer, round_robin_scheduling
+
+CACHE_VERSION = 1  # Bump when scheduler output for the same inputs changes
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ee-rr-scheduler')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+EVICT_TO = 0.9  # Eviction trims to this fraction of max_bytes, so it is not due again on the next put
+
+
+def workload_digest(workload):
+    """
+    Hex digest of a workload: a sequence of (pid, arrival, burst, priority)
+    tuples or Process objects. It is hashed in the order the scheduler sees it
+    (stably sorted by arrival), so listing the same processes differently
+    gives the same digest.
+    """
+    records = sorted(
+        ((p.pid, p.arrival_time, p.burst_time, p.priority) if isinstance(p, Process) else tuple(p)
+         for p in workload),
+        key=lambda record: record[1]
+    )
+    digest = hashlib.sha256()
+    # Hash the workload in chunks so huge workloads are never one giant string
+    for start in range(0, len(records), 65536):
+        digest.update(json.dumps(records[start:start + 65536]).encode())
+    return digest.hexdigest()
+
+
+def simulation_key(workload, time_quantum, base_power, max_frequency, min_frequency, **options):
+    """
+    Stable hex digest identifying one simulation.
+    - workload: sequence of (pid, arrival, burst, priority) tuples or Process
+      objects, or its workload_digest() when many keys share one workload
+    - options: any further settings that change the result (e.g. skip_idle)
+    """
+    if not isinstance(workload, str):
+        workload = workload_digest(workload)
+    params = [time_quantum, base_power, max_frequency, min_frequency, sorted(options.items())]
+    return hashlib.sha256(json.dumps([CACHE_VERSION, params, workload]).encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize a cache with:
+        - directory: Where entries are stored (created if missing)
+        - max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = None  # Size of the entries as of the last scan plus later puts
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """Return (arrays, meta) for a key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with np.load(path) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None  # Missing or unreadable entries count as misses
+        try:
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None  # Evicted by another process since it was read
+        meta = json.loads(arrays.pop('__meta__').tobytes().decode())
+        return arrays, meta
+
+    def put(self, key, arrays, meta=None):
+        """Store named arrays plus a JSON-serializable meta dict under key"""
+        arrays = dict(arrays)
+        arrays['__meta__'] = np.frombuffer(json.dumps(meta or {}).encode(), dtype=np.uint8)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        path = self._path(key)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+                added = f.tell()
+            try:
+                added -= os.stat(path).st_size  # Replacing an entry
+            except FileNotFoundError:
+                pass
+            os.replace(temp_path, path)  # Atomic, so readers never see partial files
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        if self.total_bytes is None:
+            self.total_bytes = self.size()
+        else:
+            self.total_bytes += added
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """(mtime, size, path) of every entry"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Removed by another process
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes,
+        down to EVICT_TO of it. put() only calls this once its running total
+        passes max_bytes; entries written by other processes sharing the
+        directory are counted at the next scan.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= EVICT_TO * self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        self.total_bytes = total
+
+    def size(self):
+        """Total bytes used by cache entries"""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                os.unlink(entry.path)
+        self.total_bytes = 0
+
+
+def pack_result(completed_processes, cpu):
+    """Flatten completed processes and CPU histories into arrays"""
+    offsets = np.zeros(len(completed_processes) + 1, dtype=np.int64)
+    starts, ends = [], []
+    for i, p in enumerate(completed_processes):
+        process_starts, process_ends = p.execution_history.columns()
+        starts.append(np.frombuffer(process_starts))
+        ends.append(np.frombuffer(process_ends))
+        offsets[i + 1] = offsets[i] + len(process_starts)
+
+    def column(attribute):
+        return np.asarray([getattr(p, attribute) for p in completed_processes])
+
+    arrays = {
+        'pid': column('pid'),
+        'arrival': column('arrival_time'),
+        'burst': column('burst_time'),
+        'priority': column('priority'),
+        'start': column('start_time'),
+        'finish': column('finish_time'),
+        'exec_offsets': offsets,
+        'exec_start': np.concatenate(starts) if starts else np.zeros(0),
+        'exec_end': np.concatenate(ends) if ends else np.zeros(0),
+    }
+    for name in ('frequency_history', 'power_history', 'idle_history'):
+        first, second = getattr(cpu, name).columns()
+        arrays[f"{name}_0"] = np.frombuffer(first)
+        arrays[f"{name}_1"] = np.frombuffer(second)
+    meta = {
+        'power_consumption': cpu.power_consumption,
+        'idle_time': cpu.idle_time,
+        'current_frequency': cpu.current_frequency,
+    }
+    return arrays, meta
+
+
+def unpack_result(arrays, meta, cpu):
+    """Rebuild completed processes from arrays and load the CPU accumulators"""
+    columns = [arrays[name].tolist() for name in ('pid', 'arrival', 'burst', 'priority', 'start', 'finish')]
+    offsets = arrays['exec_offsets']
+    completed_processes = []
+    for i, (pid, arrival, burst, priority, start, finish) in enumerate(zip(*columns)):
+        process = Process(pid, arrival, burst, priority)
+        process.remaining_time = 0
+        process.start_time = start
+        process.finish_time = finish
+        segment = slice(offsets[i], offsets[i + 1])
+        process.execution_history = HistoryBuffer.from_columns(
+            arrays['exec_start'][segment].tobytes(), arrays['exec_end'][segment].tobytes())
+        completed_processes.append(process)
+
+    for name in ('frequency_history', 'power_history', 'idle_history'):
+        setattr(cpu, name, HistoryBuffer.from_columns(
+            arrays[f"{name}_0"].astype(np.float64).tobytes(),
+            arrays[f"{name}_1"].astype(np.float64).tobytes()))
+    cpu.power_consumption = meta['power_consumption']
+    cpu.idle_time = meta['idle_time']
+    cpu.current_frequency = meta['current_frequency']
+    return completed_processes
+
+
+def cached_round_robin_scheduling(processes, time_quantum, cpu, cache, skip_idle=False, sink=None):
+    """
+    Counterpart of round_robin_scheduling that consults a ResultCache.
+    On a hit the completed processes are rebuilt and cpu is loaded with the
+    cached energy, idle time and histories; on a miss the simulation runs and
+    its result is stored. Returns (completed_processes, hit).
+    """
+    key = simulation_key(processes, time_quantum, cpu.base_power, cpu.max_frequency,
+                         cpu.min_frequency, skip_idle=skip_idle)
+    entry = cache.get(key)
+    if entry is not None:
+        completed_processes = unpack_result(*entry, cpu)
+        if sink is not None:
+            for process in completed_processes:
+                sink.on_complete(process)
+            sink.close(cpu)
+        return completed_processes, True
+
+    completed_processes = round_robin_scheduling(processes, time_quantum, cpu, skip_idle=skip_idle, sink=sink)
+    if cpu.record_history:
+        cache.put(key, *pack_result(completed_processes, cpu))
+    return completed_processes, False
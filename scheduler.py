@@ -8,7 +8,87 @@
 
 
 # scheduler.py
+from array import array
+
+from policies import RoundRobinPolicy, iter_policy_scheduling
+
+
+class HistoryBuffer:
+    """
+    Columnar, append-only store for (start, end) or (time, value) pairs.
+
+    The two columns are typed array('d'), which grow in amortized O(1), so a
+    record costs 8 bytes per field instead of a tuple and two boxed floats.
+    Iteration, indexing, len() and truthiness behave like the list of tuples
+    it replaces, so `zip(*history)` and `for start, end in history` still work.
+    """
+    __slots__ = ('_first', '_second')
+
+    def __init__(self):
+        self._first = array('d')
+        self._second = array('d')
+
+    def append(self, first, second):
+        """Append one record"""
+        self._first.append(first)
+        self._second.append(second)
+
+    def append_interval(self, start, end):
+        """Append (start, end), or extend the last interval if it ends at start"""
+        ends = self._second
+        if ends and ends[-1] == start:
+            ends[-1] = end
+        else:
+            self._first.append(start)
+            ends.append(end)
+
+    @classmethod
+    def from_columns(cls, first, second):
+        """Build a buffer from two equal-length column sequences"""
+        history = cls()
+        history._first = array('d', first)
+        history._second = array('d', second)
+        return history
+
+    def column(self, index):
+        """Return a copy of one column as an array('d')"""
+        return (self._first, self._second)[index][:]
+
+    def columns(self):
+        """Return copies of both columns"""
+        return self._first[:], self._second[:]
+
+    def clear(self):
+        del self._first[:]
+        del self._second[:]
+
+    def truncate(self, size):
+        """Drop every record from position size onwards"""
+        del self._first[size:]
+        del self._second[size:]
+
+    def __len__(self):
+        return len(self._first)
+
+    def __iter__(self):
+        return zip(self._first, self._second)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self._first[index], self._second[index]))
+        return self._first[index], self._second[index]
+
+    def __setitem__(self, index, record):
+        self._first[index], self._second[index] = record
+
+    def __repr__(self):
+        return f"HistoryBuffer({list(self)!r})"
+
+
 class Process:
+    __slots__ = ('pid', 'arrival_time', 'burst_time', 'remaining_time', 'priority',
+                 'start_time', 'finish_time', 'execution_history')
+
     def __init__(self, pid, arrival_time, burst_time, priority):
         """
         Initialize a process with:
@@ -24,23 +104,29 @@ class Process:
         self.priority = priority
         self.start_time = None  # Will be set when process starts executing
         self.finish_time = None  # Will be set when process completes
-        self.execution_history = []  # Tracks execution intervals
+        self.execution_history = HistoryBuffer()  # Tracks execution intervals
 
     def __str__(self):
         return f"Process {self.pid}: Arrival={self.arrival_time}, Burst={self.burst_time}, Priority={self.priority}"
 
     def add_execution_interval(self, start, end):
         """Record an execution interval for this process"""
-        self.execution_history.append((start, end))
+        self.execution_history.append(start, end)
 
 
 class CPU:
-    def __init__(self, base_power, max_frequency, min_frequency):
+    __slots__ = ('base_power', 'max_frequency', 'min_frequency', 'current_frequency',
+                 'power_consumption', 'idle_time', 'frequency_history', 'power_history',
+                 'idle_history', 'record_history')
+
+    def __init__(self, base_power, max_frequency, min_frequency, record_history=True):
         """
         Initialize CPU with:
         - base_power: Base power consumption in Watts at max frequency
         - max_frequency: Maximum CPU frequency in GHz
         - min_frequency: Minimum CPU frequency in GHz
+        - record_history: Keep frequency/power histories (disable for long
+          streaming runs where only the totals are needed)
         """
         self.base_power = base_power
         self.max_frequency = max_frequency
@@ -48,8 +134,10 @@ class CPU:
         self.current_frequency = max_frequency  # Start at max frequency
         self.power_consumption = 0  # Total power consumed in Joules
         self.idle_time = 0  # Total time spent idle
-        self.frequency_history = []  # Tracks frequency changes over time
-        self.power_history = []  # Tracks power consumption over time
+        self.frequency_history = HistoryBuffer()  # Tracks frequency changes over time
+        self.power_history = HistoryBuffer()  # Tracks power consumption over time
+        self.idle_history = HistoryBuffer()  # Idle intervals (start, end), adjacent ones merged
+        self.record_history = record_history
 
     def execute(self, process, time_quantum, current_time):
         """
@@ -66,64 +154,88 @@ class CPU:
         new_frequency = self.min_frequency if process.priority > 1 else self.max_frequency
         if new_frequency != self.current_frequency:
             self.current_frequency = new_frequency
-            self.frequency_history.append((current_time, self.current_frequency))
+            if self.record_history:
+                self.frequency_history.append(current_time, self.current_frequency)
 
         # Calculate power consumption (simplified model: Power = Base Power * Frequency Ratio)
         power = self.base_power * (self.current_frequency / self.max_frequency)
         energy_consumed = power * execution_time
         self.power_consumption += energy_consumed
-        self.power_history.append((current_time, power))
+        if self.record_history:
+            self.power_history.append(current_time, power)
 
         return execution_time
 
+    def snapshot(self):
+        """Capture the accumulators and history lengths, for restore()"""
+        last_idle = self.idle_history[-1] if self.idle_history else None
+        return (self.power_consumption, self.idle_time, self.current_frequency,
+                len(self.frequency_history), len(self.power_history), len(self.idle_history), last_idle)
+
+    def restore(self, state):
+        """Roll the CPU back to a snapshot() taken earlier in the same run"""
+        (self.power_consumption, self.idle_time, self.current_frequency,
+         frequency_length, power_length, idle_length, last_idle) = state
+        self.frequency_history.truncate(frequency_length)
+        self.power_history.truncate(power_length)
+        self.idle_history.truncate(idle_length)
+        if last_idle is not None:
+            self.idle_history[-1] = last_idle  # Undo any later extension of this interval
+
     def idle(self, time, current_time):
         """Simulate CPU idle state (low power mode)"""
         self.idle_time += time
         idle_power = 0.1 * self.base_power  # 10% of base power during idle
         self.power_consumption += idle_power * time
         self.current_frequency = 0  # No frequency during idle
-        self.frequency_history.append((current_time, 0))
-        self.power_history.append((current_time, idle_power))
+        if self.record_history:
+            self.frequency_history.append(current_time, 0)
+            self.power_history.append(current_time, idle_power)
+            self.idle_history.append_interval(current_time, current_time + time)
+
+
+def iter_round_robin_scheduling(arrivals, time_quantum, cpu, skip_idle=False, sink=None,
+                                start_time=0, ready=None, checkpoint_interval=None, on_checkpoint=None,
+                                instrumentation=None):
+    """
+    Streaming form of round_robin_scheduling: the shared policy loop
+    (policies.iter_policy_scheduling) run with a RoundRobinPolicy.
+
+    arrivals is any iterable of Process objects in non-decreasing arrival_time
+    order; it is consumed lazily, only as far as the simulated clock has
+    reached. Completed processes are yielded as they finish, so memory is
+    bounded by the number of processes that have arrived but not finished.
+
+    If a sink (see metrics.MetricsSink) is given, each completed process is
+    also passed to sink.on_complete, and sink.close(cpu) is called at the end.
+
+    start_time and ready resume a simulation from a saved state (see
+    incremental.py). With on_checkpoint, on_checkpoint(current_time,
+    ready_queue, pending) is called at the top of the loop, before arrivals
+    are admitted, at least checkpoint_interval time units apart; ready_queue
+    iterates the ready processes in queue order.
+
+    instrumentation (see instrumentation.Instrumentation) is notified of every
+    admission, dispatch, preemption, completion, idle step and frequency change.
+    """
+    return iter_policy_scheduling(arrivals, RoundRobinPolicy(time_quantum), cpu, skip_idle=skip_idle, sink=sink,
+                                  start_time=start_time, ready=ready, checkpoint_interval=checkpoint_interval,
+                                  on_checkpoint=on_checkpoint, instrumentation=instrumentation)
 
 
-def round_robin_scheduling(processes, time_quantum, cpu):
+def round_robin_scheduling(processes, time_quantum, cpu, skip_idle=False, sink=None, instrumentation=None):
     """
     Simulates Round Robin scheduling with energy efficiency features
     Returns list of completed processes and the CPU object with consumption data
+
+    With skip_idle=True an empty ready queue advances time straight to the next
+    arrival and records the whole gap as a single idle interval, instead of
+    one idle tick per time unit. The schedule and idle time are the same;
+    energy is charged once per gap rather than once per tick, so the total
+    agrees with per-tick idling only up to float rounding. Pass an
+    instrumentation.Instrumentation to collect counters, phase timers and
+    event hooks for the run.
     """
-    current_time = 0
-    ready_queue = []  # Processes ready to execute
-    completed_processes = []  # Finished processes
     processes = sorted(processes, key=lambda p: p.arrival_time)  # Sort by arrival time
-    
-    while processes or ready_queue:
-        # Add arrived processes to ready queue
-        while processes and processes[0].arrival_time <= current_time:
-            ready_queue.append(processes.pop(0))
-        
-        if not ready_queue:
-            # No processes ready - CPU idle
-            cpu.idle(1, current_time)
-            current_time += 1
-            continue
-        
-        # Get next process from ready queue
-        current_process = ready_queue.pop(0)
-        
-        # Record start time if not already set
-        if current_process.start_time is None:
-            current_process.start_time = current_time
-        
-        # Execute the process
-        execution_time = cpu.execute(current_process, time_quantum, current_time)
-        current_time += execution_time
-        
-        # Check if process completed
-        if current_process.remaining_time == 0:
-            current_process.finish_time = current_time
-            completed_processes.append(current_process)
-        else:
-            # Re-add to ready queue if not finished
-            ready_queue.append(current_process)
-    
-    return completed_processes
+    return list(iter_round_robin_scheduling(processes, time_quantum, cpu, skip_idle=skip_idle, sink=sink,
+                                            instrumentation=instrumentation))
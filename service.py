@@ -0,0 +1,487 @@
+# Local simulation service for the CPU scheduling simulator.
+# An asyncio server on a Unix socket or a localhost TCP port accepts workloads
+# plus CPU parameters, queues them as jobs and runs them in a bounded process
+# pool, streaming each job's results back to the client that submitted it.
+#
+# Protocol: one JSON object per line in each direction.
+#   -> {"op": "submit", "tag": any, "processes": [[pid, arrival, burst, priority], ...]
+#       or "path": workload file, "time_quantum", "base_power", "max_frequency",
+#       "min_frequency", optional "policy", "skip_idle", "pstates", "rows"}
+#   Inline records are validated before the job is queued, and a job that
+#   takes more than the server's step limit (dispatches plus idle steps)
+#   fails instead of holding its worker.
+#   <- {"type": "accepted", "tag", "job", "queue_depth"}
+#   <- {"type": "rows", "job", "rows": [[pid, start, finish], ...]}  (in chunks)
+#   <- {"type": "result", "job", "summary", "queue_wait", "run_time"}
+#   -> {"op": "cancel", "job"}     <- {"type": "cancelled", "job"}
+#   -> {"op": "stats"}             <- {"type": "stats", ...}
+# Errors are reported as {"type": "error", "job" or "tag", "error"}.
+#
+# Backpressure: the job queue is bounded, and a client whose submission finds
+# it full is not read from again until there is room; results are written
+# with drain(), so a slow reader holds back only its own jobs.
+
+
+# service.py
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import OnlineMetrics, P2Quantile, RunningStats
+from workload_io import check_record
+
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_MAX_JOB_STEPS = 50_000_000  # Scheduler steps per job: a few tens of seconds of simulation
+ROWS_PER_MESSAGE = 1000
+MAX_LINE = 1 << 30  # Longest request line; inline workloads can be large
+
+
+def run_job(spec):
+    """Simulate one job in a worker process. Returns (rows, summary)"""
+    from dvfs import PStateCPU
+    from instrumentation import Instrumentation
+    from policies import create_policy, policy_scheduling
+    from scheduler import CPU, Process, round_robin_scheduling
+    from workload_io import read_records
+
+    records = spec['processes'] if 'processes' in spec else read_records(spec['path'])
+    processes = [Process(*record) for record in records]
+    time_quantum = spec.get('time_quantum', 3)
+    base_power = spec.get('base_power', 125.0)
+    max_frequency = spec.get('max_frequency', 5.8)
+    min_frequency = spec.get('min_frequency', 3.0)
+    if time_quantum <= 0 or base_power <= 0 or max_frequency <= 0 or min_frequency <= 0:
+        raise ValueError("All parameters must be positive numbers")
+
+    cpu_class = PStateCPU if spec.get('pstates') else CPU
+    cpu = cpu_class(base_power=base_power, max_frequency=max_frequency, min_frequency=min_frequency,
+                    record_history=False)
+    metrics = OnlineMetrics()
+    # A running pool task cannot be cancelled, so bound the work a job may take
+    max_steps = spec.get('max_steps', DEFAULT_MAX_JOB_STEPS)
+    probe = Instrumentation()
+
+    def check_steps(current_time, _):
+        if probe.dispatches + probe.idle_steps > max_steps:
+            raise ValueError(f"Job exceeded {max_steps} scheduler steps at time {current_time}")
+
+    probe.add_hook('dispatch', check_steps)
+    probe.add_hook('idle', check_steps)
+    policy = spec.get('policy', "Round Robin")
+    skip_idle = spec.get('skip_idle', False)
+    if policy == "Round Robin":
+        completed = round_robin_scheduling(processes, time_quantum, cpu, skip_idle=skip_idle, sink=metrics,
+                                           instrumentation=probe)
+    else:
+        completed = policy_scheduling(processes, create_policy(policy, time_quantum), cpu,
+                                      skip_idle=skip_idle, sink=metrics, instrumentation=probe)
+
+    summary = metrics.summary()
+    baseline_power = base_power * sum(p.burst_time for p in processes)
+    summary['energy_saving'] = ((baseline_power - cpu.power_consumption) / baseline_power) * 100 \
+        if baseline_power else 0.0
+    rows = [(p.pid, p.start_time, p.finish_time) for p in completed] if spec.get('rows', True) else []
+    return rows, summary
+
+
+class _Connection:
+    """Writer side of one client; a lock keeps concurrent jobs' messages whole"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.lock = asyncio.Lock()
+        self.jobs = set()
+        self.closed = False
+
+    async def send(self, message):
+        if self.closed:
+            return
+        async with self.lock:
+            self.writer.write(json.dumps(message).encode() + b'\n')
+            try:
+                await self.writer.drain()  # Waits while the client is not reading
+            except ConnectionError:
+                self.closed = True
+
+
+class _Job:
+    __slots__ = ('id', 'spec', 'connection', 'state', 'submitted', 'started', 'future')
+
+    def __init__(self, job_id, spec, connection):
+        self.id = job_id
+        self.spec = spec
+        self.connection = connection
+        self.state = 'queued'  # queued -> running -> done, or cancelled/failed
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.future = None
+
+
+class SimulationService:
+    def __init__(self, max_workers=None, max_queue=DEFAULT_MAX_QUEUE, max_job_steps=DEFAULT_MAX_JOB_STEPS):
+        """
+        Initialize a service with:
+        - max_workers: Size of the process pool (defaults to the number of CPUs)
+        - max_queue: Jobs that may wait for a worker before submitters are held back
+        - max_job_steps: Scheduler steps (dispatches plus idle steps) after which a job fails
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_job_steps = max_job_steps
+        self.queue = asyncio.Queue(max_queue)
+        self.pool = None
+        self.jobs = {}  # Job id -> _Job, while queued or running
+        self.next_id = 1
+        self.queued = 0
+        self.running = 0
+        self.counts = {'completed': 0, 'cancelled': 0, 'failed': 0}
+        self.queue_wait = RunningStats()
+        self.queue_wait_p95 = P2Quantile(0.95)
+        self.run_time = RunningStats()
+        self.run_time_p95 = P2Quantile(0.95)
+        self.dispatchers = []
+
+    async def start(self, socket_path=None, host='127.0.0.1', port=0):
+        """Start the pool and listen on socket_path, or on host:port. Returns the asyncio server"""
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.max_workers)]
+        if socket_path is not None:
+            return await asyncio.start_unix_server(self._handle_client, path=socket_path, limit=MAX_LINE)
+        return await asyncio.start_server(self._handle_client, host=host, port=port, limit=MAX_LINE)
+
+    async def close(self):
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            'type': 'stats',
+            'queue_depth': self.queued,
+            'running': self.running,
+            'workers': self.max_workers,
+            **self.counts,
+            'avg_queue_wait': self.queue_wait.mean,
+            'p95_queue_wait': self.queue_wait_p95.value,
+            'avg_run_time': self.run_time.mean,
+            'p95_run_time': self.run_time_p95.value,
+        }
+
+    async def _handle_client(self, reader, writer):
+        connection = _Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request['op']
+                except (ValueError, KeyError, TypeError):
+                    await connection.send({'type': 'error', 'error': "Malformed request"})
+                    continue
+                if op == 'submit':
+                    await self._submit(request, connection)
+                elif op == 'cancel':
+                    await self._cancel(request.get('job'), connection)
+                elif op == 'stats':
+                    await connection.send(self.stats())
+                else:
+                    await connection.send({'type': 'error', 'error': f"Unknown op: {op}"})
+        except ValueError:
+            await connection.send({'type': 'error', 'error': "Request line too long"})
+        except ConnectionError:
+            pass
+        finally:
+            # Nobody is left to receive the results of this client's jobs
+            connection.closed = True
+            for job in list(connection.jobs):
+                self._cancel_job(job)
+            writer.close()
+
+    async def _submit(self, request, connection):
+        tag = request.get('tag')
+        if 'processes' not in request and 'path' not in request:
+            await connection.send({'type': 'error', 'tag': tag, 'error': "Submit needs processes or path"})
+            return
+        if 'processes' in request:
+            try:
+                request['processes'] = [check_record(tuple(record), "processes", line)
+                                        for line, record in enumerate(request['processes'], 1)]
+            except (TypeError, ValueError) as e:
+                await connection.send({'type': 'error', 'tag': tag, 'error': f"Invalid workload: {e}"})
+                return
+        spec = {key: value for key, value in request.items() if key not in ('op', 'tag')}
+        spec['max_steps'] = self.max_job_steps
+        job = _Job(self.next_id, spec, connection)
+        self.next_id += 1
+        self.jobs[job.id] = job
+        connection.jobs.add(job)
+        self.queued += 1
+        await self.queue.put(job)  # Blocks this client's reader while the queue is full
+        await connection.send({'type': 'accepted', 'tag': tag, 'job': job.id, 'queue_depth': self.queued})
+
+    def _cancel_job(self, job):
+        if job.state == 'queued':
+            self.queued -= 1
+        elif job.state == 'running' and job.future is not None:
+            job.future.cancel()  # Frees the slot only if the worker has not started it
+        else:
+            return False
+        job.state = 'cancelled'
+        self.counts['cancelled'] += 1
+        self._forget(job)
+        return True
+
+    async def _cancel(self, job_id, connection):
+        job = self.jobs.get(job_id)
+        if job is None or job.connection is not connection or not self._cancel_job(job):
+            await connection.send({'type': 'error', 'job': job_id, 'error': "No such queued or running job"})
+            return
+        await connection.send({'type': 'cancelled', 'job': job_id})
+
+    def _forget(self, job):
+        self.jobs.pop(job.id, None)
+        job.connection.jobs.discard(job)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            if job.state != 'queued':
+                continue  # Cancelled while waiting
+            self.queued -= 1
+            self.running += 1
+            job.state = 'running'
+            job.started = time.perf_counter()
+            wait = job.started - job.submitted
+            self.queue_wait.add(wait)
+            self.queue_wait_p95.add(wait)
+            job.future = loop.run_in_executor(self.pool, run_job, job.spec)
+            try:
+                rows, summary = await job.future
+            except asyncio.CancelledError:
+                if job.state != 'cancelled':
+                    raise  # The dispatcher itself is shutting down
+                continue
+            except Exception as e:
+                job.state = 'failed'
+                self.counts['failed'] += 1
+                self._forget(job)
+                await job.connection.send({'type': 'error', 'job': job.id, 'error': str(e)})
+                continue
+            finally:
+                self.running -= 1
+
+            if job.state == 'cancelled':
+                continue
+            run_time = time.perf_counter() - job.started
+            self.run_time.add(run_time)
+            self.run_time_p95.add(run_time)
+            job.state = 'done'
+            self.counts['completed'] += 1
+            self._forget(job)
+            for start in range(0, len(rows), ROWS_PER_MESSAGE):
+                await job.connection.send({'type': 'rows', 'job': job.id,
+                                           'rows': rows[start:start + ROWS_PER_MESSAGE]})
+            await job.connection.send({'type': 'result', 'job': job.id, 'summary': summary,
+                                       'queue_wait': wait, 'run_time': run_time})
+
+
+class ServiceClient:
+    """
+    Asyncio client for SimulationService. Messages for each job are delivered
+    to that job's own queue, so one connection can run many jobs at once.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}  # tag -> future resolved by the 'accepted' message
+        self.job_messages = {}  # job id -> asyncio.Queue of messages
+        self.stats_waiters = []
+        self.next_tag = 0
+        self.receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, socket_path=None, host='127.0.0.1', port=None):
+        if socket_path is not None:
+            reader, writer = await asyncio.open_unix_connection(socket_path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def _send(self, message):
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+
+    async def _receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            kind = message['type']
+            if kind == 'accepted' or (kind == 'error' and 'tag' in message):
+                future = self.pending.pop(message['tag'], None)
+                if future is not None and not future.done():
+                    if kind == 'accepted':
+                        self.job_messages.setdefault(message['job'], asyncio.Queue())
+                        future.set_result(message['job'])
+                    else:
+                        future.set_exception(RuntimeError(message['error']))
+            elif kind == 'stats':
+                if self.stats_waiters:
+                    self.stats_waiters.pop(0).set_result(message)
+            elif 'job' in message:
+                self.job_messages.setdefault(message['job'], asyncio.Queue()).put_nowait(message)
+        # Wake anyone still waiting on a closed connection
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Service closed the connection"))
+        for messages in self.job_messages.values():
+            messages.put_nowait({'type': 'error', 'error': "Service closed the connection"})
+
+    async def submit(self, processes=None, path=None, **params):
+        """Queue a job; returns its id once the service has accepted it"""
+        tag = self.next_tag
+        self.next_tag += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[tag] = future
+        message = {'op': 'submit', 'tag': tag, **params}
+        if processes is not None:
+            message['processes'] = [list(record) for record in processes]
+        else:
+            message['path'] = path
+        await self._send(message)
+        return await future
+
+    async def results(self, job_id):
+        """Yield a job's messages ('rows' chunks, then 'result', 'cancelled' or 'error')"""
+        messages = self.job_messages.setdefault(job_id, asyncio.Queue())
+        while True:
+            message = await messages.get()
+            yield message
+            if message['type'] != 'rows':
+                del self.job_messages[job_id]
+                return
+
+    async def run(self, processes=None, path=None, **params):
+        """Submit a job and wait for it. Returns (rows, result message)"""
+        job_id = await self.submit(processes, path, **params)
+        rows = []
+        async for message in self.results(job_id):
+            if message['type'] == 'rows':
+                rows.extend(message['rows'])
+            elif message['type'] == 'result':
+                return rows, message
+            else:
+                raise RuntimeError(message.get('error', message['type']))
+
+    async def cancel(self, job_id):
+        await self._send({'op': 'cancel', 'job': job_id})
+
+    async def stats(self):
+        future = asyncio.get_running_loop().create_future()
+        self.stats_waiters.append(future)
+        await self._send({'op': 'stats'})
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        self.receiver.cancel()
+        await asyncio.gather(self.receiver, return_exceptions=True)
+
+
+async def drive_load(clients=8, jobs_per_client=4, size=1000, seed=0, **connect):
+    """
+    Run clients concurrent connections, each submitting jobs_per_client
+    synthetic workloads of size processes. Returns a dict of client-side
+    latencies (seconds) and the service's final stats.
+    """
+    from benchmarks import generate_workload
+
+    latencies = []
+
+    async def client(index):
+        connection = await ServiceClient.connect(**connect)
+        try:
+            for job in range(jobs_per_client):
+                workload = list(generate_workload(size, seed=seed + index * jobs_per_client + job))
+                start = time.perf_counter()
+                await connection.run(workload, rows=False)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    elapsed = time.perf_counter() - start
+    connection = await ServiceClient.connect(**connect)
+    stats = await connection.stats()
+    await connection.close()
+    latencies.sort()
+    return {
+        'jobs': len(latencies),
+        'elapsed': elapsed,
+        'jobs_per_second': len(latencies) / elapsed,
+        'avg_latency': sum(latencies) / len(latencies),
+        'p95_latency': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        'service': stats,
+    }
+
+
+async def _serve(args):
+    service = SimulationService(max_workers=args.workers, max_queue=args.max_queue,
+                                max_job_steps=args.max_job_steps)
+    server = await service.start(socket_path=args.socket, host=args.host, port=args.port)
+    where = args.socket or '{}:{}'.format(*server.sockets[0].getsockname()[:2])
+    print(f"Listening on {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local simulation service for the CPU scheduler")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, description in (('serve', "Run the service"), ('load', "Drive a running service with synthetic jobs")):
+        command = commands.add_parser(name, help=description)
+        command.add_argument('--socket', default=None, help="Unix socket path (default: TCP on --host/--port)")
+        command.add_argument('--host', default='127.0.0.1')
+        command.add_argument('--port', type=int, default=8765)
+    commands.choices['serve'].add_argument('-j', '--workers', type=int, default=None,
+                                           help="Worker processes (default: all CPUs)")
+    commands.choices['serve'].add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                                           help="Queued jobs before submitters are held back")
+    commands.choices['serve'].add_argument('--max-job-steps', type=int, default=DEFAULT_MAX_JOB_STEPS,
+                                           help="Scheduler steps after which a job fails")
+    load = commands.choices['load']
+    load.add_argument('--clients', type=int, default=8)
+    load.add_argument('--jobs', type=int, default=4, help="Jobs per client")
+    load.add_argument('--size', type=int, default=1000, help="Processes per job")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    connect = {'socket_path': args.socket} if args.socket else {'host': args.host, 'port': args.port}
+    report = asyncio.run(drive_load(args.clients, args.jobs, args.size, **connect))
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
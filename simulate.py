@@ -0,0 +1,157 @@
+# Headless command-line runner for the CPU scheduling simulator.
+# Streams a workload file through a scheduling policy and prints the metrics
+# as JSON or CSV. Only pure-Python modules are imported (never tkinter or
+# matplotlib), so it starts in milliseconds and runs on display-less servers:
+#
+#     python simulate.py workload.csv -q 4 --policy SRTF --format csv
+
+
+# simulate.py
+import argparse
+import csv
+import json
+import sys
+
+from cstates import GOVERNORS, CStateCPU
+from dvfs import DEFAULT_TRANSITION_LATENCY, PStateCPU
+from instrumentation import Instrumentation
+from metrics import OnlineMetrics
+from policies import POLICIES, create_policy, iter_policy_scheduling
+from scheduler import CPU, iter_round_robin_scheduling
+from workload_io import iter_processes
+
+
+def run(path, time_quantum=3, base_power=125.0, max_frequency=5.8, min_frequency=3.0,
+        policy="Round Robin", pstates=False, cstates=None, skip_idle=False, instrument=False, trace_path=None,
+        transition_latency=DEFAULT_TRANSITION_LATENCY, transition_energy=None):
+    """
+    Simulate the workload file at path and return a flat dict of metrics.
+    Processes are streamed from the file and dropped once complete; CPU
+    histories are only recorded when a trace is written. cstates names a
+    C-state governor (see cstates.GOVERNORS) to model idle states.
+    transition_latency and transition_energy are the cost of a P-state change
+    (see dvfs.PStateCPU).
+    """
+    if time_quantum <= 0 or base_power <= 0 or max_frequency <= 0 or min_frequency <= 0:
+        raise ValueError("All parameters must be positive numbers")
+    if transition_latency < 0 or (transition_energy is not None and transition_energy < 0):
+        raise ValueError("Transition latency and energy must not be negative")
+    if pstates and cstates:
+        raise ValueError("The P-state and C-state models cannot be combined")
+
+    record_history = trace_path is not None
+    if cstates:
+        cpu = CStateCPU(base_power=base_power, max_frequency=max_frequency, min_frequency=min_frequency,
+                        record_history=record_history, governor=GOVERNORS[cstates])
+    elif pstates:
+        cpu = PStateCPU(base_power=base_power, max_frequency=max_frequency, min_frequency=min_frequency,
+                        record_history=record_history, transition_latency=transition_latency,
+                        transition_energy=transition_energy)
+    else:
+        cpu = CPU(base_power=base_power, max_frequency=max_frequency, min_frequency=min_frequency,
+                  record_history=record_history)
+    metrics = OnlineMetrics()
+    instrumentation = Instrumentation(timers=True) if instrument else None
+    total_burst = 0
+
+    def arrivals():
+        nonlocal total_burst
+        for process in iter_processes(path):
+            total_burst += process.burst_time
+            yield process
+
+    if policy == "Round Robin":
+        completions = iter_round_robin_scheduling(arrivals(), time_quantum, cpu, skip_idle=skip_idle,
+                                                  sink=metrics, instrumentation=instrumentation)
+    else:
+        completions = iter_policy_scheduling(arrivals(), create_policy(policy, time_quantum), cpu,
+                                             skip_idle=skip_idle, sink=metrics,
+                                             instrumentation=instrumentation)
+
+    if trace_path is None:
+        for _ in completions:
+            pass
+    else:
+        from trace_export import TraceWriter
+
+        with TraceWriter(trace_path) as trace:
+            for process in completions:
+                trace.write_process(process)
+            trace.write_cpu(cpu)
+
+    baseline_power = base_power * total_burst
+    result = {
+        'policy': policy,
+        'time_quantum': time_quantum,
+        'base_power': base_power,
+        'max_frequency': max_frequency,
+        'min_frequency': min_frequency,
+        'cpu_model': 'pstate' if pstates else f'cstate-{cstates}' if cstates else 'basic',
+    }
+    result.update(metrics.summary())
+    result['energy_saving'] = ((baseline_power - cpu.power_consumption) / baseline_power) * 100 \
+        if baseline_power else 0.0
+    if pstates:
+        result['transition_latency'] = cpu.transition_latency
+        result['transition_energy'] = cpu.transition_energy
+        result['pstate_transitions'] = cpu.transitions
+        result['transition_time'] = cpu.transition_time
+    if cstates:
+        for state, entries, residency in zip(cpu.cstates, cpu.entries, cpu.residency):
+            result[f'{state.name}_entries'] = entries
+            result[f'{state.name}_residency'] = residency
+        result['wake_time'] = cpu.wake_time
+    if instrumentation is not None:
+        result.update(instrumentation.summary())
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the CPU scheduling simulator without a GUI")
+    parser.add_argument('workload', help="Workload file: JSON, NDJSON, CSV or binary .wlb, sorted by arrival")
+    parser.add_argument('-q', '--time-quantum', type=float, default=3.0)
+    parser.add_argument('-p', '--base-power', type=float, default=125.0)
+    parser.add_argument('--max-frequency', type=float, default=5.8)
+    parser.add_argument('--min-frequency', type=float, default=3.0)
+    parser.add_argument('--policy', choices=list(POLICIES), default="Round Robin")
+    parser.add_argument('--pstates', action='store_true', help="Use the P-state DVFS model (runtime scales with 1/f)")
+    parser.add_argument('--transition-latency', type=float, default=DEFAULT_TRANSITION_LATENCY,
+                        help="Time units the core stalls on each P-state change")
+    parser.add_argument('--transition-energy', type=float, default=None,
+                        help="Joules per P-state change (default: base power for the transition latency)")
+    parser.add_argument('--cstates', choices=list(GOVERNORS), default=None,
+                        help="Model idle C-states, picking each gap's state with this governor")
+    parser.add_argument('--skip-idle', action='store_true', help="Jump over idle gaps instead of ticking")
+    parser.add_argument('--instrument', action='store_true', help="Add scheduler counters and phase timers")
+    parser.add_argument('--trace', default=None, help="Also write a Chrome trace-event file (.json or .json.gz)")
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('-o', '--output', default=None, help="Output file (default: standard output)")
+    args = parser.parse_args(argv)
+
+    time_quantum = int(args.time_quantum) if args.time_quantum.is_integer() else args.time_quantum
+    try:
+        result = run(args.workload, time_quantum, args.base_power, args.max_frequency, args.min_frequency,
+                     policy=args.policy, pstates=args.pstates, cstates=args.cstates, skip_idle=args.skip_idle,
+                     instrument=args.instrument, trace_path=args.trace,
+                     transition_latency=args.transition_latency, transition_energy=args.transition_energy)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump(result, out, indent=2)
+            out.write('\n')
+        else:
+            writer = csv.DictWriter(out, fieldnames=list(result))
+            writer.writeheader()
+            writer.writerow(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# Parameter sweeps for the Energy-Efficient Round Robin (EE-RR) algorithm.
+# Runs one workload under a grid of (time_quantum, base_power, max_frequency,
+# min_frequency) settings, fanned out over a process pool, and streams one CSV
+# row per configuration.
+
+
+# sweep.py
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import simulate_metrics
+from result_cache import ResultCache, simulation_key, workload_digest
+from scheduler import Process, CPU
+from workload_io import read_records
+
+CONFIG_FIELDS = ['time_quantum', 'base_power', 'max_frequency', 'min_frequency']
+RESULT_FIELDS = CONFIG_FIELDS + [
+    'avg_turnaround', 'avg_waiting', 'p95_turnaround', 'p95_waiting',
+    'energy', 'idle_time', 'makespan', 'energy_saving'
+]
+
+# Workload, its cache digest and result cache shared by every task of a worker process,
+# set once by _init_worker
+_worker_workload = None
+_worker_digest = None
+_worker_cache = None
+
+
+def parameter_grid(time_quanta, base_powers, max_frequencies, min_frequencies):
+    """Cartesian product of the given parameter values, as configuration tuples"""
+    return list(itertools.product(time_quanta, base_powers, max_frequencies, min_frequencies))
+
+
+def simulate_configuration(workload, config, skip_idle=True):
+    """
+    Run one configuration on a fresh CPU and fresh Process objects.
+    Returns a dict with one value per RESULT_FIELDS entry.
+    """
+    time_quantum, base_power, max_frequency, min_frequency = config
+    if time_quantum <= 0 or base_power <= 0 or max_frequency <= 0 or min_frequency <= 0:
+        raise ValueError("All parameters must be positive numbers")
+
+    processes = sorted((Process(*record) for record in workload), key=lambda p: p.arrival_time)
+    baseline_power = base_power * sum(p.burst_time for p in processes)
+    cpu = CPU(base_power=base_power, max_frequency=max_frequency, min_frequency=min_frequency,
+              record_history=False)
+    summary = simulate_metrics(processes, time_quantum, cpu, skip_idle=skip_idle).summary()
+
+    row = {field: summary[field] for field in RESULT_FIELDS if field in summary}
+    row.update({
+        'time_quantum': time_quantum,
+        'base_power': base_power,
+        'max_frequency': max_frequency,
+        'min_frequency': min_frequency,
+        'energy_saving': ((baseline_power - cpu.power_consumption) / baseline_power) * 100
+                         if baseline_power else 0.0,
+    })
+    return row
+
+
+def _init_worker(workload, cache_dir=None):
+    global _worker_workload, _worker_digest, _worker_cache
+    _worker_workload = workload
+    _worker_digest = workload_digest(workload) if cache_dir else None
+    _worker_cache = ResultCache(cache_dir) if cache_dir else None
+
+
+def _run_worker(config):
+    if _worker_cache is None:
+        return simulate_configuration(_worker_workload, config)
+    key = simulation_key(_worker_digest, *config, skip_idle=True, summary=True)
+    entry = _worker_cache.get(key)
+    if entry is not None:
+        return entry[1]
+    row = simulate_configuration(_worker_workload, config)
+    _worker_cache.put(key, {}, row)
+    return row
+
+
+def run_sweep(workload, configs, output_path, max_workers=None, chunksize=None, cache_dir=None):
+    """
+    Simulate every configuration in configs on workload and write the results to
+    output_path as CSV, one row per configuration in input order.
+
+    - workload: sequence of (pid, arrival, burst, priority) tuples
+    - configs: sequence of (time_quantum, base_power, max_frequency, min_frequency)
+    - max_workers: worker processes (defaults to the number of CPUs)
+    - chunksize: configurations sent to a worker per task; defaults to a value
+      that gives each worker several chunks so IPC cost is amortized
+    - cache_dir: optional ResultCache directory; configurations already run
+      on this workload are read from it instead of simulated again
+
+    Rows are written as soon as they are available, so memory does not grow
+    with the size of the grid. Returns the number of rows written.
+    """
+    workload = [tuple(record) for record in workload]
+    configs = list(configs)
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(configs) // (max_workers * 8))
+
+    written = 0
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(workload, cache_dir)) as executor:
+            for row in executor.map(_run_worker, configs, chunksize=chunksize):
+                writer.writerow(row)
+                written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep EE-RR over time quantum and DVFS settings")
+    parser.add_argument('workload', help="Workload file: JSON, NDJSON, CSV or binary .wlb (pid, arrival, burst, priority)")
+    parser.add_argument('-o', '--output', default='sweep_results.csv', help="Output CSV file")
+    parser.add_argument('-q', '--time-quantum', type=int, nargs='+', default=[3])
+    parser.add_argument('-p', '--base-power', type=float, nargs='+', default=[125.0])
+    parser.add_argument('--max-frequency', type=float, nargs='+', default=[5.8])
+    parser.add_argument('--min-frequency', type=float, nargs='+', default=[3.0])
+    parser.add_argument('-j', '--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--cache-dir', default=None, help="Reuse results stored in this result cache directory")
+    args = parser.parse_args(argv)
+
+    workload = read_records(args.workload)
+    configs = parameter_grid(args.time_quantum, args.base_power, args.max_frequency, args.min_frequency)
+    written = run_sweep(workload, configs, args.output, max_workers=args.workers,
+                        cache_dir=args.cache_dir)
+    print(f"Wrote {written} configurations to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
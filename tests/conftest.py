@@ -0,0 +1,25 @@
+# The simulator modules live flat in the repository root; make them importable
+# when pytest is run from anywhere.
+
+
+# conftest.py
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_workload(seed, max_size=40, horizon=200, max_burst=15):
+    """(pid, arrival, burst, priority) records with integral and fractional arrivals, unsorted"""
+    rng = random.Random(seed)
+    return [(pid, rng.choice([rng.randint(0, horizon), round(rng.random() * horizon, 2)]),
+             rng.randint(1, max_burst), rng.randint(1, 3))
+            for pid in range(1, rng.randint(0, max_size) + 1)]
+
+
+def schedule_signature(completed, cpu):
+    """Everything a run produces, in a form that compares with =="""
+    return ([(p.pid, p.start_time, p.finish_time, list(p.execution_history)) for p in completed],
+            cpu.power_consumption, cpu.idle_time,
+            list(cpu.frequency_history), list(cpu.power_history), list(cpu.idle_history))
@@ -0,0 +1,48 @@
+# The lock-step NumPy simulator must agree with the scalar round robin on
+# every workload of a batch, energy included bit for bit.
+
+
+# test_batch_scheduler.py
+import math
+
+import numpy as np
+import pytest
+
+from batch_scheduler import batch_round_robin_scheduling, workload_array
+from conftest import random_workload
+from scheduler import CPU, Process, round_robin_scheduling
+
+
+def scalar_run(workload, time_quantum, base_power, skip_idle):
+    processes = [Process(*record) for record in workload]
+    cpu = CPU(base_power, 5.8, 3.0)
+    round_robin_scheduling(processes, time_quantum, cpu, skip_idle=skip_idle)
+    in_order = sorted(processes, key=lambda p: p.arrival_time)
+    makespan = max((p.finish_time for p in processes), default=0)
+    return cpu, in_order, makespan
+
+
+@pytest.mark.parametrize('skip_idle', [False, True])
+def test_matches_scalar_simulator(skip_idle):
+    workloads = [random_workload(seed, max_size=30) for seed in range(100)]
+    quanta = [seed % 5 + 1 for seed in range(100)]
+    powers = [100.0 + seed for seed in range(100)]
+    result = batch_round_robin_scheduling([workload_array([Process(*r) for r in w]) for w in workloads],
+                                          np.array(quanta), np.array(powers), 5.8, 3.0, skip_idle=skip_idle)
+
+    for row, workload in enumerate(workloads):
+        cpu, in_order, makespan = scalar_run(workload, quanta[row], powers[row], skip_idle)
+        assert result['energy'][row] == cpu.power_consumption
+        assert result['idle_time'][row] == cpu.idle_time
+        assert result['makespan'][row] == makespan
+        size = len(in_order)
+        assert list(result['start_time'][row, :size]) == [p.start_time for p in in_order]
+        assert list(result['finish_time'][row, :size]) == [p.finish_time for p in in_order]
+        assert all(math.isnan(value) for value in result['finish_time'][row, size:])
+        turnaround = sum(p.finish_time - p.arrival_time for p in in_order)
+        assert result['total_turnaround'][row] == pytest.approx(turnaround)
+
+
+def test_empty_batch():
+    result = batch_round_robin_scheduling([], 3, 125, 5.8, 3.0)
+    assert len(result['energy']) == 0
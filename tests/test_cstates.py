@@ -0,0 +1,90 @@
+# CStateCPU picks the cheapest idle state whose break-even time fits the gap,
+# settles each gap once, and with C1 alone behaves exactly like the basic CPU.
+
+
+# test_cstates.py
+import math
+
+import pytest
+
+from conftest import random_workload, schedule_signature
+from cstates import CState, CStateCPU, default_cstates, predictive_governor
+from scheduler import CPU, Process, round_robin_scheduling
+
+# default_cstates(100): C1 10 W; C3 4 W for 30 J of entry and exit energy, so
+# it pays off after 30 / (10 - 4) = 5 units; C6 1 W for 150 J, after 150 / 9
+# against C1 but only after (150 - 30) / (4 - 1) = 40 against C3.
+BREAK_EVEN = [0, 5, 150 / 9]
+
+
+def test_break_even():
+    cpu = CStateCPU(100, 5.8, 3.0)
+    assert cpu.break_even == pytest.approx(BREAK_EVEN)
+    assert [cpu.deepest_state(gap) for gap in (0, 4.9, 5, 16, 17, 39, 40, 1000)] == [0, 0, 1, 1, 1, 1, 2, 2]
+
+
+def test_break_even_edge_cases():
+    cpu = CStateCPU(100, 5.8, 3.0, cstates=[
+        CState("C1", 10),
+        CState("free", 5, entry_latency=2),  # Saves power at no cost: only its entry latency counts
+        CState("useless", 20, entry_energy=1),  # Never saves anything
+    ])
+    assert cpu.break_even == [0, 2, math.inf]
+
+
+def test_settle_charges_the_chosen_state_once():
+    cpu = CStateCPU(100, 5.8, 3.0)
+    cpu.idle(3, 10)
+    cpu.idle(7, 13)  # Contiguous, so the same gap of 10
+    assert cpu.power_consumption == pytest.approx(10 * 10)
+    assert cpu.settle() == 0.2  # C3's exit latency
+    assert cpu.entries == [0, 1, 0]
+    assert cpu.residency == [0, 10, 0]
+    assert cpu.wake_time == 0.2
+    assert cpu.power_consumption == pytest.approx(4 * 10 + 30)
+    assert cpu.settle() == 0  # Nothing left open
+
+
+def test_separate_gaps_are_settled_separately():
+    cpu = CStateCPU(100, 5.8, 3.0)
+    cpu.idle(2, 0)
+    cpu.idle(60, 5)  # Not contiguous: the first gap is settled in C1
+    assert cpu.entries == [1, 0, 0]
+    cpu.settle()
+    assert cpu.entries == [1, 0, 1]
+    assert cpu.residency == [2, 0, 60]
+
+
+def test_wake_up_delays_the_dispatch():
+    cpu = CStateCPU(100, 5.8, 3.0)
+    completed = round_robin_scheduling([Process(1, 10, 2, 1)], 3, cpu, skip_idle=True)
+    # The gap of 10 is spent in C3, whose exit latency delays the run by 0.2
+    assert list(completed[0].execution_history) == [(10.2, 12.2)]
+    assert completed[0].finish_time == pytest.approx(12.2)
+    assert cpu.power_consumption == pytest.approx(4 * 10 + 30 + 100 * 2)
+
+
+def test_oracle_and_predictive_governors():
+    oracle = CStateCPU(100, 5.8, 3.0)
+    predictive = CStateCPU(100, 5.8, 3.0, governor=predictive_governor)
+    for cpu in (oracle, predictive):
+        for start in range(0, 100, 25):
+            cpu.idle(20, start)
+            cpu.settle()
+    # The oracle knows every gap is 20; the prediction climbs 0, 10, 15, 17.5
+    assert oracle.entries == [0, 4, 0]
+    assert predictive.entries == [1, 3, 0]
+    assert predictive.predicted_gap == pytest.approx(18.75)
+    assert oracle.power_consumption == pytest.approx(4 * (4 * 20 + 30))
+    assert predictive.power_consumption == pytest.approx(10 * 20 + 3 * (4 * 20 + 30))
+
+
+@pytest.mark.parametrize('skip_idle', [False, True])
+def test_c1_only_matches_basic_cpu(skip_idle):
+    for seed in range(50):
+        workload = random_workload(seed)
+        cpu = CPU(125, 5.8, 3.0)
+        expected = round_robin_scheduling([Process(*r) for r in workload], 3, cpu, skip_idle=skip_idle)
+        cstate_cpu = CStateCPU(125, 5.8, 3.0, cstates=default_cstates(125)[:1])
+        completed = round_robin_scheduling([Process(*r) for r in workload], 3, cstate_cpu, skip_idle=skip_idle)
+        assert schedule_signature(completed, cstate_cpu) == schedule_signature(expected, cpu), seed
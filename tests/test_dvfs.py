@@ -0,0 +1,89 @@
+# PStateCPU checked against schedules worked out by hand: runtime scales with
+# 1/f, power follows C*V^2*f plus leakage, and every P-state change stalls the
+# core and costs energy.
+
+
+# test_dvfs.py
+import pytest
+
+from dvfs import PState, PStateCPU, default_pstates
+from scheduler import Process, round_robin_scheduling
+
+# Low P-state: 2 GHz at 1.0 V; high P-state: 4 GHz at 1.2 V drawing the full 100 W.
+# Leakage is 20 W / 1.2 V and C is 80 W / (1.2^2 * 4), so the low state draws
+# 80 * 2 / (1.44 * 4) + 20 / 1.2 = 400/9 W.
+PSTATES = [PState(2.0, 1.0), PState(4.0, 1.2)]
+LOW_POWER = 400 / 9
+
+
+def make_cpu(**options):
+    return PStateCPU(100, 4.0, 2.0, pstates=PSTATES, transition_latency=0.5, transition_energy=3.0, **options)
+
+
+def test_power_model():
+    cpu = make_cpu()
+    assert cpu.leakage == pytest.approx(20 / 1.2)
+    assert cpu.capacitance == pytest.approx(80 / (1.44 * 4))
+    assert cpu.power(1) == pytest.approx(100)
+    assert cpu.power(0) == pytest.approx(LOW_POWER)
+    for index, state in enumerate(PSTATES):
+        assert cpu.power(index) == pytest.approx(
+            cpu.capacitance * state.voltage ** 2 * state.frequency + cpu.leakage * state.voltage)
+
+
+@pytest.mark.parametrize('index', [0, 1])
+def test_runtime_scales_with_inverse_frequency(index):
+    cpu = make_cpu(governor=lambda cpu, process: index)
+    cpu.pstate = index  # No transition, so elapsed time is run time only
+    process = Process(1, 0, 4, 1)
+    elapsed = cpu.execute(process, 100, 0)
+    assert elapsed == pytest.approx(4 * 4.0 / PSTATES[index].frequency)
+    assert process.remaining_time == 0
+    assert cpu.cycles == pytest.approx(4 * 4.0)  # The same work at any frequency
+    assert cpu.power_consumption == pytest.approx(cpu.power(index) * elapsed)
+
+
+def test_slices_retire_work_at_the_current_frequency():
+    cpu = make_cpu(governor=lambda cpu, process: 0)
+    cpu.pstate = 0
+    process = Process(1, 0, 2, 2)
+    assert cpu.execute(process, 3, 0) == 3
+    assert process.remaining_time == pytest.approx(0.5)  # 3 time units at half speed
+    assert cpu.execute(process, 3, 3) == pytest.approx(1)
+
+
+def test_one_transition():
+    # P1 runs 0-4 in the high state; P2 stalls 0.5, then needs 4 at half speed
+    processes = [Process(1, 0, 4, 1), Process(2, 0, 2, 2)]
+    cpu = make_cpu()
+    completed = round_robin_scheduling(processes, 10, cpu)
+    assert [(p.pid, p.start_time, p.finish_time) for p in completed] == [(1, 0, 4), (2, 4, 8.5)]
+    assert list(processes[1].execution_history) == [(4.5, 8.5)]
+    assert cpu.transitions == 1
+    assert cpu.transition_time == 0.5
+    assert cpu.power_consumption == pytest.approx(100 * 4 + 3 + LOW_POWER * 4)
+
+
+def test_transition_charged_on_every_change():
+    # Quantum 2: P1 high 0-2, P2 low 2.5-4.5, P1 high 5-7, P2 low 7.5-9.5
+    processes = [Process(1, 0, 4, 1), Process(2, 0, 2, 2)]
+    cpu = make_cpu()
+    completed = round_robin_scheduling(processes, 2, cpu)
+    assert [(p.pid, p.finish_time) for p in completed] == [(1, 7), (2, 9.5)]
+    assert list(processes[0].execution_history) == [(0, 2), (5, 7)]
+    assert list(processes[1].execution_history) == [(2.5, 4.5), (7.5, 9.5)]
+    assert cpu.transitions == 3
+    assert cpu.transition_time == pytest.approx(1.5)
+    assert cpu.power_consumption == pytest.approx(100 * 4 + 3 * 3 + LOW_POWER * 4)
+
+
+def test_default_transition_energy_is_base_power_for_the_stall():
+    cpu = PStateCPU(100, 4.0, 2.0, transition_latency=0.25)
+    assert cpu.transition_energy == 25
+
+
+def test_default_pstates():
+    states = default_pstates(2.0, 5.0, count=4)
+    assert [state.frequency for state in states] == pytest.approx([2.0, 3.0, 4.0, 5.0])
+    assert [state.voltage for state in states] == pytest.approx([0.75, 0.75 + 0.5 / 3, 0.75 + 1 / 3, 1.25])
+    assert len(default_pstates(3.0, 3.0)) == 1
@@ -0,0 +1,55 @@
+# After any sequence of edits, an incremental schedule must be identical to
+# re-running the edited workload from scratch.
+
+
+# test_incremental.py
+import random
+
+import pytest
+
+from conftest import schedule_signature
+from incremental import IncrementalSchedule
+from scheduler import CPU, Process, round_robin_scheduling
+
+
+def record(rng, pid, horizon):
+    return pid, rng.choice([rng.randint(0, horizon), round(rng.random() * horizon, 2)]), \
+        rng.randint(1, 15), rng.randint(1, 3)
+
+
+@pytest.mark.parametrize('seed', range(150))
+def test_edits_match_full_rerun(seed):
+    rng = random.Random(seed)
+    workload = [record(rng, pid, 200) for pid in range(1, rng.randint(0, 40) + 1)]
+    time_quantum = rng.randint(1, 6)
+    skip_idle = rng.random() < 0.5
+    schedule = IncrementalSchedule(time_quantum, CPU(125, 5.8, 3.0), checkpoint_interval=rng.choice([1, 5, 20]),
+                                   skip_idle=skip_idle, max_checkpoints=rng.choice([1, 3, 64]))
+    schedule.run([Process(*r) for r in workload])
+    next_pid = len(workload) + 1
+
+    for _ in range(4):
+        added = [record(rng, next_pid + k, 250) for k in range(rng.randint(0, 2))]
+        next_pid += len(added)
+        removed = [r[0] for r in rng.sample(workload, min(len(workload), rng.randint(0, 2)))]
+        workload = [r for r in workload if r[0] not in removed] + added
+        schedule.apply_edits([Process(*r) for r in added], removed)
+
+        cpu = CPU(125, 5.8, 3.0)
+        expected = round_robin_scheduling([Process(*r) for r in workload], time_quantum, cpu, skip_idle=skip_idle)
+        assert schedule_signature(schedule.completed, schedule.cpu) == schedule_signature(expected, cpu)
+
+
+def test_checkpoints_stay_bounded():
+    rng = random.Random(1)
+    workload = []
+    arrival = 0
+    for pid in range(1, 5001):
+        arrival += rng.randint(0, 3)
+        workload.append((pid, arrival, rng.randint(1, 5), rng.randint(1, 3)))
+    schedule = IncrementalSchedule(3, CPU(125, 5.8, 3.0), checkpoint_interval=1, max_checkpoints=16)
+    schedule.run([Process(*r) for r in workload])
+
+    assert 1 <= len(schedule.checkpoints) <= 16
+    assert schedule.checkpoint_entries <= 2 * len(workload)
+    assert schedule.checkpoint_entries == sum(len(c.ready) for c in schedule.checkpoints)
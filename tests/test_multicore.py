@@ -0,0 +1,46 @@
+# A one-core MultiCoreCPU must reproduce the single-CPU round robin with
+# skip_idle; with more cores every process still gets exactly its burst.
+
+
+# test_multicore.py
+import pytest
+
+from conftest import random_workload, schedule_signature
+from multicore import MultiCoreCPU, multicore_round_robin_scheduling
+from scheduler import CPU, Process, round_robin_scheduling
+
+
+@pytest.mark.parametrize('seed', range(150))
+def test_single_core_matches_round_robin(seed):
+    workload = random_workload(seed, horizon=300)
+    time_quantum = seed % 6 + 1
+
+    cpu = CPU(125, 5.8, 3.0)
+    expected = round_robin_scheduling([Process(*r) for r in workload], time_quantum, cpu, skip_idle=True)
+    multicore = MultiCoreCPU(1, 125, 5.8, 3.0)
+    completed = multicore_round_robin_scheduling([Process(*r) for r in workload], time_quantum, multicore)
+
+    assert schedule_signature(completed, multicore.cores[0]) == schedule_signature(expected, cpu)
+    assert multicore.power_consumption == cpu.power_consumption
+
+
+@pytest.mark.parametrize('num_cores', [2, 4, 8])
+@pytest.mark.parametrize('work_stealing', [True, False])
+def test_cores_account_for_the_whole_makespan(num_cores, work_stealing):
+    for seed in range(40):
+        workload = random_workload(seed, horizon=300)
+        cpu = MultiCoreCPU(num_cores, 125, 5.8, 3.0)
+        completed = multicore_round_robin_scheduling([Process(*r) for r in workload], 3, cpu,
+                                                     work_stealing=work_stealing)
+        assert sorted(p.pid for p in completed) == [record[0] for record in workload]
+        for process in completed:
+            assert sum(end - start for start, end in process.execution_history) == process.burst_time
+        if completed:
+            makespan = max(p.finish_time for p in completed)
+            for core in cpu.core_summary():
+                assert core['busy_time'] + core['idle_time'] == pytest.approx(makespan)
+
+
+def test_at_least_one_core():
+    with pytest.raises(ValueError):
+        MultiCoreCPU(0, 125, 5.8, 3.0)
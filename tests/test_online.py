@@ -0,0 +1,62 @@
+# Fed the whole arrival stream, the online scheduler must make the same
+# decisions as the offline policy loop, whatever the decision budget.
+
+
+# test_online.py
+import asyncio
+
+import pytest
+
+from benchmarks import generate_workload
+from conftest import random_workload, schedule_signature
+from dvfs import PStateCPU
+from online import OnlineScheduler, iter_online_scheduling, replay, run_online
+from policies import POLICIES, create_policy, policy_scheduling
+from scheduler import CPU, Process
+
+
+def offline(workload, name, cpu, skip_idle):
+    return policy_scheduling([Process(*r) for r in workload], create_policy(name, 3), cpu, skip_idle=skip_idle)
+
+
+@pytest.mark.parametrize('name', list(POLICIES))
+@pytest.mark.parametrize('cpu_class', [CPU, PStateCPU])
+@pytest.mark.parametrize('skip_idle', [False, True])
+def test_matches_offline_scheduling(name, cpu_class, skip_idle):
+    workload = list(generate_workload(2000, seed=3))
+    cpu = cpu_class(125, 5.8, 3.0)
+    expected = offline(workload, name, cpu, skip_idle)
+
+    online_cpu = cpu_class(125, 5.8, 3.0)
+    scheduler = OnlineScheduler(create_policy(name, 3), online_cpu, skip_idle=skip_idle)
+    decisions = list(iter_online_scheduling((Process(*r) for r in workload), scheduler, budget=7))
+    completed = [d.process for d in decisions if d.completed]
+
+    assert schedule_signature(completed, online_cpu) == schedule_signature(expected, cpu)
+    assert scheduler.finished and scheduler.decisions == len(decisions)
+
+
+def test_async_replay_matches_offline():
+    workload = sorted(random_workload(7, max_size=200), key=lambda r: r[1])
+    cpu = CPU(125, 5.8, 3.0)
+    expected = offline(workload, "Round Robin", cpu, False)
+
+    online_cpu = CPU(125, 5.8, 3.0)
+    scheduler = OnlineScheduler(create_policy("Round Robin", 3), online_cpu)
+    completed = []
+
+    def on_decision(decision):
+        if decision.completed:
+            completed.append(decision.process)
+
+    summary = asyncio.run(run_online(replay([Process(*r) for r in workload], speed=None), scheduler,
+                                     on_decision=on_decision, budget=5))
+    assert schedule_signature(completed, online_cpu) == schedule_signature(expected, cpu)
+    assert summary['completed'] == len(workload)
+
+
+def test_out_of_order_submit_is_rejected():
+    scheduler = OnlineScheduler(create_policy("Round Robin", 3), CPU(125, 5.8, 3.0))
+    scheduler.submit(Process(1, 5, 1, 1))
+    with pytest.raises(ValueError, match="out of order"):
+        scheduler.submit(Process(2, 0, 1, 1))
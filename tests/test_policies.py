@@ -0,0 +1,105 @@
+# Round robin runs on the shared loop, which test_scheduler.py checks against
+# the original list-based loop; every policy must run each process to
+# completion, and the loop must resume from a saved ready queue. Adaptive
+# round robin's running median must agree with statistics.median_low.
+
+
+# test_policies.py
+import math
+import random
+import statistics
+
+import pytest
+
+from conftest import random_workload, schedule_signature
+from dvfs import PStateCPU
+from policies import (POLICIES, AdaptiveRoundRobinPolicy, _ReadyQueueStats, create_policy, iter_policy_scheduling,
+                      policy_scheduling)
+from scheduler import CPU, Process
+
+
+@pytest.mark.parametrize('name', list(POLICIES))
+@pytest.mark.parametrize('cpu_class', [CPU, PStateCPU])
+def test_ready_processes_run_as_if_admitted_at_start_time(name, cpu_class):
+    for seed in range(30):
+        start_time = seed + 5
+        workload = sorted(((pid, max(start_time, arrival), burst, priority)
+                           for pid, arrival, burst, priority in random_workload(seed)), key=lambda r: r[1])
+        initial = sum(1 for record in workload if record[1] == start_time)
+
+        cpu = cpu_class(125, 5.8, 3.0)
+        expected = list(iter_policy_scheduling([Process(*r) for r in workload], create_policy(name, 3), cpu,
+                                               start_time=start_time))
+        resumed_cpu = cpu_class(125, 5.8, 3.0)
+        processes = [Process(*r) for r in workload]
+        completed = list(iter_policy_scheduling(processes[initial:], create_policy(name, 3), resumed_cpu,
+                                                start_time=start_time, ready=processes[:initial]))
+        assert schedule_signature(completed, resumed_cpu) == schedule_signature(expected, cpu), seed
+
+
+@pytest.mark.parametrize('name', list(POLICIES))
+def test_every_process_runs_its_burst(name):
+    for seed in range(50):
+        workload = random_workload(seed)
+        completed = policy_scheduling([Process(*r) for r in workload], create_policy(name, 3),
+                                      CPU(125, 5.8, 3.0), skip_idle=seed % 2 == 0)
+        assert sorted(p.pid for p in completed) == [r[0] for r in workload]
+        for process in completed:
+            assert process.start_time >= process.arrival_time
+            assert sum(end - start for start, end in process.execution_history) == \
+                pytest.approx(process.burst_time)
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match="Unknown scheduling policy"):
+        create_policy("Lottery", 3)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_ready_queue_stats_match_statistics(seed):
+    rng = random.Random(seed)
+    stats = _ReadyQueueStats()
+    queued = []
+    for step in range(2000):
+        if queued and rng.random() < 0.45:
+            stats.remove(queued.pop(rng.randrange(len(queued))))
+        else:
+            # Few distinct values, so equal remaining times are common
+            process = Process(step, 0, rng.randint(1, 20), 1)
+            process.remaining_time = rng.choice([process.burst_time, process.burst_time / 4])
+            stats.add(process)
+            queued.append(process)
+        remaining = [p.remaining_time for p in queued]
+        assert len(stats) == len(queued)
+        assert stats.median() == (statistics.median_low(remaining) if remaining else 0), step
+        assert stats.mean() == pytest.approx(statistics.fmean(remaining) if remaining else 0), step
+
+
+def test_adaptive_quantum_is_the_median_burst():
+    # Round 1: median of 1, 2, 9, 10, 11 is 9, which finishes P1-P3 and
+    # leaves P4 and P5 with 1 and 2; round 2 runs at quantum 1, round 3 too.
+    processes = [Process(pid, 0, burst, 1) for pid, burst in enumerate([1, 2, 9, 10, 11], 1)]
+    policy = AdaptiveRoundRobinPolicy()
+    policy_scheduling(processes, policy, CPU(125, 5.8, 3.0))
+    assert [list(p.execution_history) for p in processes] == [
+        [(0, 1)], [(1, 3)], [(3, 12)], [(12, 21), (30, 31)], [(21, 30), (31, 32), (32, 33)],
+    ]
+    assert policy.rounds == 3
+
+
+@pytest.mark.parametrize('statistic', ['median', 'mean'])
+def test_adaptive_quantum_follows_the_ready_queue(statistic):
+    for seed in range(30):
+        policy = AdaptiveRoundRobinPolicy(statistic=statistic)
+        quanta = []
+        new_round = policy._new_round
+
+        def record_round():
+            remaining = [p.remaining_time for p in policy.queue]
+            new_round()
+            value = statistics.median_low(remaining) if statistic == 'median' else statistics.fmean(remaining)
+            quanta.append((policy.quantum, max(1, math.ceil(value))))
+
+        policy._new_round = record_round
+        policy_scheduling([Process(*r) for r in random_workload(seed)], policy, CPU(125, 5.8, 3.0))
+        assert quanta and all(quantum == expected for quantum, expected in quanta), seed
@@ -0,0 +1,73 @@
+# Cache keys must follow the schedule, not the listing order, and an entry
+# evicted while it is being read must count as a miss. Eviction keeps the
+# cache under its size limit without rescanning on every put.
+
+
+# test_result_cache.py
+import os
+
+from result_cache import ResultCache, cached_round_robin_scheduling, simulation_key, workload_digest
+from scheduler import CPU, Process
+
+
+def test_key_ignores_listing_order_of_the_same_schedule():
+    workload = [(1, 0, 5, 1), (2, 4, 3, 2), (3, 4, 2, 1), (4, 9, 1, 1)]
+    shuffled = [workload[3], workload[1], workload[0], workload[2]]
+    assert simulation_key(workload, 3, 125, 5.8, 3.0) == simulation_key(shuffled, 3, 125, 5.8, 3.0)
+    assert simulation_key(workload, 3, 125, 5.8, 3.0) == \
+        simulation_key([Process(*r) for r in shuffled], 3, 125, 5.8, 3.0)
+
+
+def test_key_keeps_the_order_of_equal_arrivals():
+    # Ties run in input order, so swapping them changes the schedule
+    workload = [(1, 0, 5, 1), (2, 0, 3, 2)]
+    assert simulation_key(workload, 3, 125, 5.8, 3.0) != simulation_key(workload[::-1], 3, 125, 5.8, 3.0)
+
+
+def test_hit_after_reordering(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    workload = [(1, 0, 5, 1), (2, 4, 3, 2), (3, 1, 2, 1)]
+    expected, hit = cached_round_robin_scheduling([Process(*r) for r in workload], 3, CPU(125, 5.8, 3.0), cache)
+    assert not hit
+    cpu = CPU(125, 5.8, 3.0)
+    completed, hit = cached_round_robin_scheduling([Process(*r) for r in workload[::-1]], 3, cpu, cache)
+    assert hit
+    assert [(p.pid, p.finish_time) for p in completed] == [(p.pid, p.finish_time) for p in expected]
+
+
+def test_entry_evicted_during_get_is_a_miss(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put('key', {'values': [1.0]})
+    utime = os.utime
+
+    def evict_then_touch(path, *args, **kwargs):
+        os.unlink(path)
+        return utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'utime', evict_then_touch)
+    assert cache.get('key') is None
+
+
+def test_key_from_digest_matches_key_from_workload():
+    workload = [(1, 0, 5, 1), (2, 4, 3, 2), (3, 1, 2, 1)]
+    assert simulation_key(workload_digest(workload), 3, 125, 5.8, 3.0, skip_idle=True) == \
+        simulation_key(workload, 3, 125, 5.8, 3.0, skip_idle=True)
+
+
+def test_put_evicts_oldest_only_past_the_limit(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put('probe', {'values': list(range(100))})
+    entry_size = cache.size()
+    cache.clear()
+    cache = ResultCache(str(tmp_path), max_bytes=entry_size * 5)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda: scans.append(1) or evict())
+    for i in range(20):
+        cache.put(f'key{i}', {'values': list(range(100, 200)) if i else list(range(100))})
+        os.utime(cache._path(f'key{i}'), (i, i))
+        assert cache.size() <= cache.max_bytes
+        assert cache.total_bytes == cache.size()
+    assert len(scans) < 20
+    assert cache.get('key19') is not None
+    assert cache.get('key0') is None
@@ -0,0 +1,61 @@
+# The deque-based round robin must make exactly the decisions of the original
+# list-based loop it replaced, which is kept here as the reference.
+
+
+# test_scheduler.py
+import pytest
+
+from conftest import random_workload, schedule_signature
+from scheduler import CPU, Process, round_robin_scheduling
+
+
+def list_round_robin_scheduling(processes, time_quantum, cpu):
+    """The original implementation, with list.pop(0) queues"""
+    current_time = 0
+    ready_queue = []
+    completed_processes = []
+    processes = sorted(processes, key=lambda p: p.arrival_time)
+
+    while processes or ready_queue:
+        while processes and processes[0].arrival_time <= current_time:
+            ready_queue.append(processes.pop(0))
+
+        if not ready_queue:
+            cpu.idle(1, current_time)
+            current_time += 1
+            continue
+
+        current_process = ready_queue.pop(0)
+        if current_process.start_time is None:
+            current_process.start_time = current_time
+
+        execution_time = cpu.execute(current_process, time_quantum, current_time)
+        current_time += execution_time
+
+        if current_process.remaining_time == 0:
+            current_process.finish_time = current_time
+            completed_processes.append(current_process)
+        else:
+            ready_queue.append(current_process)
+
+    return completed_processes
+
+
+def run(scheduling, workload, time_quantum):
+    cpu = CPU(125, 5.8, 3.0)
+    completed = scheduling([Process(*record) for record in workload], time_quantum, cpu)
+    return schedule_signature(completed, cpu)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_matches_list_implementation(seed):
+    workload = random_workload(seed)
+    time_quantum = seed % 6 + 1
+    assert run(round_robin_scheduling, workload, time_quantum) == \
+        run(list_round_robin_scheduling, workload, time_quantum)
+
+
+def test_equal_arrivals_keep_input_order():
+    workload = [(pid, 0, 4, 1) for pid in (3, 1, 2)]
+    assert run(round_robin_scheduling, workload, 2) == run(list_round_robin_scheduling, workload, 2)
+
@@ -0,0 +1,125 @@
+# The service must return the same schedule as a local run, reject bad
+# workloads before queueing them, and hold back submitters when it is full.
+
+
+# test_service.py
+import asyncio
+
+import pytest
+
+from scheduler import CPU, Process, round_robin_scheduling
+from service import ServiceClient, SimulationService, drive_load
+
+LONG_JOB = [[1, 0, 300000, 1]]  # About a second of work at time quantum 1
+
+
+def serve(test, **options):
+    """Run test(port) against an in-process service on an ephemeral port"""
+    async def main():
+        service = SimulationService(**options)
+        server = await service.start(port=0)
+        try:
+            return await test(server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def test_round_trip_matches_local_run():
+    workload = [(1, 0, 5, 1), (2, 1, 4, 2), (3, 2, 2, 1), (4, 20, 3, 1)]
+
+    async def test(port):
+        client = await ServiceClient.connect(port=port)
+        try:
+            return await client.run(workload, time_quantum=2)
+        finally:
+            await client.close()
+
+    rows, result = serve(test, max_workers=1)
+    cpu = CPU(125.0, 5.8, 3.0)
+    expected = round_robin_scheduling([Process(*r) for r in workload], 2, cpu)
+    assert rows == [[p.pid, p.start_time, p.finish_time] for p in expected]
+    assert result['type'] == 'result'
+    assert result['summary']['energy'] == pytest.approx(cpu.power_consumption)
+
+
+@pytest.mark.parametrize('record', [[1, 0, -3, 1], [1, 0, float('inf'), 1], [1, 0, 3], [1.5, 0, 3, 1]])
+def test_invalid_workload_is_rejected_before_queueing(record):
+    async def test(port):
+        client = await ServiceClient.connect(port=port)
+        try:
+            with pytest.raises(RuntimeError, match="Invalid workload"):
+                await client.submit([record])
+            return await client.stats()
+        finally:
+            await client.close()
+
+    stats = serve(test, max_workers=1)
+    assert stats['queue_depth'] == 0
+    assert stats['completed'] == stats['failed'] == 0
+
+
+def test_cancel_queued_job():
+    async def test(port):
+        client = await ServiceClient.connect(port=port)
+        try:
+            running = await client.submit(LONG_JOB, time_quantum=1, rows=False)
+            queued = await client.submit([[1, 0, 5, 1]])
+            await client.cancel(queued)
+            messages = [message async for message in client.results(queued)]
+            async for _ in client.results(running):
+                pass
+            return messages, await client.stats()
+        finally:
+            await client.close()
+
+    messages, stats = serve(test, max_workers=1)
+    assert [message['type'] for message in messages] == ['cancelled']
+    assert stats['cancelled'] == 1
+    assert stats['completed'] == 1
+
+
+def test_full_queue_holds_back_submitter():
+    async def test(port):
+        client = await ServiceClient.connect(port=port)
+        try:
+            running = await client.submit(LONG_JOB, time_quantum=1, rows=False)
+            await asyncio.sleep(0.1)  # Let the only worker take it off the queue
+            await client.submit([[1, 0, 5, 1]])  # Fills the one queue slot
+            blocked = asyncio.create_task(client.submit([[2, 0, 5, 1]]))
+            await asyncio.sleep(0.3)
+            held_back = not blocked.done()
+            async for message in client.results(running):
+                assert message['type'] == 'result'
+            await blocked
+            return held_back
+        finally:
+            await client.close()
+
+    assert serve(test, max_workers=1, max_queue=1)
+
+
+def test_job_over_step_limit_fails():
+    async def test(port):
+        client = await ServiceClient.connect(port=port)
+        try:
+            with pytest.raises(RuntimeError, match="exceeded 100 scheduler steps"):
+                await client.run([[1, 0, 1000, 1]], time_quantum=1)
+            rows, _ = await client.run([[1, 0, 50, 1]], time_quantum=1)
+            return rows, await client.stats()
+        finally:
+            await client.close()
+
+    rows, stats = serve(test, max_workers=1, max_job_steps=100)
+    assert rows == [[1, 0, 50]]
+    assert stats['failed'] == 1
+    assert stats['completed'] == 1
+
+
+def test_drive_load():
+    report = serve(lambda port: drive_load(clients=3, jobs_per_client=2, size=50, port=port), max_workers=2)
+    assert report['jobs'] == 6
+    assert report['service']['completed'] == 6
+    assert report['service']['queue_depth'] == report['service']['running'] == 0
@@ -0,0 +1,113 @@
+# Chrome trace-event export of simulated schedules.
+# Writes execution intervals, CPU idle periods and the frequency/power counters
+# in the Trace Event Format read by chrome://tracing and Perfetto, so schedules
+# far too large for the matplotlib Gantt chart can be explored in a trace
+# viewer. Events are streamed to the file (optionally gzip-compressed) as they
+# are produced; nothing is collected in memory first.
+
+
+# trace_export.py
+import gzip
+import json
+from itertools import islice
+
+from metrics import MetricsSink
+
+PROCESSES_TRACK = 1  # Trace "process" holding one thread per simulated process
+CPU_TRACK = 2  # Trace "process" holding the idle thread and the counters
+IDLE_THREAD = 0
+
+
+class TraceWriter(MetricsSink):
+    """
+    Streaming trace-event writer. Usable directly (write_process, write_cpu,
+    close) or as the sink of a scheduler run, in which case each process is
+    written as it completes and the CPU tracks when the run ends:
+
+        with TraceWriter('run.json.gz') as trace:
+            simulate_metrics(arrivals, time_quantum, cpu, sink=trace)
+    """
+
+    def __init__(self, path, compress=None, time_scale=1000):
+        """
+        Open a trace file with:
+        - path: Output file
+        - compress: gzip the output; defaults to whether path ends in .gz
+        - time_scale: Trace microseconds per simulated time unit (1000 shows
+          one unit as one millisecond)
+        """
+        if compress is None:
+            compress = path.endswith('.gz')
+        self.file = gzip.open(path, 'wt', compresslevel=6) if compress else open(path, 'w')
+        self.time_scale = time_scale
+        self.closed = False
+        # Every event after this first one is written with a leading separator
+        self.file.write('{"displayTimeUnit":"ms","traceEvents":[\n'
+                        f'{{"ph":"M","name":"process_name","pid":{PROCESSES_TRACK},"tid":0,'
+                        '"args":{"name":"Processes"}}')
+        self._metadata('process_name', CPU_TRACK, 0, "CPU")
+        self._metadata('thread_name', CPU_TRACK, IDLE_THREAD, "Idle")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, events):
+        # Join events in bounded batches; one write per event would dominate the cost
+        events = iter(events)
+        while True:
+            batch = ''.join(islice(events, 65536))
+            if not batch:
+                break
+            self.file.write(batch)
+
+    def _metadata(self, name, pid, tid, value):
+        self.file.write(f',\n{{"ph":"M","name":"{name}","pid":{pid},"tid":{tid},'
+                        f'"args":{{"name":{json.dumps(value)}}}}}')
+
+    def _slices(self, name, pid, tid, intervals):
+        scale = self.time_scale
+        prefix = f',\n{{"ph":"X","name":"{name}","pid":{pid},"tid":{tid},"ts":'
+        self._write(f'{prefix}{start * scale!r},"dur":{(end - start) * scale!r}}}'
+                    for start, end in intervals)
+
+    def _counter(self, name, unit, samples):
+        scale = self.time_scale
+        prefix = f',\n{{"ph":"C","name":"{name}","pid":{CPU_TRACK},"ts":'
+        suffix = f',"args":{{"{unit}":'
+        self._write(f'{prefix}{time * scale!r}{suffix}{value!r}}}}}' for time, value in samples)
+
+    def write_process(self, process):
+        """Write one process as a named thread with a slice per execution interval"""
+        self._metadata('thread_name', PROCESSES_TRACK, process.pid, f"P{process.pid}")
+        self._slices(f"P{process.pid} (priority {process.priority})", PROCESSES_TRACK, process.pid,
+                     process.execution_history)
+
+    def write_cpu(self, cpu):
+        """Write the CPU idle periods and the frequency and power counters"""
+        self._slices("Idle", CPU_TRACK, IDLE_THREAD, cpu.idle_history)
+        self._counter("Frequency", "GHz", cpu.frequency_history)
+        self._counter("Power", "W", cpu.power_history)
+
+    def on_complete(self, process):
+        self.write_process(process)
+
+    def close(self, cpu=None):
+        """Finish the file, writing the CPU tracks first when a CPU is given"""
+        if self.closed:
+            return
+        if cpu is not None:
+            self.write_cpu(cpu)
+        self.file.write('\n]}\n')
+        self.file.close()
+        self.closed = True
+
+
+def export_trace(path, completed_processes, cpu, compress=None, time_scale=1000):
+    """Write a finished schedule as a Chrome trace-event file"""
+    with TraceWriter(path, compress=compress, time_scale=time_scale) as trace:
+        for process in completed_processes:
+            trace.write_process(process)
+        trace.write_cpu(cpu)
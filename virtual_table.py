@@ -0,0 +1,123 @@
+# Virtualized table widget for the GUI.
+# Rows live in a plain Python list; the ttk.Treeview only ever holds the rows
+# that fit on screen, and scrolling re-fills those few items. Loading, clearing
+# or replacing a million rows costs a list assignment, not a million Tk calls.
+
+
+# virtual_table.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable:
+    def __init__(self, master, columns, widths, height=8):
+        """
+        Create a table with:
+        - master: Parent widget
+        - columns: Column headings
+        - widths: Column widths in pixels
+        - height: Number of visible rows
+        """
+        self.tree = ttk.Treeview(master, columns=columns, show="headings", height=height,
+                                 selectmode='browse')
+        for col, width in zip(columns, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor=tk.CENTER)
+        self.scrollbar = ttk.Scrollbar(master, orient=tk.VERTICAL, command=self.yview)
+
+        self.height = height
+        self.rows = []  # The model: one tuple per row
+        self.first = 0  # Model index of the top visible row
+        self.selected = None  # Model index of the selected row
+        self.items = []  # Treeview items showing rows[first:first + height]
+
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-1))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(1))
+        self.render()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def set_rows(self, rows):
+        """Replace the whole model and scroll back to the top"""
+        self.rows = rows if isinstance(rows, list) else list(rows)
+        self.first = 0
+        self.selected = None
+        self.render()
+
+    def append(self, row):
+        """Add a row at the end and scroll it into view"""
+        self.rows.append(tuple(row))
+        self.first = max(0, len(self.rows) - self.height)
+        self.render()
+
+    def delete(self, index):
+        """Remove the row at a model index and return it"""
+        row = self.rows.pop(index)
+        if self.selected is not None:
+            if self.selected == index:
+                self.selected = None
+            elif self.selected > index:
+                self.selected -= 1
+        self.render()
+        return row
+
+    def clear(self):
+        self.set_rows([])
+
+    def selected_index(self):
+        """Model index of the selected row, or None"""
+        return self.selected
+
+    def scroll(self, rows):
+        self.first += rows
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            step = self.height if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+        self.render()
+
+    def on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+        return 'break'
+
+    def on_select(self, event):
+        # Ignore the empty selection left behind when the selected row scrolls away
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            self.selected = self.first + self.items.index(selection[0])
+
+    def render(self):
+        """Fill the visible Treeview items from the model"""
+        total = len(self.rows)
+        self.first = max(0, min(self.first, total - self.height))
+        window = self.rows[self.first:self.first + self.height]
+
+        for position, row in enumerate(window):
+            if position < len(self.items):
+                self.tree.item(self.items[position], values=row)
+            else:
+                self.items.append(self.tree.insert("", "end", values=row))
+        while len(self.items) > len(window):
+            self.tree.delete(self.items.pop())
+
+        visible = self.selected is not None and self.first <= self.selected < self.first + len(window)
+        if visible:
+            self.tree.selection_set(self.items[self.selected - self.first])
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self.first / total, (self.first + len(window)) / total)
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,231 @@
+# Workload readers and writers for the scheduler.
+# Supports the GUI's JSON format (a list of {pid, arrival, burst, priority}
+# objects) as well as NDJSON and CSV traces. NDJSON and CSV are read one line at
+# a time, so multi-GB traces can be replayed without loading them into memory.
+# The binary .wlb format stores the four fields as fixed-width columns that are
+# memory-mapped with NumPy instead of parsed.
+
+
+# workload_io.py
+import argparse
+import csv
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+
+from scheduler import Process
+
+WORKLOAD_FIELDS = ('pid', 'arrival', 'burst', 'priority')
+
+
+def _number(value):
+    """Parse a numeric field, keeping integers as int"""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def check_record(record, source, line):
+    """
+    Reject a (pid, arrival, burst, priority) record the scheduler cannot run:
+    a value that is not finite, a burst that is not positive, a negative
+    arrival or a pid or priority that is not a whole number. Returns the
+    record with pid and priority as int; raises ValueError naming source and line.
+    """
+    pid, arrival, burst, priority = record
+    if not all(math.isfinite(value) for value in record):
+        problem = "values must be finite numbers"
+    elif burst <= 0:
+        problem = f"burst {burst} must be positive"
+    elif arrival < 0:
+        problem = f"arrival {arrival} must not be negative"
+    elif pid != int(pid) or priority != int(priority):
+        problem = f"pid {pid} and priority {priority} must be integers"
+    else:
+        return int(pid), arrival, burst, int(priority)
+    raise ValueError(f"{source}:{line}: invalid workload record ({problem})")
+
+
+def _record(fields, source, line):
+    try:
+        record = tuple(_number(fields[name]) for name in WORKLOAD_FIELDS)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"{source}:{line}: invalid workload record ({e})") from None
+    return check_record(record, source, line)
+
+
+def iter_ndjson_records(path):
+    """Yield (pid, arrival, burst, priority) tuples from an NDJSON file, one object per line"""
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                yield _record(json.loads(line), path, line_number)
+
+
+def iter_csv_records(path):
+    """Yield (pid, arrival, burst, priority) tuples from a CSV file with a header row"""
+    with open(path, 'r', newline='') as f:
+        for line_number, row in enumerate(csv.DictReader(f), 2):
+            yield _record(row, path, line_number)
+
+
+def iter_json_records(path):
+    """Yield (pid, arrival, burst, priority) tuples from a JSON array file (loaded in full)"""
+    with open(path, 'r') as f:
+        for index, proc in enumerate(json.load(f)):
+            yield _record(proc, path, index + 1)
+
+
+# Binary workload layout: a 64-byte header followed by four little-endian columns
+# (pid int64, arrival, burst, priority int64). arrival and burst are int64 when
+# every value is integral and float64 otherwise, as recorded in the header.
+BINARY_MAGIC = b'EERRWKL\0'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<8sIQ4s')
+BINARY_HEADER_SIZE = 64
+
+
+class ColumnarWorkload:
+    """
+    Column view of a binary workload. Each column is a read-only numpy.memmap,
+    so opening a file copies nothing; workload['arrival'] and len(workload)
+    work as for the structured arrays used by batch_scheduler.
+    """
+
+    def __init__(self, path):
+        import numpy as np
+
+        with open(path, 'rb') as f:
+            header = f.read(BINARY_HEADER.size)
+        if len(header) < BINARY_HEADER.size:
+            raise ValueError(f"{path}: not a binary workload file")
+        magic, version, count, kinds = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{path}: not a binary workload file")
+        if version != BINARY_VERSION:
+            raise ValueError(f"{path}: unsupported binary workload version {version}")
+
+        self.path = path
+        self.count = count
+        self.columns = {}
+        offset = BINARY_HEADER_SIZE
+        for name, kind in zip(WORKLOAD_FIELDS, kinds.decode()):
+            dtype = np.dtype('<i8' if kind == 'i' else '<f8')
+            self.columns[name] = (np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+                                  if count else np.zeros(0, dtype=dtype))
+            offset += dtype.itemsize * count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def records(self, start=0, stop=None, chunk=65536):
+        """Yield (pid, arrival, burst, priority) tuples with Python numbers, a chunk at a time"""
+        stop = self.count if stop is None else min(stop, self.count)
+        for first in range(start, stop, chunk):
+            last = min(first + chunk, stop)
+            yield from zip(*(self.columns[name][first:last].tolist() for name in WORKLOAD_FIELDS))
+
+
+def write_binary(path, records):
+    """Write (pid, arrival, burst, priority) records as a binary workload file"""
+    columns = [array('q'), array('d'), array('d'), array('q')]
+    integral = [True, True]
+    for line, record in enumerate(records, 1):
+        pid, arrival, burst, priority = check_record(tuple(record), path, line)
+        columns[0].append(pid)
+        columns[1].append(arrival)
+        columns[2].append(burst)
+        columns[3].append(priority)
+        integral[0] = integral[0] and float(arrival).is_integer()
+        integral[1] = integral[1] and float(burst).is_integer()
+    for position, is_integral in ((1, integral[0]), (2, integral[1])):
+        if is_integral:
+            columns[position] = array('q', map(int, columns[position]))
+    kinds = ''.join('i' if column.typecode == 'q' else 'f' for column in columns)
+
+    with open(path, 'wb') as f:
+        header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(columns[0]), kinds.encode())
+        f.write(header.ljust(BINARY_HEADER_SIZE, b'\0'))
+        for column in columns:
+            if sys.byteorder != 'little':
+                column.byteswap()
+            column.tofile(f)
+
+
+def iter_binary_records(path):
+    """Yield (pid, arrival, burst, priority) tuples from a binary workload file"""
+    for index, record in enumerate(ColumnarWorkload(path).records(), 1):
+        yield check_record(record, path, index)
+
+
+_READERS = {
+    '.json': iter_json_records,
+    '.ndjson': iter_ndjson_records,
+    '.jsonl': iter_ndjson_records,
+    '.csv': iter_csv_records,
+    '.wlb': iter_binary_records,
+}
+
+
+def iter_records(path):
+    """Yield workload tuples from a file, choosing the reader by extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _READERS:
+        raise ValueError(f"Unsupported workload format: {extension or path}")
+    return _READERS[extension](path)
+
+
+def iter_processes(path):
+    """
+    Lazily yield Process objects from a workload trace in arrival order.
+    The trace must already be sorted by arrival time; an out-of-order record
+    raises ValueError instead of silently being scheduled late.
+    """
+    previous_arrival = None
+    for pid, arrival, burst, priority in iter_records(path):
+        if previous_arrival is not None and arrival < previous_arrival:
+            raise ValueError(f"{path}: process {pid} arrives out of order ({arrival} < {previous_arrival})")
+        previous_arrival = arrival
+        yield Process(pid, arrival, burst, priority)
+
+
+def read_records(path):
+    """Read a whole workload file into a list of (pid, arrival, burst, priority) tuples"""
+    return list(iter_records(path))
+
+
+def convert(source, destination):
+    """Convert a JSON, NDJSON or CSV workload into the binary format. Returns the record count"""
+    count = 0
+
+    def counted(records):
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    write_binary(destination, counted(iter_records(source)))
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a workload to the binary .wlb format")
+    parser.add_argument('source', help="JSON, NDJSON or CSV workload (pid, arrival, burst, priority)")
+    parser.add_argument('destination', help="Binary workload file to write")
+    args = parser.parse_args(argv)
+    count = convert(args.source, args.destination)
+    print(f"Wrote {count} processes to {args.destination}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())